@@ -0,0 +1,225 @@
+# mock_server.py - an offline stand-in for the OpenAI and Gemini APIs, for benchmarks and for trying the app without keys
+# Speaks OpenAI chat completions (POST /v1/chat/completions, streamed as server-sent events) and Gemini generateContent
+# (POST /v1beta/models/<model>:generateContent and :streamGenerateContent, a streamed JSON array or alt=sse).
+# Replies are made up words; the delay before the first token, the token rate, the reply length and injected
+# 429 responses are configurable. GET /stats returns the request counters.
+# usage: python benchmarks/mock_server.py [--port 8089] [--latency-ms 200] [--tokens-per-second 50] [--rate-limit-every 10]
+# then start the app with OPENAI_API_BASE=http://127.0.0.1:8089/v1 GEMINI_API_ENDPOINT=http://127.0.0.1:8089
+from __future__ import annotations
+import argparse
+import itertools
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+WORDS = ("lorem", "ipsum", "dolor", "sit", "amet", "consectetur", "adipiscing", "elit", "sed", "do", "eiusmod", "tempor")
+
+
+class MockConfig:
+    def __init__(self, latency: float = 0.2, tokens_per_second: float = 50.0, reply_tokens: int = 40,
+                 rate_limit_every: int = 0, retry_after: float = 0.1):
+        self.latency = latency                        # seconds before the first token (or the whole reply)
+        self.tokens_per_second = tokens_per_second    # 0 sends every token at once
+        self.reply_tokens = reply_tokens
+        self.rate_limit_every = rate_limit_every      # every n-th request is answered with 429, 0 never
+        self.retry_after = retry_after                # Retry-After of the 429 responses, in seconds
+
+
+class MockServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, config: MockConfig):
+        super().__init__(address, MockHandler)
+        self.config = config
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.rate_limited = 0
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    # True when this request gets a 429
+    def count_request(self) -> bool:
+        with self.lock:
+            self.requests += 1
+            every = self.config.rate_limit_every
+            limited = every > 0 and self.requests % every == 0
+            self.rate_limited += limited
+            return limited
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {"requests": self.requests, "rate_limited": self.rate_limited}
+
+
+# starts a server on a free port in a background thread, returns it (stop with shutdown())
+def start_mock_server(config: MockConfig | None = None, host: str = "127.0.0.1", port: int = 0) -> MockServer:
+    server = MockServer((host, port), config or MockConfig())
+    threading.Thread(target=server.serve_forever, name="mock-server", daemon=True).start()
+    return server
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so the providers' connection pools are used as against the real APIs
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if urlsplit(self.path).path == "/stats":
+            self._send_json(200, self.server.stats())
+        else:
+            self._send_json(404, {"error": {"message": "not found"}})
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        try:
+            request = json.loads(body or b"{}")
+        except ValueError:
+            self._send_json(400, {"error": {"message": "invalid JSON"}})
+            return
+        if url.path.endswith("/chat/completions"):
+            handler = self._openai
+        elif ":generateContent" in url.path or ":streamGenerateContent" in url.path:
+            handler = self._gemini
+        else:
+            self._send_json(404, {"error": {"message": f"unknown endpoint {url.path}"}})
+            return
+        if self.server.count_request():
+            self._rate_limited(handler)
+            return
+        handler(url, request)
+
+    # OpenAI chat completions
+
+    def _openai(self, url, request):
+        model = request.get("model", "mock")
+        prompt_tokens = sum(len(str(m.get("content", ""))) // 4 for m in request.get("messages", []))
+        created = int(time.time())
+        if not request.get("stream"):
+            text = "".join(self._tokens())
+            self._send_json(200, {
+                "id": "chatcmpl-mock", "object": "chat.completion", "created": created, "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+                "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": self.server.config.reply_tokens,
+                          "total_tokens": prompt_tokens + self.server.config.reply_tokens},
+            })
+            return
+        self._start_chunked("text/event-stream")
+        for token in self._tokens():
+            chunk = {"id": "chatcmpl-mock", "object": "chat.completion.chunk", "created": created, "model": model,
+                     "choices": [{"index": 0, "delta": {"content": token}, "finish_reason": None}]}
+            self._write_chunk(f"data: {json.dumps(chunk)}\n\n")
+        done = {"id": "chatcmpl-mock", "object": "chat.completion.chunk", "created": created, "model": model,
+                "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]}
+        self._write_chunk(f"data: {json.dumps(done)}\n\ndata: [DONE]\n\n")
+        self._end_chunked()
+
+    # Gemini generateContent
+
+    def _gemini(self, url, request):
+        prompt_tokens = sum(len(str(part.get("text", part))) // 4
+                            for content in request.get("contents", []) for part in content.get("parts", []))
+        usage = {"promptTokenCount": prompt_tokens, "candidatesTokenCount": self.server.config.reply_tokens,
+                 "totalTokenCount": prompt_tokens + self.server.config.reply_tokens}
+
+        def response(text, finish=None):
+            candidate = {"content": {"role": "model", "parts": [{"text": text}]}, "index": 0}
+            if finish:
+                candidate["finishReason"] = finish
+            return {"candidates": [candidate], "usageMetadata": usage}
+
+        if ":streamGenerateContent" not in url.path:
+            self._send_json(200, response("".join(self._tokens()), "STOP"))
+            return
+        sse = parse_qs(url.query).get("alt") == ["sse"]
+        self._start_chunked("text/event-stream" if sse else "application/json")
+        first = True
+        for token in self._tokens():
+            data = json.dumps(response(token))
+            if sse:
+                self._write_chunk(f"data: {data}\r\n\r\n")
+            else:
+                self._write_chunk(("[" if first else ",\r\n") + data)
+            first = False
+        last = json.dumps(response("", "STOP"))
+        self._write_chunk(f"data: {last}\r\n\r\n" if sse else ("[" if first else ",\r\n") + last + "]")
+        self._end_chunked()
+
+    def _rate_limited(self, handler):
+        retry_after = self.server.config.retry_after
+        if handler == self._openai:
+            body = {"error": {"message": "Rate limit reached for requests (mock)", "type": "requests",
+                              "param": None, "code": "rate_limit_exceeded"}}
+        else:
+            body = {"error": {"code": 429, "message": "Resource has been exhausted (mock)", "status": "RESOURCE_EXHAUSTED",
+                              "details": [{"@type": "type.googleapis.com/google.rpc.RetryInfo",
+                                           "retryDelay": f"{retry_after}s"}]}}
+        self._send_json(429, body, {"Retry-After": f"{retry_after:g}", "Retry-After-Ms": f"{retry_after * 1000:.0f}"})
+
+    # reply tokens, each one yielded when it is due: the first after the latency, the rest at the token rate
+    def _tokens(self):
+        config = self.server.config
+        time.sleep(config.latency)
+        interval = 1 / config.tokens_per_second if config.tokens_per_second > 0 else 0
+        words = itertools.cycle(WORDS)
+        for index in range(config.reply_tokens):
+            if index and interval:
+                time.sleep(interval)
+            yield next(words) + ("" if index == config.reply_tokens - 1 else " ")
+
+    def _send_json(self, status: int, body: dict, headers: dict | None = None):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _start_chunked(self, content_type: str):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Transfer-Encoding", "chunked")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+
+    def _write_chunk(self, text: str):
+        data = text.encode("utf-8")
+        self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+    def _end_chunked(self):
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline stand-in for the OpenAI and Gemini chat APIs.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency-ms", type=float, default=200)
+    parser.add_argument("--tokens-per-second", type=float, default=50)
+    parser.add_argument("--reply-tokens", type=int, default=40)
+    parser.add_argument("--rate-limit-every", type=int, default=0, help="answer every n-th request with 429")
+    parser.add_argument("--retry-after", type=float, default=0.1, help="Retry-After of the 429 responses, seconds")
+    args = parser.parse_args()
+    config = MockConfig(args.latency_ms / 1000, args.tokens_per_second, args.reply_tokens, args.rate_limit_every,
+                        args.retry_after)
+    server = MockServer((args.host, args.port), config)
+    print(f"Mock OpenAI/Gemini API on {server.url} (OPENAI_API_BASE={server.url}/v1, GEMINI_API_ENDPOINT={server.url})",
+          flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
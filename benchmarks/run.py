@@ -0,0 +1,465 @@
+# run.py - benchmarks of the hot paths, against benchmarks/mock_server.py instead of the real model APIs
+# usage: python benchmarks/run.py [--quick] [--only name,name] [--output results.json] [--thresholds thresholds.json]
+# Every benchmark reports its metrics (times in ms unless the name says otherwise) to the JSON output. Metrics listed in
+# the thresholds file are upper limits: the run exits with 1 when one is exceeded. Benchmarks whose libraries are not
+# installed (a model SDK, PyPDF2, python-docx, fpdf2) are reported as skipped.
+from __future__ import annotations
+import argparse
+import csv
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+from chatcore import ChatSession, Frontend, Services, ASSISTANT, USER  # noqa: E402
+from chatcore.extraction import iter_text_blocks, shutdown_process_pool  # noqa: E402
+from chatcore.providers import GeminiProvider, OpenAIProvider, Provider  # noqa: E402
+from chatcore.translations import LANGUAGES, compile_catalog, tr  # noqa: E402
+from mock_server import MockConfig, start_mock_server  # noqa: E402
+
+DEFAULT_THRESHOLDS = Path(__file__).resolve().parent / "thresholds.json"
+UNLIMITED = {"OpenAI": 1_000_000, "Gemini": 1_000_000}
+
+
+class Skip(Exception):
+    pass
+
+
+def summarize(samples: list[float]) -> dict:
+    # samples in seconds -> ms
+    ordered = sorted(samples)
+    def pick(q):
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000
+    return {"n": len(ordered), "mean_ms": statistics.fmean(ordered) * 1000, "p50_ms": pick(0.5), "p95_ms": pick(0.95),
+            "max_ms": ordered[-1] * 1000}
+
+
+def require(module: str):
+    try:
+        __import__(module)
+    except ImportError:
+        raise Skip(f"{module} is not installed")
+
+
+# records when the first streamed text of a reply arrived
+class TimingFrontend(Frontend):
+    def __init__(self):
+        self.first_text = None
+
+    def stream_text(self, session, text):
+        if self.first_text is None:
+            self.first_text = time.perf_counter()
+
+
+# answers at once, measures what the session itself costs around a model call
+class LocalProvider(Provider):
+    name = "Local"
+
+    def complete(self, messages):
+        return "ok " + messages[-1]["content"]
+
+    def stream(self, messages):
+        yield "ok "
+        yield messages[-1]["content"]
+
+
+class HttpRateLimit(Exception):
+    def __init__(self, retry_after: float | None):
+        super().__init__("429 rate limited")
+        self.retry_after = retry_after
+
+
+# the OpenAI chat completions API over urllib: the network round trip to the mock server without a model SDK,
+# used when the SDKs are not installed and for the many-sessions benchmark
+class HttpProvider(Provider):
+    name = "HTTP"
+    rate_limit_errors = (HttpRateLimit,)
+
+    def __init__(self, model: str, url: str):
+        super().__init__(model)
+        self.url = url + "/v1/chat/completions"
+
+    def retry_after(self, error):
+        return error.retry_after
+
+    def complete(self, messages):
+        with self._post(messages, stream=False) as response:
+            return json.loads(response.read())["choices"][0]["message"]["content"]
+
+    def stream(self, messages):
+        with self._post(messages, stream=True) as response:
+            for line in response:
+                if line.startswith(b"data: ") and line.strip() != b"data: [DONE]":
+                    text = json.loads(line[6:])["choices"][0]["delta"].get("content")
+                    if text:
+                        yield text
+
+    def _post(self, messages, stream: bool):
+        body = json.dumps({"model": self.model, "messages": messages, "stream": stream}).encode("utf-8")
+        request = urllib.request.Request(self.url, body, {"Content-Type": "application/json"})
+        try:
+            return urllib.request.urlopen(request, timeout=30)
+        except urllib.error.HTTPError as e:
+            if e.code == 429:
+                retry_after = e.headers.get("Retry-After")
+                raise HttpRateLimit(float(retry_after) if retry_after else None)
+            raise
+
+
+class Context:
+    def __init__(self, quick: bool, work_dir: Path, mock_url: str):
+        self.quick = quick
+        self.work_dir = work_dir
+        self.mock_url = mock_url
+
+    def scale(self, full: int, quick: int) -> int:
+        return quick if self.quick else full
+
+    def services(self, providers: dict) -> Services:
+        data_dir = Path(tempfile.mkdtemp(dir=self.work_dir))
+        return Services(providers, data_dir=data_dir, requests_per_minute=UNLIMITED)
+
+    def mock_providers(self, name: str) -> dict:
+        if name == "OpenAI":
+            require("openai")
+            return {"OpenAI": OpenAIProvider("gpt-mock", "mock-key", api_base=self.mock_url + "/v1")}
+        require("google.generativeai")
+        return {"Gemini": GeminiProvider("gemini-mock", "mock-key", endpoint=self.mock_url)}
+
+
+# send_message round trips: prompt in, whole reply shown, one prompt after another
+
+def round_trips(ctx: Context, providers: dict, stream: bool) -> dict:
+    services = ctx.services(providers)
+    frontend = TimingFrontend()
+    session = ChatSession(services, frontend)
+    session.cache_enabled = False
+    session.streaming_enabled = stream
+    try:
+        session.send("warm up").result()
+        totals, ttfts = [], []
+        for index in range(ctx.scale(50, 10)):
+            frontend.first_text = None
+            started = time.perf_counter()
+            session.send(f"prompt number {index}").result()
+            totals.append(time.perf_counter() - started)
+            if frontend.first_text is not None:
+                ttfts.append(frontend.first_text - started)
+        result = summarize(totals)
+        if ttfts:
+            result["ttft"] = summarize(ttfts)
+        reply = session.history.text(session.history.last(ASSISTANT))
+        if not reply.startswith("ok") and "lorem" not in reply:
+            raise RuntimeError(f"unexpected reply: {reply[:80]}")
+        return result
+    finally:
+        session.close()
+        services.close()
+
+
+def bench_send_local(ctx):
+    return round_trips(ctx, {"OpenAI": LocalProvider("local")}, stream=False)
+
+
+def bench_send_local_stream(ctx):
+    return round_trips(ctx, {"OpenAI": LocalProvider("local")}, stream=True)
+
+
+def bench_send_http(ctx):
+    return round_trips(ctx, {"OpenAI": HttpProvider("gpt-mock", ctx.mock_url)}, stream=False)
+
+
+def bench_ttft_http(ctx):
+    return round_trips(ctx, {"OpenAI": HttpProvider("gpt-mock", ctx.mock_url)}, stream=True)
+
+
+def bench_send_openai(ctx):
+    return round_trips(ctx, ctx.mock_providers("OpenAI"), stream=False)
+
+
+def bench_ttft_openai(ctx):
+    return round_trips(ctx, ctx.mock_providers("OpenAI"), stream=True)
+
+
+def bench_send_gemini(ctx):
+    return round_trips(ctx, ctx.mock_providers("Gemini"), stream=False)
+
+
+def bench_ttft_gemini(ctx):
+    return round_trips(ctx, ctx.mock_providers("Gemini"), stream=True)
+
+
+# many sessions at once over the shared request pool, like the server in main.py
+def bench_concurrent_sessions(ctx):
+    providers = {"OpenAI": HttpProvider("gpt-mock", ctx.mock_url)}
+    sessions_count = ctx.scale(100, 20)
+    data_dir = Path(tempfile.mkdtemp(dir=ctx.work_dir))
+    services = Services(providers, data_dir=data_dir, requests_per_minute=UNLIMITED, request_workers=32)
+    sessions = [ChatSession(services) for _ in range(sessions_count)]
+    try:
+        started = time.perf_counter()
+        futures = [(time.perf_counter(), s.send(f"hello from {i}")) for i, s in enumerate(sessions)]
+        latencies = []
+        for submitted, future in futures:
+            future.result()
+            latencies.append(time.perf_counter() - submitted)
+        elapsed = time.perf_counter() - started
+        result = summarize(latencies)
+        result["requests_per_second"] = sessions_count / elapsed
+        return result
+    finally:
+        for session in sessions:
+            session.close()
+        services.close()
+
+
+# file extraction - the whole file is read through iter_text_blocks like a document job does
+
+def make_pdf(path: Path, pages: int):
+    from fpdf import FPDF
+    pdf = FPDF()
+    pdf.set_font("Helvetica", size=11)
+    for page in range(pages):
+        pdf.add_page()
+        pdf.multi_cell(0, 6, f"Page {page}. " + "The quick brown fox jumps over the lazy dog. " * 60)
+    pdf.output(str(path))
+
+
+def make_docx(path: Path, paragraphs: int):
+    import docx
+    document = docx.Document()
+    for index in range(paragraphs):
+        document.add_paragraph(f"Paragraph {index}. " + "The quick brown fox jumps over the lazy dog. " * 8)
+    document.save(str(path))
+
+
+def make_csv(path: Path, rows: int):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["id", "name", "comment"])
+        for index in range(rows):
+            writer.writerow([index, f"name {index}", "The quick brown fox jumps over the lazy dog."])
+
+
+def extract(ctx, path: Path) -> dict:
+    samples, chars = [], 0
+    for _ in range(ctx.scale(3, 1)):
+        started = time.perf_counter()
+        chars = sum(len(block) for block in iter_text_blocks(path))
+        samples.append(time.perf_counter() - started)
+    result = summarize(samples)
+    result["chars"] = chars
+    result["bytes"] = path.stat().st_size
+    return result
+
+
+def bench_extract_pdf(ctx):
+    require("PyPDF2")
+    require("fpdf")
+    path = ctx.work_dir / "bench.pdf"
+    make_pdf(path, ctx.scale(100, 20))
+    try:
+        return extract(ctx, path)
+    finally:
+        shutdown_process_pool()
+
+
+def bench_extract_docx(ctx):
+    require("docx")
+    path = ctx.work_dir / "bench.docx"
+    make_docx(path, ctx.scale(5000, 500))
+    return extract(ctx, path)
+
+
+def bench_extract_csv(ctx):
+    path = ctx.work_dir / "bench.csv"
+    make_csv(path, ctx.scale(200_000, 20_000))
+    return extract(ctx, path)
+
+
+# export_chat_to_pdf over a history of user and assistant messages
+def bench_export_pdf(ctx):
+    require("fpdf")
+    services = ctx.services({"OpenAI": LocalProvider("local")})
+    session = ChatSession(services, export_dir=ctx.work_dir / "exports")
+    try:
+        messages = ctx.scale(2000, 200)
+        for index in range(messages // 2):
+            session.add_message(USER, "You", f"Question {index}: how does the quick brown fox jump over the dog?")
+            session.add_message(ASSISTANT, "OpenAI", "The quick brown fox jumps over the lazy dog. " * 6, model="OpenAI")
+        samples = []
+        for _ in range(ctx.scale(3, 1)):
+            started = time.perf_counter()
+            session.export_chat_to_pdf().result()
+            samples.append(time.perf_counter() - started)
+        result = summarize(samples)
+        result["messages"] = messages
+        return result
+    finally:
+        session.close()
+        services.close()
+
+
+# tr() is called for every message the app shows
+def bench_tr(ctx):
+    keys = ["send", "messages.chat_cleared", "messages.pending", "commands./help", "missing.key"]
+    langs = LANGUAGES.codes()
+    for lang in langs:
+        tr("send", lang)
+    rounds = ctx.scale(200_000, 20_000)
+    started = time.perf_counter()
+    for index in range(rounds):
+        tr(keys[index % 5], langs[index % len(langs)])
+    lookup = (time.perf_counter() - started) / rounds
+    compile_started = time.perf_counter()
+    for lang in langs:
+        compile_catalog(lang)
+    return {"lookup_ns": lookup * 1e9, "lookups": rounds,
+            "compile_all_ms": (time.perf_counter() - compile_started) * 1000, "languages": len(langs)}
+
+
+# a fresh interpreter up to a ready session (and up to an imported app.py when Tk is available)
+STARTUP_SCRIPT = """
+import sys, tempfile, time
+started = time.perf_counter()
+from chatcore import ChatSession, Services
+imported = time.perf_counter()
+services = Services(data_dir=tempfile.mkdtemp())
+session = ChatSession(services)
+ready = time.perf_counter()
+app = None
+if sys.argv[1] == "app":
+    import app as _
+    app = (time.perf_counter() - ready) * 1000
+session.close()
+services.close()
+print((imported - started) * 1000, (ready - started) * 1000, app)
+"""
+
+
+def bench_startup(ctx):
+    with_app = "app"
+    try:
+        import tkinter  # noqa: F401
+        import ttkbootstrap  # noqa: F401
+    except ImportError:
+        with_app = "core"
+    imports, ready, app_imports, wall = [], [], [], []
+    for _ in range(ctx.scale(5, 2)):
+        started = time.perf_counter()
+        output = subprocess.run([sys.executable, "-c", STARTUP_SCRIPT, with_app], cwd=ROOT, capture_output=True,
+                                text=True, check=True, env={**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)})
+        wall.append(time.perf_counter() - started)
+        core_ms, ready_ms, app_ms = output.stdout.split()
+        imports.append(float(core_ms) / 1000)
+        ready.append(float(ready_ms) / 1000)
+        if app_ms != "None":
+            app_imports.append(float(app_ms) / 1000)
+    result = {"process": summarize(wall), "core_import": summarize(imports), "session_ready": summarize(ready)}
+    if app_imports:
+        result["app_import"] = summarize(app_imports)
+    return result
+
+
+BENCHMARKS = {
+    "send_local": bench_send_local,
+    "send_local_stream": bench_send_local_stream,
+    "send_http": bench_send_http,
+    "ttft_http": bench_ttft_http,
+    "send_openai": bench_send_openai,
+    "ttft_openai": bench_ttft_openai,
+    "send_gemini": bench_send_gemini,
+    "ttft_gemini": bench_ttft_gemini,
+    "concurrent_sessions": bench_concurrent_sessions,
+    "extract_pdf": bench_extract_pdf,
+    "extract_docx": bench_extract_docx,
+    "extract_csv": bench_extract_csv,
+    "export_pdf": bench_export_pdf,
+    "tr": bench_tr,
+    "startup": bench_startup,
+}
+
+
+# "a.b" -> result["a"]["b"]
+def metric(result: dict, path: str):
+    value = result
+    for part in path.split("."):
+        if not isinstance(value, dict) or part not in value:
+            return None
+        value = value[part]
+    return value
+
+
+def check_thresholds(results: dict, thresholds: dict) -> list[str]:
+    failures = []
+    for name, limits in thresholds.items():
+        result = results.get(name)
+        if result is None or "skipped" in result or "error" in result:
+            continue
+        for path, limit in limits.items():
+            value = metric(result, path)
+            if value is not None and value > limit:
+                failures.append(f"{name}.{path} = {value:.2f}, limit {limit}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks of the chat hot paths against the offline mock API.")
+    parser.add_argument("--quick", action="store_true", help="fewer rounds and smaller files")
+    parser.add_argument("--only", help="comma separated benchmark names")
+    parser.add_argument("--output", type=Path, default=Path("benchmark_results.json"))
+    parser.add_argument("--thresholds", type=Path, default=DEFAULT_THRESHOLDS)
+    parser.add_argument("--latency-ms", type=float, default=50, help="mock API delay before the first token")
+    parser.add_argument("--tokens-per-second", type=float, default=200, help="mock API token rate")
+    parser.add_argument("--rate-limit-every", type=int, default=0, help="mock API answers every n-th request with 429")
+    args = parser.parse_args()
+
+    names = args.only.split(",") if args.only else list(BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(unknown)}")
+    mock = start_mock_server(MockConfig(args.latency_ms / 1000, args.tokens_per_second, 20, args.rate_limit_every))
+    results = {}
+    with tempfile.TemporaryDirectory() as work_dir:
+        ctx = Context(args.quick, Path(work_dir), mock.url)
+        for name in names:
+            try:
+                results[name] = BENCHMARKS[name](ctx)
+            except Skip as e:
+                results[name] = {"skipped": str(e)}
+            except Exception as e:
+                results[name] = {"error": f"{type(e).__name__}: {e}"}
+            print(f"{name:22} {json.dumps(results[name])}", flush=True)
+    mock.shutdown()
+
+    thresholds = json.loads(args.thresholds.read_text(encoding="utf-8")) if args.thresholds.exists() else {}
+    failures = check_thresholds(results, thresholds)
+    errors = [name for name, result in results.items() if "error" in result]
+    report = {
+        "timestamp": time.time(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "quick": args.quick,
+        "mock": {"latency_ms": args.latency_ms, "tokens_per_second": args.tokens_per_second,
+                 "rate_limit_every": args.rate_limit_every, **mock.stats()},
+        "results": results,
+        "threshold_failures": failures,
+    }
+    args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    for failure in failures:
+        print(f"over threshold: {failure}")
+    print(f"results written to {args.output}")
+    sys.exit(1 if failures or errors else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+# chat_view.py - keeps only the newest messages rendered in the chat Text widget
+# The backing list keeps the position of every message in the session history (only lines that aren't in the history,
+# like an echoed command, are kept as text); the widget shows the newest MAX_RENDERED of them and older ones are
+# formatted again when the user scrolls to the top. New messages are queued and rendered together once per UI tick.
+# Live regions (a streamed reply, a progress line) are rewritten in place until they are finished.
+from __future__ import annotations
+import tkinter as tk
+
+MAX_RENDERED = 500
+PAGE_SIZE = 100
+
+
+class ChatView:
+    # render(position) -> display text of that history message, including its trailing separator
+    def __init__(self, text: tk.Text, scrollbar, render, max_rendered: int = MAX_RENDERED, page_size: int = PAGE_SIZE):
+        self.text = text
+        self.scrollbar = scrollbar
+        self.render = render
+        self.max_rendered = max_rendered
+        self.page_size = page_size
+        self.entries = []   # history position of every message, or the text (with separator) of a view-only line
+        self.first = 0      # index of the oldest rendered entry, everything after it is rendered
+        self.pending = []   # indexes of entries waiting for the next flush
+        self.live = {}      # name -> {"index", "prefix", "content", "sep"}
+        self.text.configure(yscrollcommand=self._on_scroll)
+
+    # queues a history message, it is drawn on the next flush
+    def append_message(self, position: int):
+        self.entries.append(position)
+        self.pending.append(len(self.entries) - 1)
+
+    # queues a line that isn't in the history
+    def append(self, text: str, sep: str = "\n\n"):
+        self.entries.append(text + sep)
+        self.pending.append(len(self.entries) - 1)
+
+    # draws everything queued since the last flush in one normal/insert/disabled cycle
+    def flush(self):
+        if not self.pending:
+            return
+        at_bottom = self.text.yview()[1] >= 0.999
+        self.text.config(state='normal')
+        if at_bottom and not self.live and len(self.pending) >= self.max_rendered:
+            # more new messages than fit the cap (a restored session): only the newest ones are drawn at all
+            self._drop_rendered()
+            self.first = len(self.entries) - self.max_rendered
+            self.pending = list(range(self.first, len(self.entries)))
+        for index in self.pending:
+            self._insert_entry(index)
+        self.pending.clear()
+        if at_bottom:
+            self._trim()
+        self.text.config(state='disabled')
+        if at_bottom:
+            self.text.yview(tk.END)
+
+    def clear(self):
+        self.text.config(state='normal')
+        self._drop_rendered()
+        self.text.config(state='disabled')
+        self.entries.clear()
+        self.pending.clear()
+        self.live.clear()
+        self.first = 0
+
+    # live region: prefix (never empty) stays, content between the name_start and name_end marks can grow or be replaced
+    def begin_live(self, name: str, prefix: str, sep: str = "\n\n"):
+        self.flush()
+        self.entries.append(prefix + sep)
+        index = len(self.entries) - 1
+        self.live[name] = {"index": index, "prefix": prefix, "content": [], "sep": sep}
+        self.text.config(state='normal')
+        self._insert_entry(index)
+        self.text.mark_set(f"{name}_start", f"end-{len(sep) + 1}c")
+        self.text.mark_gravity(f"{name}_start", tk.LEFT)
+        self.text.mark_set(f"{name}_end", f"end-{len(sep) + 1}c")
+        self.text.mark_gravity(f"{name}_end", tk.RIGHT)
+        self.text.config(state='disabled')
+        self.text.yview(tk.END)
+
+    def update_live(self, name: str, content: str, replace: bool = False):
+        region = self.live.get(name)
+        if region is None:
+            return
+        self.text.config(state='normal')
+        if replace:
+            region["content"] = [content]
+            self.text.delete(f"{name}_start", f"{name}_end")
+        else:
+            region["content"].append(content)
+        self.text.insert(f"{name}_end", content)
+        self.text.config(state='disabled')
+        self.text.yview(tk.END)
+
+    # the region becomes a normal entry: the history message at position, rendered again if it differs from what was
+    # shown (another author after a failover), or the region's text, with content replacing what was shown
+    def end_live(self, name: str, content: str | None = None, position: int | None = None):
+        region = self.live.pop(name, None)
+        if region is None:
+            return
+        shown = "".join(region["content"])
+        if position is not None:
+            final = self.render(position)
+            if final != region["prefix"] + shown + region["sep"]:
+                start = self.text.index(f"msg{region['index']}")
+                self.text.config(state='normal')
+                self.text.delete(start, f"{name}_end+{len(region['sep'])}c")
+                self.text.insert(start, final)
+                self.text.mark_set(f"msg{region['index']}", start)
+                self.text.config(state='disabled')
+        elif content is not None and content != shown:
+            self.text.config(state='normal')
+            self.text.delete(f"{name}_start", f"{name}_end")
+            self.text.insert(f"{name}_start", content)
+            self.text.config(state='disabled')
+            shown = content
+        self.text.mark_unset(f"{name}_start", f"{name}_end")
+        self.entries[region["index"]] = region["prefix"] + shown + region["sep"] if position is None else position
+
+    def has_live(self, name: str) -> bool:
+        return name in self.live
+
+    def _drop_rendered(self):
+        self.text.delete("1.0", tk.END)
+        for mark in self.text.mark_names():
+            if mark.startswith("msg") or mark.endswith(("_start", "_end")):
+                self.text.mark_unset(mark)
+
+    def _entry_text(self, index: int) -> str:
+        entry = self.entries[index]
+        return entry if isinstance(entry, str) else self.render(entry)
+
+    def _insert_entry(self, index: int):
+        start = self.text.index("end-1c")
+        self.text.insert(tk.END, self._entry_text(index))
+        self.text.mark_set(f"msg{index}", start)
+
+    # drops the oldest rendered entries above the cap, a live region and everything after it always stays
+    def _trim(self):
+        last = len(self.entries) - len(self.pending)
+        if self.live:
+            last = min(region["index"] for region in self.live.values())
+        new_first = min(len(self.entries) - self.max_rendered, last)
+        if new_first <= self.first:
+            return
+        self.text.delete("1.0", f"msg{new_first}")
+        for index in range(self.first, new_first):
+            self.text.mark_unset(f"msg{index}")
+        self.first = new_first
+
+    # scrolled to the very top: the previous page of entries is inserted above, the view stays where it was
+    def _on_scroll(self, top, bottom):
+        self.scrollbar.set(top, bottom)
+        if float(top) <= 0.0 and self.first > 0:
+            self.text.after_idle(self._page_in)
+
+    def _page_in(self):
+        if self.first == 0 or float(self.text.yview()[0]) > 0.0:
+            return
+        anchor = f"msg{self.first}"
+        new_first = max(0, self.first - self.page_size)
+        self.text.config(state='normal')
+        for index in range(self.first - 1, new_first - 1, -1):
+            self.text.insert("1.0", self._entry_text(index))
+            self.text.mark_set(f"msg{index}", "1.0")
+        self.text.config(state='disabled')
+        self.first = new_first
+        self.text.yview(anchor)
@@ -0,0 +1,5 @@
+# chatcore - the chat without a window: sessions, commands, model providers, caches, journals, search and exports.
+# Nothing in here imports tkinter, so it runs the same under the Tk app, a server, a benchmark or a worker process.
+from .services import Services
+from .session import ChatSession, Frontend, get_desktop_path
+from .message_store import USER, ASSISTANT, SYSTEM
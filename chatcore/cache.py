@@ -0,0 +1,216 @@
+# cache.py - on-disk caches: model responses keyed on the model name and a hash of the normalized message context,
+# and extracted document text keyed on the hash of the file content.
+# Response entries expire after a TTL, the least recently used entries are evicted once a cap is reached.
+from __future__ import annotations
+import gzip
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+DEFAULT_MAX_ENTRIES = 2000
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+DEFAULT_TTL = 7 * 24 * 3600  # seconds
+
+
+# whitespace differences don't change the answer, so they don't change the key either
+def make_key(model: str, messages: list[dict]) -> str:
+    normalized = [[m["role"], " ".join(m["content"].split())] for m in messages]
+    payload = json.dumps([model, normalized], ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    def __init__(self, path: Path, max_entries: int = DEFAULT_MAX_ENTRIES, max_bytes: int = DEFAULT_MAX_BYTES,
+                 ttl: float = DEFAULT_TTL):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, model TEXT, response TEXT, size INTEGER, created REAL, last_used REAL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_last_used ON responses(last_used)")
+        self._conn.commit()
+
+    def get(self, model: str, messages: list[dict]) -> str | None:
+        key = make_key(model, messages)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT response, created FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None or now - row[1] > self.ttl:
+                if row is not None:
+                    self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    self._conn.commit()
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def put(self, model: str, messages: list[dict], response: str):
+        key = make_key(model, messages)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, model, response, size, created, last_used) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model, response, len(response.encode("utf-8")), now, now)
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def entry_count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # expired entries go first, then the least recently used until both caps are met
+    def _evict(self, now: float):
+        self._conn.execute("DELETE FROM responses WHERE created < ?", (now - self.ttl,))
+        count, total = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        while count > self.max_entries or total > self.max_bytes:
+            # drop a tenth of the entries at a time instead of one row per query
+            batch = max(1, count - self.max_entries, count // 10)
+            self._conn.execute(
+                "DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY last_used LIMIT ?)", (batch,)
+            )
+            count, total = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+
+
+DEFAULT_EXTRACTION_MAX_BYTES = 200 * 1024 * 1024
+HASH_READ_SIZE = 1024 * 1024
+
+
+def file_sha256(path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for piece in iter(lambda: f.read(HASH_READ_SIZE), b""):
+            digest.update(piece)
+    return digest.hexdigest()
+
+
+# extracted document text, stored gzip-compressed and keyed on the hash of the file content.
+# Path, size and mtime are remembered so an unchanged file isn't even hashed again.
+class ExtractionCache:
+    def __init__(self, directory: Path, max_bytes: int = DEFAULT_EXTRACTION_MAX_BYTES):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.directory / "index.sqlite3"), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS files (path TEXT PRIMARY KEY, size INTEGER, mtime REAL, hash TEXT)")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS entries (hash TEXT PRIMARY KEY, size INTEGER, last_used REAL)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS entries_last_used ON entries(last_used)")
+        self._conn.commit()
+
+    # text blocks of the file, from the cache when the content was extracted before, otherwise from
+    # extract(path) while the text is written to the cache on the way through
+    def blocks(self, path, extract, read_blocks):
+        content_hash = self.content_hash(path)
+        cached = self._entry_path(content_hash)
+        with self._lock:
+            row = self._conn.execute("SELECT hash FROM entries WHERE hash = ?", (content_hash,)).fetchone()
+            if row is not None and cached.exists():
+                self._conn.execute("UPDATE entries SET last_used = ? WHERE hash = ?", (time.time(), content_hash))
+                self._conn.commit()
+                self.hits += 1
+            else:
+                row = None
+                self.misses += 1
+        if row is not None:
+            with gzip.open(cached, "rt", encoding="utf-8") as f:
+                yield from read_blocks(f)
+            return
+        yield from self._store(content_hash, extract(path))
+
+    def content_hash(self, path) -> str:
+        stat = os.stat(path)
+        key = str(Path(path).resolve())
+        with self._lock:
+            row = self._conn.execute("SELECT size, mtime, hash FROM files WHERE path = ?", (key,)).fetchone()
+        if row is not None and row[0] == stat.st_size and row[1] == stat.st_mtime:
+            return row[2]
+        content_hash = file_sha256(path)
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO files (path, size, mtime, hash) VALUES (?, ?, ?, ?)",
+                               (key, stat.st_size, stat.st_mtime, content_hash))
+            self._conn.commit()
+        return content_hash
+
+    # forgets the hashes of the files in directory, for a directory that was deleted (a server's uploads)
+    def forget(self, directory):
+        prefix = str(Path(directory).resolve()) + os.sep
+        with self._lock:
+            self._conn.execute("DELETE FROM files WHERE substr(path, 1, ?) = ?", (len(prefix), prefix))
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _entry_path(self, content_hash: str) -> Path:
+        return self.directory / f"{content_hash}.txt.gz"
+
+    # passes the blocks through and writes them to a temporary file, which only becomes a cache entry
+    # once the extraction finished (a cancelled or failed extraction leaves nothing behind). Every extraction gets
+    # its own temporary file, two uploads of the same file at once each write a whole entry and the last one stays
+    def _store(self, content_hash: str, blocks):
+        target = self._entry_path(content_hash)
+        fd, partial = tempfile.mkstemp(suffix=".part", prefix=target.name + ".", dir=self.directory)
+        complete = False
+        try:
+            with os.fdopen(fd, "wb") as raw, gzip.open(raw, "wt", encoding="utf-8", compresslevel=6) as f:
+                for block in blocks:
+                    f.write(block)
+                    f.write("\n")
+                    yield block
+            complete = True
+        finally:
+            if complete:
+                os.replace(partial, target)
+                self._add_entry(content_hash, target.stat().st_size)
+            else:
+                Path(partial).unlink(missing_ok=True)
+
+    def _add_entry(self, content_hash: str, size: int):
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO entries (hash, size, last_used) VALUES (?, ?, ?)",
+                               (content_hash, size, time.time()))
+            total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+            # least recently used documents go first, the one just added always stays
+            for old_hash, old_size in self._conn.execute(
+                    "SELECT hash, size FROM entries WHERE hash != ? ORDER BY last_used", (content_hash,)).fetchall():
+                if total <= self.max_bytes:
+                    break
+                self._entry_path(old_hash).unlink(missing_ok=True)
+                self._conn.execute("DELETE FROM entries WHERE hash = ?", (old_hash,))
+                total -= old_size
+            self._conn.commit()
@@ -0,0 +1,101 @@
+# commands.py - registry of the slash commands: name -> handler with its metadata
+# Dispatch is one dict lookup. Names are also kept in a prefix trie, which gives the completions for Tab and the
+# "did you mean" suggestions (prefix matches first, otherwise names within a small edit distance).
+from __future__ import annotations
+from .translations import tr
+
+
+class Command:
+    __slots__ = ("name", "handler", "args")
+
+    def __init__(self, name: str, handler, args: str = ""):
+        self.name = name
+        self.handler = handler  # handler(args: str), args is the text after the name
+        self.args = args        # usage of the arguments, "" when the command takes none
+
+
+class PrefixTrie:
+    def __init__(self):
+        self.root = {}  # char -> child node, the None key of a node holds the word that ends there
+
+    def add(self, word: str):
+        node = self.root
+        for char in word:
+            node = node.setdefault(char, {})
+        node[None] = word
+
+    # every word that starts with prefix, sorted
+    def with_prefix(self, prefix: str) -> list[str]:
+        node = self.root
+        for char in prefix:
+            node = node.get(char)
+            if node is None:
+                return []
+        words, stack = [], [node]
+        while stack:
+            node = stack.pop()
+            for char, child in node.items():
+                if char is None:
+                    words.append(child)
+                else:
+                    stack.append(child)
+        return sorted(words)
+
+    # words within max_distance edits of word, closest first. One row of the edit distance table is computed per
+    # trie node, so a shared prefix is only compared once and branches that are already too far are skipped
+    def fuzzy(self, word: str, max_distance: int = 2) -> list[str]:
+        results = []
+        first_row = list(range(len(word) + 1))
+        for char, child in self.root.items():
+            if char is not None:
+                self._fuzzy(child, char, word, first_row, max_distance, results)
+        return [match for _, match in sorted(results)]
+
+    def _fuzzy(self, node: dict, char: str, word: str, previous: list[int], max_distance: int, results: list):
+        row = [previous[0] + 1]
+        for i in range(1, len(word) + 1):
+            row.append(min(row[i - 1] + 1, previous[i] + 1, previous[i - 1] + (word[i - 1] != char)))
+        if None in node and row[-1] <= max_distance:
+            results.append((row[-1], node[None]))
+        if min(row) <= max_distance:
+            for next_char, child in node.items():
+                if next_char is not None:
+                    self._fuzzy(child, next_char, word, row, max_distance, results)
+
+
+class CommandRegistry:
+    def __init__(self):
+        self.commands = {}
+        self.trie = PrefixTrie()
+
+    # decorator: @commands.register("/context", args="[tokens]")
+    def register(self, name: str, args: str = ""):
+        def add(handler):
+            self.commands[name] = Command(name, handler, args)
+            self.trie.add(name)
+            return handler
+        return add
+
+    def get(self, name: str) -> Command | None:
+        return self.commands.get(name.lower())
+
+    # runs "/name args", returns False when there is no such command
+    def dispatch(self, text: str) -> bool:
+        name, _, args = text.strip().partition(" ")
+        command = self.get(name)
+        if command is None:
+            return False
+        command.handler(args.strip())
+        return True
+
+    def complete(self, prefix: str) -> list[str]:
+        return self.trie.with_prefix(prefix.lower())
+
+    def suggest(self, name: str) -> list[str]:
+        name = name.lower()
+        return self.complete(name) or self.trie.fuzzy(name)
+
+    # "/name <args> — description" for every command, descriptions come from the language's "commands" section
+    def help_lines(self, lang: str) -> list[str]:
+        return [f"{' '.join(filter(None, (name, command.args)))} — {tr(f'commands.{name}', lang)}"
+                for name, command in self.commands.items()]
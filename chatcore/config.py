@@ -0,0 +1,44 @@
+# config.py - settings shared by every front end, read from the environment (and .env when python-dotenv is installed)
+import os
+from pathlib import Path
+
+try:
+    from dotenv import load_dotenv
+except ImportError:  # without python-dotenv only the real environment is used
+    load_dotenv = None
+
+if load_dotenv is not None:
+    load_dotenv()
+
+# getting and setting API keys
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
+
+# other endpoints for the model APIs (a proxy or benchmarks/mock_server.py), unset means the public APIs
+OPENAI_API_BASE = os.getenv("OPENAI_API_BASE")
+GEMINI_API_ENDPOINT = os.getenv("GEMINI_API_ENDPOINT")
+
+# variables defining models
+OPENAI_MODEL = "gpt-4o"
+GOOGLE_MODEL = "gemini-2.5-flash"
+SYSTEM_PROMPT = "You are a helpful assistant."
+# how many tokens of conversation are sent with every request, older turns are folded into a summary
+CONTEXT_TOKEN_BUDGET = int(os.getenv("CONTEXT_TOKEN_BUDGET", "6000"))
+CONTEXT_ROLLING_SUMMARY = os.getenv("CONTEXT_ROLLING_SUMMARY", "1") != "0"
+# client-side request limits per provider, and whether a rate-limited request may be answered by the other model
+REQUESTS_PER_MINUTE = {
+    "OpenAI": int(os.getenv("OPENAI_REQUESTS_PER_MINUTE", "60")),
+    "Gemini": int(os.getenv("GEMINI_REQUESTS_PER_MINUTE", "10")),
+}
+FAILOVER_ENABLED = os.getenv("PROVIDER_FAILOVER", "0") == "1"
+# uploaded files are split into chunks of this many tokens, at most this many chunks are sent at once
+DOCUMENT_CHUNK_TOKENS = 2000
+DOCUMENT_MAX_PARALLEL = 4
+# app data (response cache, session journals and other state that is not a user export) lives here
+APP_DATA_DIR = Path(os.getenv("CHATBOT_DATA_DIR", str(Path.home() / ".ai_chatbot")))
+SESSIONS_DIR = APP_DATA_DIR / "sessions"
+EXPORT_MARKS_FILE = APP_DATA_DIR / "exports.json"
+# request metrics are shown by /perf; set a file to also write them there every METRICS_INTERVAL seconds
+# (*.jsonl appends JSON snapshots, any other name is rewritten in Prometheus text format)
+METRICS_FILE = os.getenv("CHATBOT_METRICS_FILE")
+METRICS_INTERVAL = float(os.getenv("CHATBOT_METRICS_INTERVAL", "15"))
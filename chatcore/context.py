@@ -0,0 +1,176 @@
+# context.py - keeps the conversation that is sent to the model inside a token budget
+# The system prompt is always kept, the newest turns are fitted into the budget and turns that fall out of it
+# can be folded into a rolling summary, so request size stops growing with the length of the session.
+from __future__ import annotations
+import threading
+from collections import deque
+
+DEFAULT_TOKEN_BUDGET = 6000
+# after an overflow the window is trimmed down to this share of the budget, so the summary is not rebuilt every turn
+LOW_WATER_RATIO = 0.75
+# rough per-message overhead of the chat format (role, separators)
+MESSAGE_OVERHEAD = 4
+
+_encodings = {}  # model -> tiktoken encoding, None when there is none to use
+_encodings_lock = threading.Lock()
+
+
+def _get_encoding(model: str | None):
+    with _encodings_lock:
+        if model not in _encodings:
+            _encodings[model] = _load_encoding(model)
+        return _encodings[model]
+
+
+# tiktoken is optional and loaded on first use; it downloads its encodings on first use too, which fails offline.
+# A failure is remembered, the estimate is used from then on instead of trying again for every message
+def _load_encoding(model: str | None):
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except (KeyError, TypeError):  # a model tiktoken doesn't know
+            return tiktoken.get_encoding("o200k_base")
+    except Exception:
+        return None
+
+
+# counts tokens locally, falls back to ~4 characters per token without a tiktoken encoding
+def count_tokens(text: str, model: str | None = None) -> int:
+    if not text:
+        return 0
+    encoding = _get_encoding(model)
+    if encoding is None:
+        return len(text) // 4 + 1
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def message_tokens(message: dict, model: str | None = None) -> int:
+    return count_tokens(message["content"], model) + MESSAGE_OVERHEAD
+
+
+# prompt used to fold evicted turns into the rolling summary
+def build_summary_prompt(previous_summary: str, turns: list[dict]) -> str:
+    lines = [f"{m['role']}: {m['content']}" for m in turns]
+    prompt = "Summarize the following conversation in a few short paragraphs, keep names, facts and decisions.\n\n"
+    if previous_summary:
+        prompt += f"Summary so far:\n{previous_summary}\n\nNew messages:\n"
+    return prompt + "\n".join(lines)
+
+
+class ConversationContext:
+    # summarize is an optional callable(prompt) -> str used for the rolling summary, it is called
+    # on whatever thread appends the message that overflowed the budget (the request worker in app.py)
+    def __init__(self, system_prompt: str, budget: int = DEFAULT_TOKEN_BUDGET, model: str | None = None, summarize=None):
+        self.system_prompt = system_prompt
+        self.budget = budget
+        self.model = model
+        self.summarize = summarize
+        self.summary = ""
+        self.evicted_count = 0
+        self._turns = deque()  # (message, tokens)
+        self._turn_tokens = 0
+        self._fixed = None  # tokens of the system prompt and the summary, counted again when the summary changes
+        self._lock = threading.Lock()
+
+    def append(self, role: str, content: str):
+        message = {"role": role, "content": content}
+        with self._lock:
+            self._turns.append((message, message_tokens(message, self.model)))
+            self._turn_tokens += self._turns[-1][1]
+            evicted = self._evict()
+        if evicted:
+            self._fold(evicted)
+
+    # messages to send to the model: system prompt, rolling summary, newest turns
+    def messages(self) -> list[dict]:
+        return self.request()[0]
+
+    # messages() and their token count from the counts kept per turn, taken together so nothing is encoded again
+    def request(self) -> tuple[list[dict], int]:
+        with self._lock:
+            result = [{"role": "system", "content": self.system_prompt}]
+            if self.summary:
+                result.append({"role": "system", "content": f"Summary of the earlier conversation:\n{self.summary}"})
+            result.extend(message for message, _ in self._turns)
+            return result, self._fixed_tokens() + self._turn_tokens
+
+    def token_count(self) -> int:
+        with self._lock:
+            return self._fixed_tokens() + self._turn_tokens
+
+    def set_budget(self, budget: int):
+        with self._lock:
+            self.budget = budget
+            evicted = self._evict()
+        if evicted:
+            self._fold(evicted)
+
+    # replaces all turns with a summary, used by /shrink
+    def collapse(self, summary: str):
+        with self._lock:
+            self.evicted_count += len(self._turns)
+            self._turns.clear()
+            self._turn_tokens = 0
+            self.summary = summary
+            self._fixed = None
+
+    # summary and turns as they are now, used to start a new session journal
+    def snapshot(self) -> tuple[str, list[dict]]:
+        with self._lock:
+            return self.summary, [message for message, _ in self._turns]
+
+    # rebuilds the window from a saved session, turns that no longer fit are dropped without summarizing them again
+    def restore(self, summary: str, turns: list[dict]):
+        with self._lock:
+            self._turns.clear()
+            self._turn_tokens = 0
+            self.summary = summary
+            self._fixed = None
+            for message in turns:
+                self._turns.append((message, message_tokens(message, self.model)))
+                self._turn_tokens += self._turns[-1][1]
+            self._evict()
+
+    def reset(self):
+        with self._lock:
+            self._turns.clear()
+            self._turn_tokens = 0
+            self.summary = ""
+            self._fixed = None
+            self.evicted_count = 0
+
+    def _fixed_tokens(self) -> int:
+        if self._fixed is None:
+            self._fixed = count_tokens(self.system_prompt, self.model) + MESSAGE_OVERHEAD
+            if self.summary:
+                self._fixed += count_tokens(self.summary, self.model) + MESSAGE_OVERHEAD
+        return self._fixed
+
+    # drops the oldest turns once the budget is exceeded, the newest turn always stays
+    def _evict(self) -> list[dict]:
+        evicted = []
+        fixed = self._fixed_tokens()
+        if fixed + self._turn_tokens <= self.budget:
+            return evicted
+        target = int(self.budget * LOW_WATER_RATIO)
+        while len(self._turns) > 1 and fixed + self._turn_tokens > target:
+            message, tokens = self._turns.popleft()
+            self._turn_tokens -= tokens
+            evicted.append(message)
+        self.evicted_count += len(evicted)
+        return evicted
+
+    def _fold(self, evicted: list[dict]):
+        if self.summarize is None:
+            return
+        try:
+            summary = self.summarize(build_summary_prompt(self.summary, evicted))
+        except Exception:
+            return  # keep the previous summary, the conversation itself still fits
+        with self._lock:
+            self.summary = summary.strip()
+            self._fixed = None
@@ -0,0 +1,105 @@
+# documents.py - splits uploaded documents into token sized chunks and summarizes or translates them in parallel
+# Summaries are map-reduced (every chunk is summarized, then the partial summaries are combined), translations are
+# the translated chunks in their original order. complete(prompt) -> str does the model call and must be thread-safe.
+from __future__ import annotations
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from .context import count_tokens
+
+CHUNK_TOKENS = 2000
+MAX_PARALLEL = 4
+
+SUMMARY_PROMPT = "Summarize the following part of a longer document. Keep the important facts, names and numbers.\n\n"
+COMBINE_PROMPT = "These are summaries of consecutive parts of one document. Combine them into a single summary.\n\n"
+TRANSLATE_PROMPT = "Translate the following text into {lang}. Reply with the translation only.\n\n"
+
+
+class JobCancelled(Exception):
+    pass
+
+
+# groups paragraphs of the incoming text blocks into chunks of at most max_tokens,
+# a paragraph that is longer than that on its own is cut at whitespace
+def chunk_text(blocks, max_tokens: int = CHUNK_TOKENS, model: str | None = None):
+    current, current_tokens = [], 0
+    for block in blocks:
+        for paragraph in block.split("\n"):
+            if not paragraph.strip():
+                continue
+            tokens = count_tokens(paragraph, model) + 1
+            if tokens > max_tokens:
+                if current:
+                    yield "\n".join(current)
+                    current, current_tokens = [], 0
+                yield from _split_paragraph(paragraph, tokens, max_tokens)
+                continue
+            if current and current_tokens + tokens > max_tokens:
+                yield "\n".join(current)
+                current, current_tokens = [], 0
+            current.append(paragraph)
+            current_tokens += tokens
+    if current:
+        yield "\n".join(current)
+
+
+def _split_paragraph(paragraph: str, tokens: int, max_tokens: int):
+    # characters per token of this paragraph, a little headroom so pieces stay under the limit
+    piece_length = max(1, int(len(paragraph) / tokens * max_tokens * 0.9))
+    start = 0
+    while start < len(paragraph):
+        end = min(len(paragraph), start + piece_length)
+        if end < len(paragraph):
+            space = paragraph.rfind(" ", start, end)
+            if space > start:
+                end = space
+        yield paragraph[start:end]
+        start = end
+
+
+# runs work(item) for every item with at most max_parallel calls in flight and yields the results in input order.
+# Only a bounded window of items is read ahead, so a lazy iterable of chunks is never loaded all at once.
+def map_in_order(items, work, max_parallel: int = MAX_PARALLEL, cancel=None):
+    pool = ThreadPoolExecutor(max_workers=max_parallel, thread_name_prefix="document")
+    pending = deque()
+    try:
+        for item in items:
+            if cancel is not None and cancel.is_set():
+                raise JobCancelled()
+            pending.append(pool.submit(work, item))
+            if len(pending) >= max_parallel * 2:
+                yield pending.popleft().result()
+        while pending:
+            if cancel is not None and cancel.is_set():
+                raise JobCancelled()
+            yield pending.popleft().result()
+    finally:
+        # on cancel or error the queued calls are dropped, running ones finish in the background
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def summarize_document(chunks, complete, max_tokens: int = CHUNK_TOKENS, max_parallel: int = MAX_PARALLEL,
+                       cancel=None, on_progress=None) -> str:
+    partials = []
+    for summary in map_in_order(chunks, lambda chunk: complete(SUMMARY_PROMPT + chunk), max_parallel, cancel):
+        partials.append(summary)
+        if on_progress:
+            on_progress(len(partials))
+    if not partials:
+        return ""
+    # reduce: combine partial summaries that fit one request together until a single summary is left
+    while len(partials) > 1:
+        groups = list(chunk_text(partials, max_tokens))
+        if len(groups) >= len(partials):
+            groups = ["\n".join(partials[i:i + 2]) for i in range(0, len(partials), 2)]
+        partials = list(map_in_order(groups, lambda group: complete(COMBINE_PROMPT + group), max_parallel, cancel))
+    return partials[0]
+
+
+# yields the translated chunks in document order
+def translate_document(chunks, complete, lang: str, max_parallel: int = MAX_PARALLEL, cancel=None, on_progress=None):
+    prompt = TRANSLATE_PROMPT.format(lang=lang)
+    for done, translation in enumerate(map_in_order(chunks, lambda chunk: complete(prompt + chunk), max_parallel, cancel), 1):
+        if on_progress:
+            on_progress(done)
+        yield translation
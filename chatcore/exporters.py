@@ -0,0 +1,154 @@
+# exporters.py - writes the chat history to a file, one message at a time, in any of the registered formats
+# Appendable formats can continue an earlier export: only the messages added since then are written to the end of the
+# same file. gzip and zstd output is compressed while it is written, an appended export adds a new gzip member or
+# zstd frame, which readers of both formats join back together.
+from __future__ import annotations
+import gzip
+import html
+import json
+
+COMPRESSIONS = ("gz", "zst")
+
+
+class ExportError(Exception):
+    pass
+
+
+class Exporter:
+    extension = ""
+    appendable = True  # a later export can add to the end of the file
+
+    def begin(self, f):
+        pass
+
+    def write(self, f, history, message):
+        raise NotImplementedError
+
+    def end(self, f):
+        pass
+
+    # writes messages (records of history) to path, after begin() unless the file is being continued
+    def run(self, path, history, messages, compression: str | None = None, append: bool = False):
+        with open_output(path, compression, append) as f:
+            if not append:
+                self.begin(f)
+            for message in messages:
+                self.write(f, history, message)
+            self.end(f)
+
+
+class TextExporter(Exporter):
+    extension = "txt"
+
+    def write(self, f, history, message):
+        f.write(history.format(message) + "\n")
+
+
+class JsonlExporter(Exporter):
+    extension = "jsonl"
+
+    def write(self, f, history, message):
+        record = {"role": message.role, "author": message.author, "model": message.model,
+                  "ts": message.timestamp, "text": history.text(message)}
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+# a list of formatted lines, the format /exportjson always wrote; the closing bracket makes it full exports only
+class JsonExporter(Exporter):
+    extension = "json"
+    appendable = False
+
+    def begin(self, f):
+        f.write("[")
+        self.first = True
+
+    def write(self, f, history, message):
+        f.write(("\n  " if self.first else ",\n  ") + json.dumps(history.format(message), ensure_ascii=False))
+        self.first = False
+
+    def end(self, f):
+        f.write("\n]\n")
+
+
+class MarkdownExporter(Exporter):
+    extension = "md"
+
+    def begin(self, f):
+        f.write("# Chat log\n\n")
+
+    def write(self, f, history, message):
+        f.write(f"**{history.header(message, '[%Y-%m-%d %H:%M]')}**\n\n{history.text(message)}\n\n---\n\n")
+
+
+# </body> and </html> are optional in HTML5, leaving them out lets later exports append to the file
+class HtmlExporter(Exporter):
+    extension = "html"
+
+    def begin(self, f):
+        f.write(
+            "<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\"><title>Chat log</title><style>\n"
+            "body{font-family:sans-serif;max-width:50em;margin:2em auto;color:#1e1e1e}\n"
+            ".msg{margin:0 0 1em}.head{font-size:.8em;font-weight:bold}.text{white-space:pre-wrap}\n"
+            ".user .head{color:#2563eb}.assistant .head{color:#16803d}.system .head{color:#6e6e6e}\n"
+            "</style></head><body>\n"
+        )
+
+    def write(self, f, history, message):
+        f.write(f"<div class=\"msg {html.escape(message.role)}\"><div class=\"head\">"
+                f"{html.escape(history.header(message, '[%Y-%m-%d %H:%M]'))}</div>"
+                f"<div class=\"text\">{html.escape(history.text(message))}</div></div>\n")
+
+
+# the PDF is laid out by pdf_export and written at the end, it can't be continued or compressed
+class PdfExporter(Exporter):
+    extension = "pdf"
+    appendable = False
+
+    def run(self, path, history, messages, compression: str | None = None, append: bool = False):
+        if compression:
+            raise ExportError("PDF export can't be compressed")
+        from .pdf_export import export_pdf  # fpdf is only loaded for PDF exports
+        export_pdf(path, ((m.role, history.header(m, "[%Y-%m-%d %H:%M]"), history.text(m)) for m in messages))
+
+
+EXPORTERS = {
+    "txt": TextExporter,
+    "jsonl": JsonlExporter,
+    "json": JsonExporter,
+    "md": MarkdownExporter,
+    "html": HtmlExporter,
+    "pdf": PdfExporter,
+}
+
+
+def get_exporter(name: str) -> Exporter:
+    exporter = EXPORTERS.get(name)
+    if exporter is None:
+        raise ExportError(f"unknown export format: {name}")
+    return exporter()
+
+
+def open_output(path, compression: str | None = None, append: bool = False):
+    mode = "at" if append else "wt"
+    if compression is None:
+        return open(path, mode, encoding="utf-8", newline="\n")
+    if compression == "gz":
+        return gzip.open(path, mode, encoding="utf-8", compresslevel=6)
+    if compression == "zst":
+        try:
+            import zstandard  # zstd output is optional and only loaded when asked for, gzip is always available
+        except ImportError:
+            raise ExportError("zstd compression needs the zstandard package") from None
+        return zstandard.open(path, mode, encoding="utf-8")
+    raise ExportError(f"unknown compression: {compression}")
+
+
+# writes the messages of history from index start on (all of them when start is 0), continuing the file when start > 0.
+# Returns how many messages were written
+def export_history(history, path, name: str, compression: str | None = None, start: int = 0) -> int:
+    exporter = get_exporter(name)
+    if start and not exporter.appendable:
+        raise ExportError(f"{name} export can't be continued")
+    messages = history.last_n(len(history) - start)
+    exporter.run(path, history, messages, compression, append=start > 0)
+    return len(messages)
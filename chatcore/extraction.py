@@ -0,0 +1,148 @@
+# extraction.py - reads uploaded documents as a stream of text blocks (pages, paragraph batches, row batches)
+# Nothing is read until the blocks are consumed, and only one block is held at a time, so a 500 page PDF or
+# a 1 GB CSV doesn't have to fit in memory before the document pipeline starts working on it.
+# PDF text extraction is CPU bound pure Python, larger PDFs are extracted by page range in a process pool.
+# PyPDF2 and python-docx are imported when the first file of their type is read.
+import csv
+import os
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+SUPPORTED_EXTENSIONS = (".txt", ".pdf", ".docx", ".csv")
+TEXT_BLOCK_CHARS = 64 * 1024
+DOCX_BATCH_PARAGRAPHS = 200
+CSV_BATCH_ROWS = 500
+# pages per process pool task, and the page count below which starting workers costs more than it saves
+PDF_PAGES_PER_TASK = 8
+PDF_PARALLEL_MIN_PAGES = 16
+PDF_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+
+_process_pool = None
+_process_pool_lock = threading.Lock()
+
+
+class ExtractionError(Exception):
+    pass
+
+
+def is_supported(path) -> bool:
+    return Path(path).suffix.lower() in SUPPORTED_EXTENSIONS
+
+
+# yields the text of the document block by block, reader errors are raised as ExtractionError
+def iter_text_blocks(path):
+    readers = {".txt": iter_txt, ".pdf": iter_pdf, ".docx": iter_docx, ".csv": iter_csv}
+    reader = readers.get(Path(path).suffix.lower())
+    if reader is None:
+        raise ExtractionError(f"unsupported file type: {Path(path).suffix}")
+    try:
+        yield from reader(path)
+    except ExtractionError:
+        raise
+    except Exception as e:
+        raise ExtractionError(str(e)) from e
+
+
+def iter_txt(path):
+    with open(path, "r", encoding="utf-8") as f:
+        yield from read_text_blocks(f)
+
+
+# reads fixed-size pieces of an open text file and cuts them at the last newline,
+# so a paragraph is never split between blocks
+def read_text_blocks(f):
+    tail = ""
+    while True:
+        piece = f.read(TEXT_BLOCK_CHARS)
+        if not piece:
+            break
+        piece = tail + piece
+        cut = piece.rfind("\n")
+        if cut == -1:
+            tail = piece
+            if len(tail) > TEXT_BLOCK_CHARS * 4:  # one very long line, pass it on anyway
+                yield tail
+                tail = ""
+            continue
+        yield piece[:cut]
+        tail = piece[cut + 1:]
+    if tail:
+        yield tail
+
+
+def iter_pdf(path, parallel: bool = True):
+    import PyPDF2
+    # one block per page, every page is extracted exactly once
+    with open(path, "rb") as f:
+        reader = PyPDF2.PdfReader(f)
+        page_count = len(reader.pages)
+        if not parallel or PDF_WORKERS < 2 or page_count < PDF_PARALLEL_MIN_PAGES:
+            for page in reader.pages:
+                text = page.extract_text()
+                if text:
+                    yield text
+            return
+    # page ranges go to the process pool, results are yielded in page order with a bounded number of ranges in flight
+    pool = get_process_pool()
+    pending = deque()
+    try:
+        for start in range(0, page_count, PDF_PAGES_PER_TASK):
+            stop = min(page_count, start + PDF_PAGES_PER_TASK)
+            pending.append(pool.submit(extract_pdf_pages, str(path), start, stop))
+            if len(pending) >= PDF_WORKERS * 2:
+                yield from (text for text in pending.popleft().result() if text)
+        while pending:
+            yield from (text for text in pending.popleft().result() if text)
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+# runs in a worker process, every task opens its own reader for its range of pages
+def extract_pdf_pages(path: str, start: int, stop: int) -> list[str]:
+    import PyPDF2
+    with open(path, "rb") as f:
+        reader = PyPDF2.PdfReader(f)
+        return [reader.pages[i].extract_text() or "" for i in range(start, stop)]
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is None:
+            _process_pool = ProcessPoolExecutor(max_workers=PDF_WORKERS)
+        return _process_pool
+
+
+def shutdown_process_pool():
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is not None:
+            _process_pool.shutdown(wait=False, cancel_futures=True)
+            _process_pool = None
+
+
+def iter_docx(path):
+    import docx
+    batch = []
+    for para in docx.Document(path).paragraphs:
+        batch.append(para.text)
+        if len(batch) >= DOCX_BATCH_PARAGRAPHS:
+            yield "\n".join(batch)
+            batch = []
+    if batch:
+        yield "\n".join(batch)
+
+
+def iter_csv(path):
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        batch = []
+        for row in csv.reader(f):
+            batch.append(", ".join(row))
+            if len(batch) >= CSV_BATCH_ROWS:
+                yield "\n".join(batch)
+                batch = []
+        if batch:
+            yield "\n".join(batch)
@@ -0,0 +1,149 @@
+# journal.py - append-only session journal, one JSON line per chat message or context change
+# Records are written by a background thread as they come in and flushed to the OS right away, so a crash of the app
+# loses nothing; fsync runs at most once per SYNC_INTERVAL for the whole batch instead of once per message.
+# A line torn by a crash (or power loss) is cut off when the journal is opened again.
+# Opening, writing and closing all happen on that thread, a journal can be started and closed from an event loop.
+# A record that can't be written (a full disk) is lost, on_error(exception) is told once and the writer keeps going
+# with the next record, reopening the file first so a half written line is cut off.
+from __future__ import annotations
+import datetime
+import json
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+
+SYNC_INTERVAL = 1.0  # seconds
+TAIL_READ_SIZE = 64 * 1024
+
+
+# newest session in the directory, or None
+def latest_session(directory: Path) -> Path | None:
+    sessions = sorted(Path(directory).glob("session_*.jsonl"))
+    return sessions[-1] if sessions else None
+
+
+def new_session_path(directory: Path) -> Path:
+    return Path(directory) / f"session_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.jsonl"
+
+
+# records of a journal in write order, a line that can't be parsed is skipped
+def read_journal(path: Path):
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+
+class SessionJournal:
+    def __init__(self, path: Path, sync_interval: float = SYNC_INTERVAL, on_error=None):
+        self.path = Path(path)
+        self.sync_interval = sync_interval
+        self.on_error = on_error  # called on the writer thread when writing starts failing
+        self.failed = False       # the last record could not be written
+        self._file = None
+        self._closed = False
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._write_loop, name="journal", daemon=True)
+        self._thread.start()
+
+    # safe to call from any thread, never waits for the disk
+    def append(self, record: dict):
+        self._queue.put(record)
+
+    # writes what is still queued, syncs and closes the file. wait=False leaves that to the writer and returns at once
+    def close(self, wait: bool = True, timeout: float = 5.0):
+        if not self._closed:
+            self._closed = True
+            self._queue.put(None)
+        if wait:
+            self._thread.join(timeout)
+
+    # False once a closed journal has written everything
+    @property
+    def writing(self) -> bool:
+        return self._thread.is_alive()
+
+    def _write_loop(self):
+        closing = False
+        try:
+            while not closing:
+                record = self._queue.get()
+                deadline = time.monotonic() + self.sync_interval
+                # everything that arrives until the deadline goes into the same batch
+                while record is not None:
+                    self._write(record)
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        record = self._queue.get(timeout=remaining)
+                    except queue.Empty:
+                        break
+                closing = record is None
+                self._sync()
+        finally:
+            self._close_file()
+
+    # hands the record to the OS
+    def _write(self, record: dict):
+        try:
+            if self._file is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                _drop_torn_tail(self.path)
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self._file.flush()
+        except Exception as e:
+            self._fail(e)
+        else:
+            self.failed = False
+
+    def _sync(self):
+        if self._file is None:
+            return
+        try:
+            os.fsync(self._file.fileno())
+        except OSError as e:
+            self._fail(e)
+
+    def _fail(self, error: Exception):
+        self._close_file()  # reopened for the next record, which cuts off a half written line
+        if not self.failed:
+            self.failed = True
+            if self.on_error is not None:
+                self.on_error(error)
+
+    def _close_file(self):
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError:
+                pass
+            self._file = None
+
+
+# cuts the file after its last complete line, only the end of the file is read
+def _drop_torn_tail(path: Path):
+    if not path.exists():
+        return
+    with open(path, "rb+") as f:
+        end = f.seek(0, os.SEEK_END)
+        if end == 0:
+            return
+        f.seek(end - 1)
+        if f.read(1) == b"\n":
+            return
+        position = end
+        while position > 0:
+            step = min(TAIL_READ_SIZE, position)
+            position -= step
+            f.seek(position)
+            cut = f.read(step).rfind(b"\n")
+            if cut != -1:
+                f.truncate(position + cut + 1)
+                return
+        f.truncate(0)
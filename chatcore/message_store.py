@@ -0,0 +1,90 @@
+# message_store.py - the chat history as compact records instead of preformatted strings
+# The text of all messages lives in one UTF-8 arena, a record only keeps where its text starts and how long it is.
+# Every role has its own index, so the last assistant reply or the last few user messages are found without a scan.
+# Messages are formatted ("[12:00] OpenAI: ...") only when they are shown or exported.
+from __future__ import annotations
+import datetime
+import time
+
+USER = "user"
+ASSISTANT = "assistant"
+SYSTEM = "system"
+
+
+class Message:
+    __slots__ = ("role", "author", "model", "timestamp", "start", "length")
+
+    def __init__(self, role: str, author: str, model: str | None, timestamp: float, start: int, length: int):
+        self.role = role
+        self.author = author
+        self.model = model
+        self.timestamp = timestamp
+        self.start = start    # byte offset of the text in the arena
+        self.length = length  # byte length of the text
+
+
+class MessageStore:
+    def __init__(self):
+        self._messages = []
+        self._arena = bytearray()
+        self._by_role = {}  # role -> positions of its messages in _messages
+
+    def add(self, role: str, author: str, text: str, model: str | None = None, timestamp: float | None = None) -> Message:
+        data = text.encode("utf-8")
+        message = Message(role, author, model, time.time() if timestamp is None else timestamp, len(self._arena), len(data))
+        self._arena += data
+        self._by_role.setdefault(role, []).append(len(self._messages))
+        self._messages.append(message)
+        return message
+
+    def text(self, message: Message) -> str:
+        return self._arena[message.start:message.start + message.length].decode("utf-8")
+
+    # newest message of the role, or None
+    def last(self, role: str) -> Message | None:
+        positions = self._by_role.get(role)
+        return self._messages[positions[-1]] if positions else None
+
+    # up to n newest messages of the role (or of all roles), oldest first
+    def last_n(self, n: int, role: str | None = None) -> list[Message]:
+        if n <= 0:
+            return []
+        if role is None:
+            return self._messages[-n:]
+        return [self._messages[i] for i in self._by_role.get(role, [])[-n:]]
+
+    def count(self, role: str | None = None) -> int:
+        if role is None:
+            return len(self._messages)
+        return len(self._by_role.get(role, []))
+
+    def format(self, message: Message, time_format: str = "[%H:%M]") -> str:
+        return f"{self.header(message, time_format)}: {self.text(message)}"
+
+    # "[12:00] OpenAI" - timestamp and author without the text
+    def header(self, message: Message, time_format: str = "[%H:%M]") -> str:
+        timestamp = datetime.datetime.fromtimestamp(message.timestamp).strftime(time_format)
+        return f"{timestamp} {message.author}"
+
+    # copy for another thread (an export), later appends or a /clear don't change it.
+    # Records never change after they are added, so only the lists and the arena are copied
+    def snapshot(self) -> "MessageStore":
+        copy = MessageStore()
+        copy._messages = list(self._messages)
+        copy._arena = bytearray(self._arena)
+        copy._by_role = {role: list(positions) for role, positions in self._by_role.items()}
+        return copy
+
+    def clear(self):
+        self._messages.clear()
+        self._arena.clear()
+        self._by_role.clear()
+
+    def __getitem__(self, position: int) -> Message:
+        return self._messages[position]
+
+    def __len__(self):
+        return len(self._messages)
+
+    def __iter__(self):
+        return iter(self._messages)
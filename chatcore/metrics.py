@@ -0,0 +1,230 @@
+# metrics.py - in-process latency and throughput metrics for model calls, file jobs and exports
+# Every sample goes into a log-bucketed histogram: memory only for the buckets in use and a dict update per sample,
+# so instrumenting every request costs next to nothing. Quantiles are estimated from the buckets, within ~5%.
+# /perf shows them; with CHATBOT_METRICS_FILE set they are also written to a Prometheus text or JSONL file.
+import json
+import math
+import os
+import threading
+import time
+from pathlib import Path
+
+PREFIX = "chatbot_"
+QUANTILES = (0.5, 0.95, 0.99)
+# bucket boundaries grow by 2^(1/8), about 9%, the estimate is the middle of a bucket
+BUCKETS_PER_DOUBLING = 8
+SMALLEST = 1e-9  # zero and below land in the lowest bucket, the estimate there is the smallest sample
+LOWEST = math.floor(math.log2(SMALLEST) * BUCKETS_PER_DOUBLING)
+
+
+class Histogram:
+    __slots__ = ("buckets", "count", "total", "min", "max")
+
+    def __init__(self):
+        self.buckets = {}  # bucket index -> samples
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float):
+        index = math.floor(math.log2(max(value, SMALLEST)) * BUCKETS_PER_DOUBLING)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        rank, seen = q * self.count, 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                if index == LOWEST:
+                    return self.min
+                return min(self.max, max(self.min, 2 ** ((index + 0.5) / BUCKETS_PER_DOUBLING)))
+        return self.max
+
+    def summary(self) -> dict:
+        result = {"count": self.count, "sum": self.total, "min": self.min, "max": self.max}
+        for q in QUANTILES:
+            result[f"p{round(q * 100)}"] = self.quantile(q)
+        return result
+
+
+# name and labels as one hashable key: ("chatbot_request_seconds", (("provider", "OpenAI"),))
+def _key(name: str, labels: dict) -> tuple:
+    return PREFIX + name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+class Metrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.histograms = {}  # key -> Histogram
+        self.counters = {}    # key -> number
+        self.gauges = {}      # key -> callable() read when metrics are shown or written
+        self.started = time.time()
+
+    def observe(self, name: str, value: float, **labels):
+        key = _key(name, labels)
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.add(value)
+
+    def count(self, name: str, amount: float = 1, **labels):
+        key = _key(name, labels)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def gauge(self, name: str, read, **labels):
+        with self._lock:
+            self.gauges[_key(name, labels)] = read
+
+    # passes the blocks through and records the time spent producing them (reading and parsing the file happens
+    # lazily, inside the iteration) and their size, once the iteration ends
+    def timed_blocks(self, name: str, blocks, **labels):
+        elapsed, chars = 0.0, 0
+        iterator = iter(blocks)
+        try:
+            while True:
+                start = time.perf_counter()
+                try:
+                    block = next(iterator)
+                except StopIteration:
+                    elapsed += time.perf_counter() - start
+                    break
+                elapsed += time.perf_counter() - start
+                chars += len(block)
+                yield block
+        finally:
+            self.observe(name + "_seconds", elapsed, **labels)
+            self.observe(name + "_chars", chars, **labels)
+
+    def reset(self):
+        with self._lock:
+            self.histograms.clear()
+            self.counters.clear()
+            self.started = time.time()
+
+    # {"histograms": {key: summary}, "counters": {key: value}}, the gauges are read and added to the counters
+    def snapshot(self) -> dict:
+        with self._lock:
+            histograms = {key: h.summary() for key, h in self.histograms.items()}
+            counters = dict(self.counters)
+            gauges = dict(self.gauges)
+        for key, read in gauges.items():
+            try:
+                counters[key] = read()
+            except Exception:
+                pass  # e.g. a cache that was closed
+        return {"started": self.started, "histograms": histograms, "counters": counters}
+
+    # lines for /perf: "request_seconds provider=OpenAI: n=12  p50 820 ms  p95 1.9 s  p99 2.3 s  max 2.5 s"
+    def report_lines(self) -> list[str]:
+        snapshot = self.snapshot()
+        lines = []
+        for (name, labels), summary in sorted(snapshot["histograms"].items()):
+            values = "  ".join(f"{q} {_format(name, summary[q])}" for q in ("p50", "p95", "p99", "max"))
+            lines.append(f"{_display(name, labels)}: n={summary['count']}  {values}")
+        for (name, labels), value in sorted(snapshot["counters"].items()):
+            lines.append(f"{_display(name, labels)}: {value:g}")
+        return lines
+
+    # Prometheus text format: histograms as summaries with p50/p95/p99, counters and gauges as they are
+    def prometheus_text(self) -> str:
+        snapshot = self.snapshot()
+        lines, typed = [], set()
+        for (name, labels), summary in sorted(snapshot["histograms"].items()):
+            if name not in typed:
+                typed.add(name)
+                lines.append(f"# TYPE {name} summary")
+            for q in QUANTILES:
+                lines.append(f"{name}{_labels(labels + (('quantile', f'{q:g}'),))} {summary[f'p{round(q * 100)}']:.6g}")
+            lines.append(f"{name}_sum{_labels(labels)} {summary['sum']:.6g}")
+            lines.append(f"{name}_count{_labels(labels)} {summary['count']}")
+        for (name, labels), value in sorted(snapshot["counters"].items()):
+            if name not in typed:
+                typed.add(name)
+                lines.append(f"# TYPE {name} {'counter' if name.endswith('_total') else 'gauge'}")
+            lines.append(f"{name}{_labels(labels)} {value:g}")
+        return "\n".join(lines) + "\n"
+
+    # one JSON object per line, every write adds a snapshot
+    def json_line(self) -> str:
+        snapshot = self.snapshot()
+        return json.dumps({
+            "ts": time.time(),
+            "started": snapshot["started"],
+            "histograms": [{"name": name, "labels": dict(labels), **summary}
+                           for (name, labels), summary in snapshot["histograms"].items()],
+            "counters": [{"name": name, "labels": dict(labels), "value": value}
+                         for (name, labels), value in snapshot["counters"].items()],
+        })
+
+    # .jsonl appends a snapshot, anything else is rewritten in Prometheus text format (for a node_exporter
+    # textfile collector), through a temporary file so a scrape never reads half of it
+    def write(self, path: Path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.suffix == ".jsonl":
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(self.json_line() + "\n")
+            return
+        partial = path.with_name(path.name + ".tmp")
+        partial.write_text(self.prometheus_text(), encoding="utf-8")
+        os.replace(partial, path)
+
+
+# writes the metrics to a file every interval seconds, and once more on close
+class MetricsWriter:
+    def __init__(self, metrics: Metrics, path: Path, interval: float):
+        self.metrics = metrics
+        self.path = Path(path)
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="metrics-writer", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._write()
+
+    def _write(self):
+        try:
+            self.metrics.write(self.path)
+        except OSError:
+            pass  # tried again on the next interval
+
+    def close(self):
+        self._stop.set()
+        self._thread.join(timeout=5)
+        self._write()
+
+
+def _labels(labels: tuple) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in labels) + "}"
+
+
+def _display(name: str, labels: tuple) -> str:
+    text = name[len(PREFIX):] if name.startswith(PREFIX) else name
+    return " ".join([text] + [f"{k}={v}" for k, v in labels])
+
+
+def _format(name: str, value: float) -> str:
+    if name.endswith("_seconds"):
+        return f"{value * 1000:.3g} ms" if value < 0.9995 else f"{value:.2f} s"
+    if name.endswith("_bytes"):
+        for unit in ("B", "KB", "MB"):
+            if value < 1024:
+                return f"{value:.0f} {unit}"
+            value /= 1024
+        return f"{value:.1f} GB"
+    return f"{value:.0f}"
@@ -0,0 +1,169 @@
+# pdf_export.py - writes the chat to a PDF with an embedded Unicode font, meant to run off the Tk thread
+# Messages are read one at a time and laid out straight onto the page: text the main font can draw is wrapped here
+# with cached word widths and placed line by line, which is far cheaper than multi_cell. Messages with characters
+# only a fallback font has, or scripts that need shaping (Arabic, Urdu, Hindi, Bengali), go through multi_cell.
+from __future__ import annotations
+import os
+from pathlib import Path
+
+from fpdf import FPDF
+
+# the first font that exists draws the text, the fonts after it fill in the scripts it doesn't cover.
+# PDF_FONT (a .ttf path) is tried before all of them
+FONT_CANDIDATES = [
+    # Windows
+    "C:/Windows/Fonts/segoeui.ttf",
+    "C:/Windows/Fonts/arial.ttf",
+    "C:/Windows/Fonts/Nirmala.ttf",
+    "C:/Windows/Fonts/simhei.ttf",
+    # macOS
+    "/System/Library/Fonts/Supplemental/Arial Unicode.ttf",
+    "/Library/Fonts/Arial Unicode.ttf",
+    # Linux
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+    "/usr/share/fonts/truetype/noto/NotoSans-Regular.ttf",
+    "/usr/share/fonts/truetype/noto/NotoSansDevanagari-Regular.ttf",
+    "/usr/share/fonts/truetype/noto/NotoSansBengali-Regular.ttf",
+    "/usr/share/fonts/truetype/noto/NotoNaskhArabic-Regular.ttf",
+    "/usr/share/fonts/truetype/noto/NotoSansArabic-Regular.ttf",
+    "/usr/share/fonts/truetype/droid/DroidSansFallbackFull.ttf",
+]
+
+# scripts that are only drawn right with text shaping / right-to-left layout
+COMPLEX_RANGES = [(0x0590, 0x08FF), (0x0900, 0x09FF), (0xFB1D, 0xFDFF), (0xFE70, 0xFEFF)]
+
+MARGIN = 15
+HEADER_SIZE = 9
+BODY_SIZE = 11
+HEADER_LINE = 5
+BODY_LINE = 6
+MESSAGE_GAP = 3
+
+# header colour per role, the text itself is dark grey for everyone
+ROLE_COLORS = {
+    "user": (37, 99, 235),
+    "assistant": (22, 128, 61),
+    "system": (110, 110, 110),
+}
+BODY_COLOR = (30, 30, 30)
+
+
+def find_fonts() -> list[str]:
+    candidates = [os.getenv("PDF_FONT")] + FONT_CANDIDATES
+    return [path for path in candidates if path and Path(path).is_file()]
+
+
+class PdfWriter:
+    def __init__(self, fonts: list[str] | None = None):
+        self.pdf = FPDF()
+        self.pdf.set_auto_page_break(auto=True, margin=MARGIN)
+        self.pdf.set_margins(MARGIN, MARGIN, MARGIN)
+        fonts = find_fonts() if fonts is None else fonts
+        # every font is added once, fpdf embeds only the glyphs that were used
+        self.families = []
+        for index, path in enumerate(fonts):
+            family = f"Font{index}"
+            self.pdf.add_font(family, "", path)
+            self.families.append(family)
+        if self.families:
+            self.pdf.set_font(self.families[0], size=BODY_SIZE)
+            self.covered = set(self.pdf.current_font.cmap)
+            if len(self.families) > 1:
+                self.pdf.set_fallback_fonts(self.families[1:])
+            try:
+                self.pdf.set_text_shaping(True)
+            except Exception:  # uharfbuzz is not installed, text is drawn unshaped
+                pass
+        else:
+            # no Unicode font found, the core font only has Latin-1
+            self.pdf.set_font("Helvetica", size=BODY_SIZE)
+            self.covered = set(range(256))
+        self.width = self.pdf.w - 2 * MARGIN
+        self.bottom = self.pdf.h - MARGIN
+        self._widths = {}  # (font size, word) -> width
+        self.pdf.add_page()
+        self.y = MARGIN
+
+    # role, header ("[12:00] OpenAI") and text of one message
+    def add_message(self, role: str, header: str, text: str):
+        if not self.families:
+            header = header.encode("latin-1", "replace").decode("latin-1")
+            text = text.encode("latin-1", "replace").decode("latin-1")
+        self.pdf.set_text_color(*ROLE_COLORS.get(role, ROLE_COLORS["system"]))
+        self._write_lines(header, HEADER_SIZE, HEADER_LINE)
+        self.pdf.set_text_color(*BODY_COLOR)
+        if self._is_simple(text):
+            self._write_lines(text, BODY_SIZE, BODY_LINE)
+        else:
+            self.pdf.set_font_size(BODY_SIZE)
+            self.pdf.set_xy(MARGIN, self.y)
+            self.pdf.multi_cell(0, BODY_LINE, text, new_x="LMARGIN", new_y="NEXT")
+            self.y = self.pdf.y
+        self.y += MESSAGE_GAP
+
+    def output(self, path):
+        self.pdf.output(str(path))
+
+    def _is_simple(self, text: str) -> bool:
+        for char in set(text):
+            code = ord(char)
+            if code not in self.covered and char not in "\n\t":
+                return False
+            if any(start <= code <= end for start, end in COMPLEX_RANGES):
+                return False
+        return True
+
+    def _write_lines(self, text: str, size: float, line_height: float):
+        self.pdf.set_font_size(size)
+        for line in self._wrap(text, size):
+            if self.y + line_height > self.bottom:
+                self.pdf.add_page()
+                self.y = MARGIN
+            # text() takes the baseline, the line box starts at self.y
+            self.pdf.text(MARGIN, self.y + line_height * 0.75, line)
+            self.y += line_height
+
+    def _word_width(self, word: str, size: float) -> float:
+        key = (size, word)
+        width = self._widths.get(key)
+        if width is None:
+            width = self._widths[key] = self.pdf.get_string_width(word)
+        return width
+
+    # greedy word wrap, a word wider than the line is cut between characters
+    def _wrap(self, text: str, size: float):
+        space = self._word_width(" ", size)
+        for paragraph in text.expandtabs(4).split("\n"):
+            line, line_width = [], 0.0
+            for word in paragraph.split(" "):
+                width = self._word_width(word, size)
+                if line and line_width + space + width > self.width:
+                    yield " ".join(line)
+                    line, line_width = [], 0.0
+                while width > self.width:
+                    cut = self._fit(word, size)
+                    yield word[:cut]
+                    word = word[cut:]
+                    width = self._word_width(word, size)
+                line_width += width + (space if line else 0.0)
+                line.append(word)
+            yield " ".join(line)
+
+    def _fit(self, word: str, size: float) -> int:
+        width = 0.0
+        for index, char in enumerate(word):
+            width += self._word_width(char, size)
+            if width > self.width:
+                return max(1, index)
+        return len(word)
+
+
+# messages: iterable of (role, header, text), read lazily. Returns the number of messages written
+def export_pdf(path, messages, fonts: list[str] | None = None) -> int:
+    writer = PdfWriter(fonts)
+    count = 0
+    for role, header, text in messages:
+        writer.add_message(role, header, text)
+        count += 1
+    writer.output(path)
+    return count
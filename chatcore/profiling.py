@@ -0,0 +1,209 @@
+# profiling.py - on-demand profiling of the running app, started and stopped with /profile and /memprofile
+# Two CPU profilers: cProfile on the thread that started it (the Tk main loop or the server's event loop) and on every
+# background task while it runs, saved as .pstats (snakeviz, flameprof, gprof2dot read it); or a sampler that looks at
+# every thread's stack every few milliseconds, saved as collapsed stacks for flamegraph.pl or speedscope. Memory is
+# traced with tracemalloc, the report lists the top allocations and what grew since tracing started.
+# Reports are written to the profiles directory next to the session journals; the saving runs on a worker.
+import cProfile
+import datetime
+import io
+import linecache
+import pstats
+import re
+import sys
+import threading
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+
+SAMPLE_INTERVAL = 0.005  # seconds between stack samples
+MEMORY_FRAMES = 25       # frames kept per traced allocation
+REPORT_LINES = 40        # functions / allocations in the text reports
+SUMMARY_LINES = 8        # of those shown in the chat
+# innermost frames of a thread that waits for work: an idle worker, the Tk main loop or the event loop between events
+IDLE_FRAMES = ("wait (threading.py", "get (queue.py", "_worker (thread.py", "mainloop (__init__.py", "select (selectors.py")
+
+
+class StackSampler:
+    def __init__(self, interval: float = SAMPLE_INTERVAL):
+        self.interval = interval
+        self.stacks = Counter()  # "thread;outer;...;inner" -> samples
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            # the workers of one pool ("chat-request_0", "chat-request_1", ...) are merged into one root
+            names = {t.ident: re.sub(r"_\d+$", "", t.name) for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                stack.append(names.get(ident, str(ident)))
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def stop(self) -> Counter:
+        self._stop.set()
+        self._thread.join()
+        return self.stacks
+
+
+class Profiler:
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self.mode = None  # "cprofile" or "sample" while a CPU profile runs
+        self._lock = threading.Lock()
+        self._main = None      # cProfile of the thread that started the profile
+        self._profiles = []    # cProfiles of the background tasks that finished since
+        self._sampler = None
+        self._memory_baseline = None
+
+    # False when a profile is already running. Call from the thread to profile (cProfile follows that thread)
+    def start(self, mode: str = "cprofile") -> bool:
+        with self._lock:
+            if self.mode is not None:
+                return False
+            self.mode = mode
+            self._profiles = []
+        if mode == "sample":
+            self._sampler = StackSampler()
+            return True
+        self._main = cProfile.Profile()
+        try:
+            self._main.enable()
+        except ValueError:  # another profiler is active on this thread, the background tasks are still profiled
+            self._main = None
+        return True
+
+    # runs work() for a background task, under its own cProfile while one is running. From Python 3.12 cProfile
+    # follows every thread already and a second one is refused, the task then runs under the first
+    def run(self, work):
+        if self.mode != "cprofile":
+            return work()
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            return work()
+        try:
+            return work()
+        finally:
+            profile.disable()
+            with self._lock:
+                if self.mode == "cprofile":
+                    self._profiles.append(profile)
+
+    # ends the profile, returns save() -> (paths, summary lines) to run on a worker, None when nothing was running.
+    # Call from the thread that started it
+    def stop(self):
+        with self._lock:
+            mode, self.mode = self.mode, None
+            profiles, self._profiles = self._profiles, []
+        if mode is None:
+            return None
+        if mode == "sample":
+            stacks = self._sampler.stop()
+            self._sampler = None
+            return lambda: self._save_samples(stacks)
+        if self._main is not None:
+            self._main.disable()
+            profiles.insert(0, self._main)
+            self._main = None
+        return lambda: self._save_pstats(profiles)
+
+    def _base_path(self, kind: str) -> Path:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # profile_20250101_120000, profile_20250101_120000-2 for a second one in the same second
+        stem = f"{kind}_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        base, number = self.directory / stem, 1
+        while any(self.directory.glob(base.name + ".*")):
+            number += 1
+            base = self.directory / f"{stem}-{number}"
+        return base
+
+    def _save_pstats(self, profiles: list):
+        if not profiles:
+            return [], []
+        base = self._base_path("profile")
+        report = io.StringIO()
+        stats = pstats.Stats(profiles[0], stream=report)
+        for profile in profiles[1:]:
+            stats.add(profile)
+        stats.dump_stats(base.with_suffix(".pstats"))
+        stats.sort_stats("cumulative").print_stats(REPORT_LINES)
+        base.with_suffix(".txt").write_text(report.getvalue(), encoding="utf-8")
+        # the chat gets the functions that took the most time themselves
+        top = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)[:SUMMARY_LINES]
+        summary = [f"{tottime * 1000:.0f} ms  {calls}x  {name} ({Path(file).name}:{line})"
+                   for (file, line, name), (_, calls, tottime, _, _) in top]
+        return [base.with_suffix(".pstats"), base.with_suffix(".txt")], summary
+
+    def _save_samples(self, stacks: Counter):
+        base = self._base_path("profile")
+        with open(base.with_suffix(".collapsed"), "w", encoding="utf-8") as f:
+            for stack, samples in stacks.most_common():
+                f.write(f"{stack} {samples}\n")
+        # per thread, how often it was busy and the frames those samples ended in (where its time went)
+        totals, busy = Counter(), {}
+        for stack, samples in stacks.items():
+            frames = stack.split(";")
+            totals[frames[0]] += samples
+            if not frames[-1].startswith(IDLE_FRAMES):
+                busy.setdefault(frames[0], Counter())[frames[-1]] += samples
+        lines = []
+        for thread, leaves in sorted(busy.items(), key=lambda item: sum(item[1].values()), reverse=True):
+            total = totals[thread]
+            lines.append(f"{thread}: busy in {sum(leaves.values()) / total:.0%} of {total} samples")
+            lines += [f"  {samples / total:6.1%}  {leaf}" for leaf, samples in leaves.most_common(5)]
+        idle = [thread for thread in totals if thread not in busy]
+        if idle:
+            lines.append("idle: " + ", ".join(sorted(idle)))
+        base.with_suffix(".txt").write_text("\n".join(lines) + "\n", encoding="utf-8")
+        return [base.with_suffix(".collapsed"), base.with_suffix(".txt")], lines[:SUMMARY_LINES]
+
+    # memory
+
+    @property
+    def tracing_memory(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def start_memory(self) -> bool:
+        if tracemalloc.is_tracing():
+            return False
+        tracemalloc.start(MEMORY_FRAMES)
+        self._memory_baseline = tracemalloc.take_snapshot()
+        return True
+
+    # returns save() -> (paths, summary lines), which takes the snapshot and stops tracing, None when not tracing
+    def stop_memory(self):
+        if not tracemalloc.is_tracing():
+            return None
+        baseline, self._memory_baseline = self._memory_baseline, None
+        return lambda: self._save_memory(baseline)
+
+    def _save_memory(self, baseline):
+        ignore = (tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, linecache.__file__),
+                  tracemalloc.Filter(False, __file__),
+                  tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"))
+        snapshot = tracemalloc.take_snapshot().filter_traces(ignore)
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        top = snapshot.statistics("lineno")
+        lines = [f"traced: {current / 1048576:.1f} MB now, {peak / 1048576:.1f} MB peak", "", "top allocations:"]
+        lines += [f"  {stat}" for stat in top[:REPORT_LINES]]
+        if baseline is not None:
+            lines += ["", "grown since tracing started:"]
+            lines += [f"  {stat}" for stat in snapshot.compare_to(baseline.filter_traces(ignore), "lineno")[:REPORT_LINES]]
+        lines += ["", "largest allocation sites with their tracebacks:"]
+        for stat in snapshot.statistics("traceback")[:5]:
+            lines.append(f"{stat.count} blocks, {stat.size / 1024:.1f} KiB")
+            lines += [f"  {line}" for line in stat.traceback.format()]
+        path = self._base_path("memory").with_suffix(".txt")
+        path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        return [path], lines[:3] + [f"  {stat}" for stat in top[:SUMMARY_LINES]]
@@ -0,0 +1,175 @@
+# providers.py - one interface for every model backend: complete, stream and count_tokens
+# Each provider keeps a single long-lived client, so connections are reused between requests instead of
+# paying a new TLS handshake for every prompt. Adding a backend means adding a subclass and registering it in services.py.
+# The SDKs are imported and set up on the first request (or by warm_up()), so starting the app doesn't wait for them.
+from __future__ import annotations
+import re
+import threading
+
+from .context import message_tokens
+
+# how many keep-alive connections a provider keeps open (one per concurrent request is enough)
+POOL_SIZE = 8
+
+
+class Provider:
+    name = ""
+    # translations key shown when the provider reports an exhausted quota
+    rate_limit_key = "error_prefix"
+    rate_limit_errors = ()
+
+    def __init__(self, model: str):
+        self.model = model
+        self._lock = threading.Lock()
+
+    # imports and sets up the SDK ahead of the first request
+    def warm_up(self):
+        pass
+
+    # full reply for a list of {"role", "content"} messages
+    def complete(self, messages: list[dict]) -> str:
+        raise NotImplementedError
+
+    # yields the reply in text chunks as they arrive
+    def stream(self, messages: list[dict]):
+        raise NotImplementedError
+
+    # local estimate, no network round-trip
+    def count_tokens(self, messages: list[dict]) -> int:
+        return sum(message_tokens(m, self.model) for m in messages)
+
+    def is_rate_limit(self, error: Exception) -> bool:
+        return isinstance(error, self.rate_limit_errors)
+
+    # seconds the provider asked us to wait before retrying, None when it didn't say
+    def retry_after(self, error: Exception) -> float | None:
+        match = re.search(r"retry (?:after|in) (\d+(?:\.\d+)?)\s*s", str(error), re.IGNORECASE)
+        return float(match.group(1)) if match else None
+
+
+class OpenAIProvider(Provider):
+    name = "OpenAI"
+    rate_limit_key = "rate_limit_openai"
+
+    # api_base points the SDK at another OpenAI compatible server (a proxy, the benchmark mock server)
+    def __init__(self, model: str, api_key: str | None, pool_size: int = POOL_SIZE, api_base: str | None = None):
+        super().__init__(model)
+        self.api_key = api_key
+        self.pool_size = pool_size
+        self.api_base = api_base
+        self.session = None
+        self._openai = None
+
+    @property
+    def rate_limit_errors(self):
+        return (self._sdk().error.RateLimitError,)
+
+    def warm_up(self):
+        self._sdk()
+
+    def _sdk(self):
+        with self._lock:
+            if self._openai is None:
+                import openai
+                import requests
+                openai.api_key = self.api_key
+                if self.api_base:
+                    openai.api_base = self.api_base
+                # the openai SDK uses this session for every call, so its connection pool is shared by all threads
+                self.session = requests.Session()
+                adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+                self.session.mount("https://", adapter)
+                self.session.mount("http://", adapter)
+                openai.requestssession = self.session
+                self._openai = openai
+            return self._openai
+
+    def retry_after(self, error: Exception) -> float | None:
+        headers = getattr(error, "headers", None) or {}
+        try:
+            if "retry-after-ms" in headers:
+                return float(headers["retry-after-ms"]) / 1000
+            if "retry-after" in headers:
+                return float(headers["retry-after"])
+        except ValueError:
+            pass
+        return super().retry_after(error)
+
+    def complete(self, messages: list[dict]) -> str:
+        response = self._sdk().ChatCompletion.create(model=self.model, messages=messages)
+        return response.choices[0].message.content.strip()
+
+    def stream(self, messages: list[dict]):
+        for chunk in self._sdk().ChatCompletion.create(model=self.model, messages=messages, stream=True):
+            text = chunk.choices[0].delta.get("content")
+            if text:
+                yield text
+
+
+class GeminiProvider(Provider):
+    name = "Gemini"
+    rate_limit_key = "rate_limit_gemini"
+
+    # endpoint ("http://127.0.0.1:8089") sends the requests to another server over the REST transport
+    def __init__(self, model: str, api_key: str | None, endpoint: str | None = None):
+        super().__init__(model)
+        self.api_key = api_key
+        self.endpoint = endpoint
+        self._client = None
+
+    @property
+    def rate_limit_errors(self):
+        from google.api_core.exceptions import ResourceExhausted
+        return (ResourceExhausted,)
+
+    def warm_up(self):
+        self.client()
+
+    # one model object for the whole session, the SDK keeps its transport open behind it
+    def client(self):
+        with self._lock:
+            if self._client is None:
+                import google.generativeai as genai
+                if self.endpoint:
+                    genai.configure(api_key=self.api_key, transport="rest", client_options={"api_endpoint": self.endpoint})
+                else:
+                    genai.configure(api_key=self.api_key)
+                self._client = genai.GenerativeModel(self.model)
+            return self._client
+
+    def retry_after(self, error: Exception) -> float | None:
+        # quota errors carry a google.rpc.RetryInfo detail with the delay
+        for detail in getattr(error, "details", None) or []:
+            delay = getattr(detail, "retry_delay", None)
+            if delay is not None:
+                return delay.seconds + delay.nanos / 1e9
+        return super().retry_after(error)
+
+    def complete(self, messages: list[dict]) -> str:
+        return self.client().generate_content(to_gemini_contents(messages)).text.strip()
+
+    def stream(self, messages: list[dict]):
+        for chunk in self.client().generate_content(to_gemini_contents(messages), stream=True):
+            # the last chunk can carry only the finish reason, .text raises on it
+            if chunk.parts:
+                yield chunk.text
+
+
+# Gemini has "user" and "model" turns only, system messages are put in front of the first user turn
+def to_gemini_contents(messages: list[dict]) -> list[dict]:
+    system = "\n\n".join(m["content"] for m in messages if m["role"] == "system")
+    contents = []
+    for m in messages:
+        if m["role"] == "system":
+            continue
+        role = "model" if m["role"] == "assistant" else "user"
+        if contents and contents[-1]["role"] == role:
+            contents[-1]["parts"].append(m["content"])
+        else:
+            contents.append({"role": role, "parts": [m["content"]]})
+    if system:
+        if contents and contents[0]["role"] == "user":
+            contents[0]["parts"].insert(0, system)
+        else:
+            contents.insert(0, {"role": "user", "parts": [system]})
+    return contents
@@ -0,0 +1,101 @@
+# scheduler.py - runs provider calls under a client-side rate limit, retries rate-limited calls with jittered
+# exponential backoff (honouring Retry-After when the provider sends it) and can fail over to another provider
+from __future__ import annotations
+import random
+import threading
+import time
+
+DEFAULT_MAX_RETRIES = 4
+BASE_DELAY = 1.0   # seconds, doubled on every retry
+MAX_DELAY = 30.0   # a longer Retry-After than this fails over right away (when failover is on)
+
+
+class TokenBucket:
+    # refills at requests_per_minute, holds at most `capacity` tokens so short bursts are still allowed
+    def __init__(self, requests_per_minute: float, capacity: float | None = None):
+        self.rate = requests_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else max(1.0, requests_per_minute / 6)
+        self.tokens = self.capacity
+        self.blocked_until = 0.0
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    # blocks until a token is available, returns how long it waited
+    def acquire(self, cost: float = 1.0) -> float:
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if now >= self.blocked_until and self.tokens >= cost:
+                    self.tokens -= cost
+                    return waited
+                delay = max(self.blocked_until - now, (cost - self.tokens) / self.rate if self.rate else 1.0)
+            time.sleep(delay)
+            waited += delay
+
+    # after a 429 nobody sends to this provider until the delay is over
+    def pause(self, seconds: float):
+        with self._lock:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+
+def backoff_delay(attempt: int, base: float = BASE_DELAY, cap: float = MAX_DELAY) -> float:
+    # "full jitter": a random delay between 0 and the exponential step keeps retrying clients from syncing up
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+class RequestScheduler:
+    # providers: name -> Provider, requests_per_minute: name -> limit
+    def __init__(self, providers: dict, requests_per_minute: dict, max_retries: int = DEFAULT_MAX_RETRIES,
+                 failover: bool = False, on_retry=None, metrics=None):
+        self.providers = providers
+        self.buckets = {name: TokenBucket(requests_per_minute.get(name, 60)) for name in providers}
+        self.max_retries = max_retries
+        self.failover = failover
+        self.on_retry = on_retry  # callable(name, attempt, delay), called before waiting for the retry
+        self.metrics = metrics  # records the time requests wait for the rate limit, and the retries
+
+    # call(provider) does the request; can_retry() says whether repeating it is still safe (nothing streamed yet),
+    # on_retry replaces the scheduler's callback for this request. Returns (name of the provider that answered, result)
+    def run(self, name: str, call, can_retry=lambda: True, on_retry=None):
+        order = [name]
+        if self.failover:
+            order += [other for other in self.providers if other != name]
+        error = None
+        for current in order:
+            try:
+                return current, self._run_one(current, call, can_retry, on_retry or self.on_retry)
+            except Exception as e:
+                if not self.providers[current].is_rate_limit(e) or not can_retry():
+                    raise
+                error = e
+                if self.metrics is not None and current != order[-1]:
+                    self.metrics.count("failovers_total", provider=current)
+        raise error
+
+    def _run_one(self, name: str, call, can_retry, on_retry):
+        provider = self.providers[name]
+        bucket = self.buckets[name]
+        attempt, waited = 0, 0.0
+        while True:
+            waited += bucket.acquire()
+            try:
+                result = call(provider)
+                if self.metrics is not None:
+                    self.metrics.observe("rate_limit_wait_seconds", waited, provider=name)
+                return result
+            except Exception as e:
+                if not provider.is_rate_limit(e) or not can_retry() or attempt >= self.max_retries:
+                    raise
+                retry_after = provider.retry_after(e)
+                delay = retry_after if retry_after is not None else backoff_delay(attempt)
+                bucket.pause(delay)
+                if self.failover and delay > MAX_DELAY:
+                    raise
+                if self.metrics is not None:
+                    self.metrics.count("retries_total", provider=name)
+                if on_retry:
+                    on_retry(name, attempt + 1, delay)
+                attempt += 1  # the next acquire() waits out the pause
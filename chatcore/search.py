@@ -0,0 +1,102 @@
+# search.py - full-text index over the session journals (SQLite FTS5, ranked with bm25)
+# The index remembers how far every journal was read, sync() only reads what was appended since,
+# so keeping it current costs as much as the new messages and not the whole archive.
+import json
+import sqlite3
+import threading
+from pathlib import Path
+
+INDEXED_ROLES = ("user", "assistant")
+DEFAULT_LIMIT = 10
+SNIPPET_TOKENS = 12
+
+
+class SearchHit:
+    __slots__ = ("session", "author", "timestamp", "snippet", "score")
+
+    def __init__(self, session: str, author: str, timestamp: float, snippet: str, score: float):
+        self.session = session
+        self.author = author
+        self.timestamp = timestamp
+        self.snippet = snippet
+        self.score = score
+
+
+# every word is quoted, so user input never reaches the FTS5 query syntax
+def build_query(text: str) -> str:
+    return " ".join('"' + word.replace('"', '""') + '"' for word in text.split())
+
+
+class SearchIndex:
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS messages USING fts5("
+            "text, author UNINDEXED, session UNINDEXED, ts UNINDEXED, tokenize='unicode61 remove_diacritics 2')"
+        )
+        self._conn.execute("CREATE TABLE IF NOT EXISTS sources (session TEXT PRIMARY KEY, offset INTEGER)")
+        self._conn.commit()
+
+    # indexes what was appended to the journals in the directory since the last sync, returns the number of new messages
+    def sync(self, directory: Path) -> int:
+        with self._lock:
+            offsets = dict(self._conn.execute("SELECT session, offset FROM sources").fetchall())
+        added = 0
+        for journal in sorted(Path(directory).glob("session_*.jsonl")):
+            offset = offsets.get(journal.stem, 0)
+            if journal.stat().st_size != offset:
+                added += self._sync_journal(journal, offset)
+        return added
+
+    # sessions: names of the journals (without .jsonl) to search in, None searches all of them
+    def search(self, text: str, limit: int = DEFAULT_LIMIT, sessions=None) -> list[SearchHit]:
+        query = build_query(text)
+        if not query or sessions is not None and not sessions:
+            return []
+        where, params = "messages MATCH ?", [query]
+        if sessions is not None:
+            sessions = list(sessions)
+            where += f" AND session IN ({', '.join('?' * len(sessions))})"
+            params += sessions
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT session, author, ts, snippet(messages, 0, '«', '»', '…', ?), bm25(messages) "
+                f"FROM messages WHERE {where} ORDER BY bm25(messages) LIMIT ?",
+                (SNIPPET_TOKENS, *params, limit)
+            ).fetchall()
+        return [SearchHit(*row) for row in rows]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _sync_journal(self, journal: Path, offset: int) -> int:
+        session = journal.stem
+        rows = []
+        with open(journal, "rb") as f:
+            if journal.stat().st_size < offset:
+                # the journal got shorter than what was indexed, it is indexed again from the start
+                offset = 0
+                with self._lock:
+                    self._conn.execute("DELETE FROM messages WHERE session = ?", (session,))
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # still being written, picked up by the next sync
+                offset += len(line)
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if record.get("type") == "message" and record.get("role") in INDEXED_ROLES:
+                    rows.append((record["text"], record["author"], session, record["ts"]))
+        with self._lock:
+            self._conn.executemany("INSERT INTO messages (text, author, session, ts) VALUES (?, ?, ?, ?)", rows)
+            self._conn.execute("INSERT OR REPLACE INTO sources (session, offset) VALUES (?, ?)", (session, offset))
+            self._conn.commit()
+        return len(rows)
@@ -0,0 +1,205 @@
+# services.py - what every session in the process shares: provider clients, the request scheduler, the caches,
+# the search index and the workers for file jobs, search and exports. The Tk app has one session over it,
+# the server many; either way there is one connection pool and one rate limit per provider.
+from __future__ import annotations
+import importlib
+import json
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+
+from . import config
+from .cache import ResponseCache, ExtractionCache
+from .extraction import shutdown_process_pool
+from .metrics import Metrics, MetricsWriter
+from .profiling import Profiler
+from .providers import OpenAIProvider, GeminiProvider, POOL_SIZE
+from .scheduler import RequestScheduler
+from .search import SearchIndex
+
+
+# model backends, the keys are the names shown in the model selector
+def default_providers(pool_size: int = POOL_SIZE) -> dict:
+    return {
+        "OpenAI": OpenAIProvider(config.OPENAI_MODEL, config.OPENAI_API_KEY, pool_size, config.OPENAI_API_BASE),
+        "Gemini": GeminiProvider(config.GOOGLE_MODEL, config.GOOGLE_API_KEY, config.GEMINI_API_ENDPOINT),
+    }
+
+
+# runs one session's tasks in order on a shared pool: many sessions share a few threads, and a session that queued
+# several prompts takes one pool slot at a time, so it can't hold up the others
+class SerialExecutor:
+    def __init__(self, pool: ThreadPoolExecutor):
+        self.pool = pool
+        self._lock = threading.Lock()
+        self._tasks = deque()  # (future, fn, args) waiting for their turn
+        self._scheduled = False  # a _run_next is submitted to the pool
+        self._shutdown = False
+
+    def submit(self, fn, *args) -> Future:
+        future = Future()
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError("cannot schedule new futures after shutdown")
+            self._tasks.append((future, fn, args))
+            if self._scheduled:
+                return future
+            self._scheduled = True
+        self.pool.submit(self._run_next)
+        return future
+
+    def shutdown(self, wait: bool = True, cancel_futures: bool = False):
+        # the pool is shared, only this session's queued tasks are dropped
+        with self._lock:
+            self._shutdown = True
+            if cancel_futures:
+                for future, _, _ in self._tasks:
+                    future.cancel()
+                self._tasks.clear()
+
+    def _run_next(self):
+        with self._lock:
+            if not self._tasks:  # dropped by shutdown
+                self._scheduled = False
+                return
+            future, fn, args = self._tasks.popleft()
+        if future.set_running_or_notify_cancel():
+            try:
+                future.set_result(fn(*args))
+            except BaseException as e:
+                future.set_exception(e)
+        with self._lock:
+            if not self._tasks:
+                self._scheduled = False
+                return
+        # the next task goes to the back of the pool queue, behind the other sessions' tasks
+        try:
+            self.pool.submit(self._run_next)
+        except RuntimeError:  # the pool was shut down
+            pass
+
+
+class Services:
+    # request_workers: None gives every session its own request thread (the Tk app),
+    # a number makes all sessions share a pool of that many threads (the server)
+    def __init__(self, providers: dict | None = None, data_dir: Path = config.APP_DATA_DIR,
+                 requests_per_minute: dict = config.REQUESTS_PER_MINUTE, failover: bool = config.FAILOVER_ENABLED,
+                 workers: int = 1, request_workers: int | None = None, metrics_file: Path | None = config.METRICS_FILE):
+        self.providers = default_providers(request_workers or POOL_SIZE) if providers is None else providers
+        self.data_dir = Path(data_dir)
+        self.sessions_dir = self.data_dir / "sessions"
+        # latency, size and error histograms of every session, shown by /perf
+        self.metrics = Metrics()
+        # /profile and /memprofile, the reports go next to the session journals
+        self.profiler = Profiler(self.data_dir / "profiles")
+        # every provider call goes through the scheduler: token bucket per provider, backoff on 429, optional failover
+        self.scheduler = RequestScheduler(self.providers, requests_per_minute, failover=failover, metrics=self.metrics)
+        # responses already received for the same model and context are answered from disk
+        self.response_cache = ResponseCache(self.data_dir / "response_cache.sqlite3")
+        # text of uploaded documents, re-uploading a known file skips parsing it
+        self.extraction_cache = ExtractionCache(self.data_dir / "extracted")
+        # full-text index over all session journals, brought up to date before every /search
+        self.search_index = SearchIndex(self.data_dir / "search.sqlite3")
+        # file jobs, /search and exports each have their own workers so they don't hold up the chat or each other
+        self.document_executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="document-job")
+        self.search_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="search")
+        self.export_executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="export")
+        self.request_pool = None
+        if request_workers:
+            self.request_pool = ThreadPoolExecutor(max_workers=request_workers, thread_name_prefix="chat-request")
+        # /export remembers per session and format how far it was exported: session id -> format -> mark
+        self.export_marks_file = self.data_dir / "exports.json"
+        self.export_marks = self._load_export_marks()
+        self._marks_lock = threading.Lock()
+        self._marks_file_lock = threading.Lock()
+        self._marks_version = self._marks_saved = 0
+        for name, cache in (("response_cache", self.response_cache), ("extraction_cache", self.extraction_cache)):
+            self.metrics.gauge(name + "_hits_total", lambda cache=cache: cache.hits)
+            self.metrics.gauge(name + "_misses_total", lambda cache=cache: cache.misses)
+        self.metrics_writer = MetricsWriter(self.metrics, metrics_file, config.METRICS_INTERVAL) if metrics_file else None
+
+    # where a session's model calls run, one at a time in the order they were submitted
+    def request_executor(self):
+        if self.request_pool is None:
+            return ThreadPoolExecutor(max_workers=1, thread_name_prefix="chat-request")
+        return SerialExecutor(self.request_pool)
+
+    def get_export_mark(self, session_id: str, kind: str) -> dict | None:
+        with self._marks_lock:
+            return self.export_marks.get(session_id, {}).get(kind)
+
+    # mark None forgets the format, the session's next export of it is then a full one
+    def set_export_mark(self, session_id: str, kind: str, mark: dict | None):
+        with self._marks_lock:
+            marks = self.export_marks.setdefault(session_id, {})
+            if mark is None:
+                marks.pop(kind, None)
+            else:
+                marks[kind] = mark
+            if not marks:
+                del self.export_marks[session_id]
+            self._marks_version += 1
+        # the file is written on an export worker, this is called from the UI thread or the server's event loop
+        try:
+            self.export_executor.submit(self._save_export_marks)
+        except RuntimeError:
+            pass  # shut down, close() writes them
+
+    # writes the marks as they are when it runs, so saves that finish out of order still leave the newest ones
+    def _save_export_marks(self):
+        with self._marks_file_lock:
+            with self._marks_lock:
+                marks = {session_id: dict(kinds) for session_id, kinds in self.export_marks.items()}
+                version = self._marks_version
+            if version == self._marks_saved:
+                return
+            try:
+                with open(self.export_marks_file, "w", encoding="utf-8") as f:
+                    json.dump(marks, f, indent=2)
+                self._marks_saved = version
+            except OSError:
+                pass  # the next export is then a full one
+
+    # imports the SDKs and file libraries ahead of the first request or upload
+    def warm_up(self):
+        for provider in self.providers.values():
+            try:
+                provider.warm_up()
+            except Exception:
+                pass  # a missing SDK is reported by the first request instead
+        for module in ("PyPDF2", "docx", "fpdf"):
+            try:
+                importlib.import_module(module)
+            except ImportError:
+                pass
+
+    def close(self):
+        if self.metrics_writer is not None:
+            self.metrics_writer.close()
+        if self.request_pool is not None:
+            self.request_pool.shutdown(wait=False, cancel_futures=True)
+        self.document_executor.shutdown(wait=False, cancel_futures=True)
+        self.search_executor.shutdown(wait=False, cancel_futures=True)
+        self.export_executor.shutdown(wait=False, cancel_futures=True)
+        self._save_export_marks()
+        shutdown_process_pool()
+        self.response_cache.close()
+        self.extraction_cache.close()
+        self.search_index.close()
+
+    # marks of files that were deleted since are dropped, so the file doesn't grow with every session ever exported
+    def _load_export_marks(self) -> dict:
+        try:
+            with open(self.export_marks_file, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        marks = {}
+        for session_id, kinds in saved.items():
+            if not isinstance(kinds, dict) or "path" in kinds:
+                continue  # a mark of the old format -> mark file, which didn't know its session
+            kinds = {kind: mark for kind, mark in kinds.items() if Path(mark.get("path", "")).is_file()}
+            if kinds:
+                marks[session_id] = kinds
+        return marks
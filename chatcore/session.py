@@ -0,0 +1,606 @@
+# session.py - one conversation without any UI: history, model context, journal, model requests, file jobs, exports
+# A front end (the Tk window in app.py, a server, a benchmark) creates a ChatSession over the shared Services and
+# gets everything the session shows through its Frontend. Model calls run on the session's own request worker, so
+# its prompts are answered in order; results are handed back through Frontend.post and applied under session.lock.
+from __future__ import annotations
+import datetime
+import os
+import platform
+import threading
+import time
+from pathlib import Path
+
+from . import config
+from .commands import CommandRegistry
+from .context import ConversationContext, count_tokens
+from .documents import chunk_text, summarize_document, translate_document, JobCancelled
+from .exporters import COMPRESSIONS, ExportError, export_history, get_exporter
+from .extraction import iter_text_blocks, read_text_blocks, is_supported, ExtractionError
+from .journal import SessionJournal, latest_session, new_session_path, read_journal
+from .message_store import MessageStore, USER, ASSISTANT, SYSTEM
+from .session_commands import register_core_commands
+from .translations import tr
+
+
+# what the session shows, a front end overrides the calls it displays. post() decides on which thread the session's
+# callbacks run (the default runs them right away on the worker); everything else except stream_text is called from them
+class Frontend:
+    def post(self, callback, *args):
+        callback(*args)
+
+    # a message was added to the history
+    def message(self, session, message):
+        pass
+
+    # a streamed reply starts, its text follows through stream_text, which is called on the request worker
+    def stream_begin(self, session, model_choice: str, timestamp: float):
+        pass
+
+    def stream_text(self, session, text: str):
+        pass
+
+    # the streamed reply is complete and was added to the history as message
+    def stream_end(self, session, message):
+        pass
+
+    # one line of file job progress, rewritten in place until progress_end
+    def progress(self, session, text: str):
+        pass
+
+    def progress_end(self, session):
+        pass
+
+    # pending requests and retry waits, "" clears it
+    def status(self, session, text: str):
+        pass
+
+    # /clear emptied the history
+    def cleared(self, session):
+        pass
+
+    # /switch picked another model
+    def model_changed(self, session, model_choice: str):
+        pass
+
+    # an export was written to path
+    def exported(self, session, path: Path):
+        pass
+
+
+def get_desktop_path():
+    # Return the user's Desktop path on Windows, macOS, or Linux with OneDrive support.
+    # Var for OS
+    system = platform.system()
+    # check for desktop path depending on Operating System, sets paths array for Windows or Linux/macOS
+    if system == "Windows":
+        user_profile = os.environ.get("USERPROFILE", "")
+        candidates = [
+            Path(user_profile) / "OneDrive" / "Desktop",
+            Path(user_profile) / "Desktop"
+        ]
+    else:
+        candidates = [ Path.home() / "Desktop" ]
+
+    for p in candidates:
+        if p.exists():
+            return p
+    # fallback to cwd
+    return Path.cwd()
+
+
+class ChatSession:
+    # resume reopens the newest journal in the sessions directory, otherwise a new one is started.
+    # commands: registry the front end already put its own commands in, the core commands are added to it.
+    # private: /search only finds this session's own journals (a server, where the sessions belong to different users)
+    # admin: may use the commands that change what all sessions share (/failover, /profile, /memprofile, /perf reset)
+    def __init__(self, services, frontend: Frontend | None = None, resume: bool = False, lang: str = "en",
+                 model_choice: str | None = None, commands: CommandRegistry | None = None,
+                 context_budget: int = config.CONTEXT_TOKEN_BUDGET, rolling_summary: bool = config.CONTEXT_ROLLING_SUMMARY,
+                 export_dir: Path | None = None, private: bool = False, admin: bool = True):
+        self.services = services
+        self.frontend = frontend or Frontend()
+        self.lock = threading.RLock()
+        self.history = MessageStore()
+        self.lang = lang
+        self.current_model = model_choice or next(iter(services.providers))
+        self.streaming_enabled = True
+        self.cache_enabled = True  # /nocache switches cache lookups off
+        self.export_dir = export_dir  # None exports to the desktop
+        self.private = private
+        self.admin = admin
+        self.journal_names = set()  # journals this session wrote, the ones a private session searches
+        self._closing_journals = []  # journals /clear closed that may still be writing
+        self.pending = 0
+        self.document_jobs = set()  # cancel events of running file jobs, the workers remove their own
+        self._jobs_lock = threading.Lock()
+        self._stream_started = None
+        self._export_names = ("", set())  # export file names handed out in the current second
+        self._exports_writing = set()  # paths the export worker is still writing, they don't exist yet
+        self._last_future = None  # what the last command handed to a worker, returned by run_command
+        # model calls run one at a time so queued prompts are answered in order
+        self.request_executor = services.request_executor()
+        # conversation sent to the models, bounded by context_budget
+        self.context = ConversationContext(
+            config.SYSTEM_PROMPT,
+            budget=context_budget,
+            model=config.OPENAI_MODEL,
+            summarize=self._summarize_evicted if rolling_summary else None
+        )
+        # every message and context change is appended to the journal
+        self.journal = None
+        path = latest_session(services.sessions_dir) if resume else None
+        if path is not None:
+            self._restore(path)
+        self.journal = self._open_journal(path or new_session_path(services.sessions_dir))
+        self.commands = commands if commands is not None else CommandRegistry()
+        register_core_commands(self)
+
+    # the name of the journal, exports of the same session continue each other
+    @property
+    def session_id(self) -> str:
+        return self.journal.path.name
+
+    @property
+    def providers(self) -> dict:
+        return self.services.providers
+
+    # messages and commands, called on the front end's thread
+
+    # a prompt for the model or a "/command", returns the future of the background work (None when there is none)
+    def submit(self, text: str):
+        text = text.strip()
+        if not text:
+            return None
+        if text.startswith("/"):
+            return self.run_command(text)
+        return self.send(text)
+
+    def send(self, prompt: str, model_choice: str | None = None):
+        with self.lock:
+            if model_choice is not None:
+                self.current_model = model_choice
+            model_choice = self.current_model
+            self.add_message(USER, "You", prompt)
+            # reply is shown once it comes back (or piece by piece when streaming), under the model that gave it
+            if self.streaming_enabled:
+                return self.run_in_background(lambda: self.request_reply(prompt, model_choice, stream=True),
+                                              lambda result: self._end_stream(*result))
+            return self.run_in_background(lambda: self.request_reply(prompt, model_choice),
+                                          lambda result: self.add_message(ASSISTANT, *result, model=result[0]))
+
+    # runs "/name args", a partial or misspelled name gets suggestions. Returns the future of background work, if any
+    def run_command(self, text: str):
+        with self.lock:
+            self._last_future = None
+            if not self.commands.dispatch(text):
+                suggestions = self.commands.suggest(text.split()[0])
+                if suggestions:
+                    self.system_message(tr("messages.did_you_mean", self.lang).format("\n".join(suggestions)))
+                else:
+                    self.system_message(tr("messages.unknown_command", self.lang))
+            return self._last_future
+
+    def add_message(self, role: str, author: str, text: str, model: str | None = None, timestamp: float | None = None):
+        message = self._record(role, author, text, model, timestamp)
+        self.frontend.message(self, message)
+        return message
+
+    # adds the message to the history and the journal without showing it
+    def _record(self, role: str, author: str, text: str, model: str | None, timestamp: float | None):
+        message = self.history.add(role, author, text, model=model, timestamp=timestamp)
+        self.journal.append({"type": "message", "role": role, "author": author, "model": model, "ts": message.timestamp,
+                             "text": text})
+        return message
+
+    def system_message(self, text: str):
+        return self.add_message(SYSTEM, "System", text)
+
+    # turns sent to the model, journaled so the context can be rebuilt on the next launch
+    def remember(self, role: str, content: str):
+        self.context.append(role, content)
+        self.journal.append({"type": "context", "role": role, "content": content})
+
+    # /clear starts a new journal, the model context carries over into it
+    def clear(self):
+        self.frontend.cleared(self)
+        self.history.clear()
+        # the old journal finishes writing on its own thread, /clear doesn't wait for the disk
+        self._closing_journals = [journal for journal in self._closing_journals if journal.writing]
+        self._closing_journals.append(self.journal)
+        self.journal.close(wait=False)
+        self.journal = self._open_journal(new_session_path(self.services.sessions_dir))
+        summary, turns = self.context.snapshot()
+        self.journal.append({"type": "collapse", "text": summary})
+        for message in turns:
+            self.journal.append({"type": "context", "role": message["role"], "content": message["content"]})
+
+    def _open_journal(self, path: Path) -> SessionJournal:
+        path = Path(path)
+        journal = SessionJournal(path, on_error=lambda e: self.post(self._journal_failed, path, e))
+        self.journal_names.add(journal.path.stem)
+        return journal
+
+    # shown without being journaled, writing to the journal is what failed
+    def _journal_failed(self, path: Path, error: Exception):
+        message = self.history.add(SYSTEM, "System", tr("messages.journal_failed", self.lang).format(path.name, error))
+        self.frontend.message(self, message)
+
+    def close(self):
+        with self.lock:
+            self.request_executor.shutdown(wait=False, cancel_futures=True)  # queued prompts are dropped
+            self.cancel_documents()
+            for journal in self._closing_journals + [self.journal]:
+                journal.close()
+
+    # background work
+
+    def run_in_background(self, work, on_done, executor=None, kind: str = "request"):
+        # runs work() on the request worker (or the given executor), on_done(result) is then called through post.
+        # kind names the executor in the queue wait metrics
+        self.pending += 1
+        self._show_pending()
+        submitted = time.perf_counter()
+
+        def task():
+            self.services.metrics.observe("queue_wait_seconds", time.perf_counter() - submitted, executor=kind)
+            try:
+                result = self.services.profiler.run(work)
+            except Exception as e:
+                result = tr("error_prefix", self.lang) + f" {e}"
+            self.post(self._finish_background, on_done, result)
+
+        future = (executor or self.request_executor).submit(task)
+        self._last_future = future
+        return future
+
+    # safe to call from any thread, the callback runs where the front end runs session callbacks
+    def post(self, callback, *args):
+        self.frontend.post(self._run_locked, callback, *args)
+
+    def _run_locked(self, callback, *args):
+        with self.lock:
+            callback(*args)
+
+    def _finish_background(self, on_done, result):
+        self.pending -= 1
+        self._show_pending()
+        on_done(result)
+
+    def _show_pending(self):
+        self.frontend.status(self, tr("messages.pending", self.lang).format(self.pending) if self.pending else "")
+
+    # model requests, these run on the workers
+
+    # returns (name of the model that answered, reply); after a failover that is not model_choice
+    def request_reply(self, prompt: str, model_choice: str, stream: bool = False) -> tuple:
+        streamed = []
+        if stream:
+            self.post(self._begin_stream, model_choice)
+        # appends user's input to the context, takes model response into reply var, that is added to the context too
+        try:
+            self.remember("user", prompt)
+            request_messages, request_tokens = self.context.request()
+            name, reply = self.cached_completion(model_choice, request_messages, streamed if stream else None,
+                                                 request_tokens)
+            self.remember("assistant", reply)
+            if name != model_choice:
+                self.post(self.system_message, tr("messages.failover", self.lang).format(model_choice, name))
+        # error handling for exceeding the rate limit or some exceptions
+        except Exception as e:
+            reply = self.describe_error(self.providers[model_choice], e)
+        else:
+            return name, reply
+        # keep the part that was already streamed in front of the error
+        return model_choice, "".join(streamed) + "\n" + reply if streamed else reply
+
+    def cached_completion(self, model_choice: str, request_messages: list[dict], streamed: list | None = None,
+                          request_tokens: int | None = None):
+        # cache first, then the scheduler; streamed collects the chunks when the reply is streamed to the front end.
+        # request_tokens: the context's count of request_messages, one-off requests are counted here.
+        # Returns (name of the provider that answered, reply), the reply is stored even when lookups are bypassed
+        services = self.services
+        if self.cache_enabled:
+            reply = services.response_cache.get(self.providers[model_choice].model, request_messages)
+            if reply is not None:
+                return model_choice, reply
+        metrics = services.metrics
+        start = time.perf_counter()
+        first_text = []  # when the first streamed chunk arrived
+        try:
+            if streamed is None:
+                name, reply = services.scheduler.run(model_choice, lambda p: p.complete(request_messages),
+                                                     on_retry=self._notify_retry)
+            else:
+                # once text reached the front end the request can't be repeated without duplicating it
+                name, reply = services.scheduler.run(
+                    model_choice, lambda p: self._stream_text(p.stream(request_messages), streamed, first_text).strip(),
+                    can_retry=lambda: not streamed, on_retry=self._notify_retry)
+        except Exception as e:
+            metrics.count("errors_total", op="request", provider=model_choice, error=type(e).__name__)
+            raise
+        # latency from the call to the last chunk, including rate limit waits and retries
+        provider = self.providers[name]
+        metrics.observe("request_seconds", time.perf_counter() - start, provider=name,
+                        mode="complete" if streamed is None else "stream")
+        if first_text:
+            metrics.observe("ttft_seconds", first_text[0] - start, provider=name)
+        if request_tokens is None:
+            request_tokens = provider.count_tokens(request_messages)
+        metrics.observe("tokens_in", request_tokens, provider=name)
+        metrics.observe("tokens_out", count_tokens(reply, provider.model), provider=name)
+        metrics.observe("request_bytes", sum(len(m["content"].encode("utf-8")) for m in request_messages), provider=name)
+        metrics.observe("reply_bytes", len(reply.encode("utf-8")), provider=name)
+        services.response_cache.put(provider.model, request_messages, reply)
+        return name, reply
+
+    # one-off requests used by /shrink, /translate and file jobs
+    def request_one_shot(self, prompt: str, model_choice: str) -> str:
+        return self.cached_completion(model_choice, [{"role": "user", "content": prompt}])[1]
+
+    def request_summary(self, summary_prompt: str, model_choice: str) -> str:
+        try:
+            summary = self.request_one_shot(summary_prompt, model_choice)
+            # the summary replaces the turns that are sent with the next requests
+            self.context.collapse(summary)
+            self.journal.append({"type": "collapse", "text": summary})
+            return tr("messages.summary_result", self.lang).format(summary)
+        except Exception as e:
+            return tr("messages.summary_failed", self.lang).format(e)
+
+    def request_translation(self, translate_prompt: str, lang: str, model_choice: str) -> str:
+        try:
+            translation = self.request_one_shot(translate_prompt, model_choice)
+            return tr("messages.translation_result", self.lang).format(lang, translation)
+        except Exception as e:
+            return tr("messages.translation_failed", self.lang).format(e)
+
+    def describe_error(self, provider, error: Exception) -> str:
+        if provider.is_rate_limit(error):
+            return tr(provider.rate_limit_key, self.lang)
+        return tr("error_prefix", self.lang) + f" {error}"
+
+    def _stream_text(self, chunks, streamed: list, first_text: list) -> str:
+        # forwards every text chunk to the front end as it arrives and returns the full text
+        for text in chunks:
+            if text:
+                if not first_text:
+                    first_text.append(time.perf_counter())
+                streamed.append(text)
+                self.frontend.stream_text(self, text)
+        return "".join(streamed)
+
+    def _begin_stream(self, model_choice: str):
+        self._stream_started = time.time()
+        self.frontend.stream_begin(self, model_choice, self._stream_started)
+
+    # name: the model that answered, which began the stream as another one after a failover
+    def _end_stream(self, name: str, reply: str):
+        message = self._record(ASSISTANT, name, reply, name, self._stream_started)
+        # the final reply replaces the streamed text if they differ (trimmed whitespace, errors, another author)
+        self.frontend.stream_end(self, message)
+
+    # status line while a rate-limited request waits for its retry, called on the worker
+    def _notify_retry(self, name: str, attempt: int, delay: float):
+        self.post(self.frontend.status, self, tr("messages.retrying", self.lang).format(name, delay, attempt))
+
+    # rolling summary of turns that no longer fit the budget, runs on the request worker
+    def _summarize_evicted(self, summary_prompt: str) -> str:
+        summary = self.services.scheduler.run(self.current_model,
+                                              lambda p: p.complete([{"role": "user", "content": summary_prompt}]),
+                                              on_retry=self._notify_retry)[1]
+        self.journal.append({"type": "summary", "text": summary.strip()})
+        return summary
+
+    # uploaded files - whole documents are chunked and sent in parallel on a document worker
+
+    def process_file(self, path, action: str, target_lang: str | None = None):
+        with self.lock:
+            try:
+                if not is_supported(path):
+                    self.system_message(tr("error_prefix", self.lang) + " " + tr("unsupported_file", self.lang))
+                    return None
+                # the file is read lazily by the document worker, block by block (or from the extraction cache)
+                metrics = self.services.metrics
+                file_type = Path(path).suffix.lower()
+                metrics.observe("file_bytes", os.path.getsize(path), type=file_type)
+                blocks = metrics.timed_blocks("extract", self.services.extraction_cache.blocks(
+                    path, iter_text_blocks, read_text_blocks), type=file_type)
+            except Exception as e:
+                self.services.metrics.count("errors_total", op="extract", error=type(e).__name__)
+                self.system_message(tr("messages.file_read_error", self.lang).format(e))
+                return None
+            name = Path(path).name
+            model_choice = self.current_model
+            cancel = threading.Event()
+            with self._jobs_lock:
+                self.document_jobs.add(cancel)
+            return self.run_in_background(lambda: self.process_document(name, blocks, action, target_lang, model_choice, cancel),
+                                          lambda text: self._finish_document(model_choice, text),
+                                          executor=self.services.document_executor, kind="document")
+
+    # asks every running file job to stop, False when there was none
+    def cancel_documents(self) -> bool:
+        with self._jobs_lock:
+            jobs = list(self.document_jobs)
+        for cancel in jobs:
+            cancel.set()
+        return bool(jobs)
+
+    def process_document(self, name: str, blocks, action: str, target_lang: str | None, model_choice: str, cancel) -> str:
+        # runs on the document worker, the model calls themselves run on the map pool in documents.py
+        chunks = chunk_text(blocks, config.DOCUMENT_CHUNK_TOKENS)
+        # the chunks run on the map pool, outside run_in_background, so they are profiled here
+        complete = lambda prompt: self.services.profiler.run(lambda: self.request_one_shot(prompt, model_choice))
+        progress = lambda done: self.post(self.frontend.progress, self,
+                                          tr("messages.file_progress", self.lang).format(name, done))
+        progress(0)
+        metrics = self.services.metrics
+        start = time.perf_counter()
+        try:
+            if action == "summarize":
+                summary = summarize_document(chunks, complete, config.DOCUMENT_CHUNK_TOKENS, config.DOCUMENT_MAX_PARALLEL,
+                                             cancel, progress)
+                if not summary:
+                    return tr("file_empty", self.lang)
+                # the summary goes into the conversation so follow-up questions can refer to it
+                self.remember("user", f"Summarize the file {name}.")
+                self.remember("assistant", summary)
+                return tr("summary_header", self.lang) + summary
+            translation = "\n".join(translate_document(chunks, complete, target_lang, config.DOCUMENT_MAX_PARALLEL,
+                                                       cancel, progress))
+            if not translation:
+                return tr("file_empty", self.lang)
+            return tr("translate_header", self.lang).format(lang=target_lang) + translation
+        except JobCancelled:
+            return tr("messages.file_cancelled", self.lang).format(name)
+        except (ExtractionError, OSError) as e:
+            metrics.count("errors_total", op="extract", error=type(e).__name__)
+            return tr("messages.file_read_error", self.lang).format(e)
+        except Exception as e:
+            metrics.count("errors_total", op="document", error=type(e).__name__)
+            return self.describe_error(self.providers[model_choice], e)
+        finally:
+            metrics.observe("document_seconds", time.perf_counter() - start, action=action)
+            with self._jobs_lock:
+                self.document_jobs.discard(cancel)
+
+    def _finish_document(self, model_choice: str, text: str):
+        self.frontend.progress_end(self)
+        self.add_message(ASSISTANT, model_choice, text, model=model_choice)
+
+    # exports - the history is copied here, laid out and written on the export worker
+
+    def output_dir(self) -> Path:
+        return self.export_dir or get_desktop_path()
+
+    # chat_log_<time>.<ext> in the output directory, chat_log_<time>-2.<ext> for the next one in the same second.
+    # Names are reserved when handed out, an export queued behind another one doesn't get the same file
+    def new_export_path(self, ext: str) -> Path:
+        stem = f"chat_log_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        if self._export_names[0] != stem:
+            self._export_names = (stem, set())
+        taken = self._export_names[1]
+        path, number = self.output_dir() / f"{stem}.{ext}", 1
+        while path.name in taken or path.exists():
+            number += 1
+            path = self.output_dir() / f"{stem}-{number}.{ext}"
+        taken.add(path.name)
+        return path
+
+    # where an export went as the chat shows it: the whole path on the desktop, only the name on a server
+    def export_label(self, path: Path) -> str:
+        return str(path) if self.export_dir is None else path.name
+
+    def save_as(self, path: Path, name: str, success_key: str, failure_key: str):
+        history = self.history.snapshot()
+        return self.run_in_background(lambda: self._write_export(path, history, name, success_key, failure_key),
+                                      lambda result: self._exported(path, *result),
+                                      executor=self.services.export_executor, kind="export")
+
+    def export_chat_to_pdf(self):
+        return self.save_as(self.new_export_path("pdf"), "pdf", "messages.pdf_export_success",
+                            "messages.pdf_export_failed")
+
+    # runs on the export worker, returns whether it worked and the message for the chat
+    def _write_export(self, path: Path, history, name: str, success_key: str, failure_key: str):
+        try:
+            self._timed_export(history, path, name)
+            return True, tr(success_key, self.lang).format(self.export_label(path))
+        except Exception as e:
+            return False, tr(failure_key, self.lang).format(e)
+
+    def _exported(self, path: Path, ok: bool, text: str):
+        self.system_message(text)
+        if ok:
+            self.frontend.exported(self, path)
+
+    # export_history with its duration and the bytes it added to the file recorded, runs on the export worker
+    def _timed_export(self, history, path: Path, name: str, compression: str | None = None, start: int = 0) -> int:
+        metrics = self.services.metrics
+        began = time.perf_counter()
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            size = path.stat().st_size if start and path.exists() else 0
+            written = export_history(history, path, name, compression, start)
+        except Exception as e:
+            metrics.count("errors_total", op="export", format=name, error=type(e).__name__)
+            raise
+        metrics.observe("export_seconds", time.perf_counter() - began, format=name)
+        metrics.observe("export_bytes", path.stat().st_size - size, format=name)
+        return written
+
+    # /export remembers per format how far this session was exported, the next export of the same format
+    # appends only the newer messages to that file ("full" starts a new file)
+    def start_export(self, kind: str, full: bool = False):
+        name, _, compression = kind.partition(".")
+        try:
+            exporter = get_exporter(name)
+            if compression and compression not in COMPRESSIONS:
+                raise ExportError(f"unknown compression: {compression}")
+        except ExportError as e:
+            self.system_message(tr("messages.export_failed", self.lang).format(e))
+            return None
+        mark = self.services.get_export_mark(self.session_id, kind)
+        if (not full and exporter.appendable and mark and mark["count"] <= len(self.history)
+                and (mark["path"] in self._exports_writing or Path(mark["path"]).exists())):
+            path, start = Path(mark["path"]), mark["count"]
+            if start == len(self.history):
+                self.system_message(tr("messages.export_up_to_date", self.lang).format(path.name))
+                return None
+        else:
+            path, start = self.new_export_path(kind), 0
+        history = self.history.snapshot()
+        # the mark moves right away so an export queued behind this one continues after it
+        session_id = self.session_id
+        self.services.set_export_mark(session_id, kind, {"path": str(path), "count": len(history)})
+        self._exports_writing.add(str(path))
+
+        def work():
+            try:
+                written = self._timed_export(history, path, name, compression or None, start)
+                return True, tr("messages.export_done", self.lang).format(written, self.export_label(path))
+            except Exception as e:
+                return False, tr("messages.export_failed", self.lang).format(e)
+
+        return self.run_in_background(work, lambda result: self._finish_export(session_id, kind, path, *result),
+                                      executor=self.services.export_executor, kind="export")
+
+    def _finish_export(self, session_id: str, kind: str, path: Path, ok: bool, text: str):
+        self._exports_writing.discard(str(path))
+        if not ok:
+            self.services.set_export_mark(session_id, kind, None)
+        self._exported(path, ok, text)
+
+    # search over every journaled session (a private session only its own), runs on the search worker
+    def search(self, query: str) -> str:
+        index = self.services.search_index
+        start = time.perf_counter()
+        index.sync(self.services.sessions_dir)
+        with self.lock:
+            sessions = sorted(self.journal_names) if self.private else None
+        hits = index.search(query, sessions=sessions)
+        self.services.metrics.observe("search_seconds", time.perf_counter() - start)
+        if not hits:
+            return tr("messages.search_no_results", self.lang).format(query)
+        lines = [f"{datetime.datetime.fromtimestamp(hit.timestamp).strftime('%Y-%m-%d %H:%M')} {hit.author}: {hit.snippet}"
+                 for hit in hits]
+        return tr("messages.search_results", self.lang).format(query, "\n".join(lines))
+
+    # replays a journal into the history, the front end and the model context
+    def _restore(self, path: Path):
+        summary, turns = "", []
+        for record in read_journal(path):
+            kind = record.get("type")
+            if kind == "message":
+                message = self.history.add(record["role"], record["author"], record["text"],
+                                           model=record.get("model"), timestamp=record["ts"])
+                self.frontend.message(self, message)
+            elif kind == "context":
+                turns.append({"role": record["role"], "content": record["content"]})
+            elif kind == "summary":
+                summary = record["text"]
+            elif kind == "collapse":
+                summary, turns = record["text"], []
+            elif kind == "reset":
+                summary, turns = "", []
+        self.context.restore(summary, turns)
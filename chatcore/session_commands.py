@@ -0,0 +1,226 @@
+# session_commands.py - the slash commands every front end has, registered on a session's command registry
+# Commands that need a window (dialogs, the clipboard, themes, opening a browser) are registered by the front end.
+# Commands that change what every session in the process shares are only given to admin sessions.
+import time
+
+from .exporters import EXPORTERS, COMPRESSIONS
+from .message_store import USER, ASSISTANT
+from .translations import tr
+
+
+def register_core_commands(session):
+    commands = session.commands
+    say = session.system_message
+
+    def lang():
+        return session.lang
+
+    @commands.register("/help")
+    def show_help(args):
+        # "/foo <args> — localized description" for every command, under the localized header
+        say(f"{tr('help_header', lang())}\n" + "\n".join(commands.help_lines(lang())))
+
+    @commands.register("/clear")
+    def clear_chat(args):
+        session.clear()
+        say(tr("messages.chat_cleared", lang()))
+
+    @commands.register("/model")
+    def show_model(args):
+        say(tr("messages.current_model", lang()).format(session.current_model))
+
+    @commands.register("/switch")
+    def switch_model(args):
+        # cycles through the registered providers
+        names = list(session.providers)
+        session.current_model = names[(names.index(session.current_model) + 1) % len(names)]
+        session.frontend.model_changed(session, session.current_model)
+        say(tr("messages.switched_model", lang()).format(session.current_model))
+
+    @commands.register("/stats")
+    def show_stats(args):
+        cache = session.services.response_cache
+        say(tr("messages.messages_exchanged", lang()).format(len(session.history)) + "\n" +
+            tr("messages.cache_stats", lang()).format(cache.hits, cache.hits + cache.misses, cache.hit_rate()))
+
+    @commands.register("/perf", args="[reset]")
+    def show_perf(args):
+        # p50/p95/p99 of everything measured since the start (or the last "/perf reset"), across all sessions
+        metrics = session.services.metrics
+        if args.strip().lower() == "reset":
+            if not session.admin:
+                say(tr("messages.admin_only", lang()))
+                return
+            metrics.reset()
+            say(tr("messages.perf_reset", lang()))
+            return
+        minutes = (time.time() - metrics.started) / 60
+        say(tr("messages.perf_header", lang()).format(minutes) + "\n" + "\n".join(metrics.report_lines()))
+
+    @commands.register("/cancel")
+    def cancel_documents(args):
+        if session.cancel_documents():
+            say(tr("messages.file_cancelling", lang()))
+        else:
+            say(tr("messages.nothing_to_cancel", lang()))
+
+    @commands.register("/nocache")
+    def toggle_cache(args):
+        session.cache_enabled = not session.cache_enabled
+        say(tr("messages.cache_on", lang()) if session.cache_enabled else tr("messages.cache_off", lang()))
+
+    @commands.register("/feedback")
+    def show_feedback(args):
+        say(tr("messages.feedback", lang()))
+
+    @commands.register("/history")
+    def show_history(args):
+        user_messages = [session.history.format(m) for m in session.history.last_n(5, USER)]
+        say(tr("messages.last_messages", lang()).format("\n".join(user_messages)))
+
+    @commands.register("/search", args="<words>")
+    def search_command(args):
+        if not args:
+            say(tr("messages.search_usage", lang()))
+        else:
+            session.run_in_background(lambda: session.search(args), say, executor=session.services.search_executor,
+                                      kind="search")
+
+    @commands.register("/version")
+    def show_version(args):
+        say(tr("messages.version", lang()))
+
+    @commands.register("/stream")
+    def toggle_streaming(args):
+        session.streaming_enabled = not session.streaming_enabled
+        say(tr("messages.streaming_on", lang()) if session.streaming_enabled else tr("messages.streaming_off", lang()))
+
+    @commands.register("/context", args="[tokens]")
+    def context_command(args):
+        # "/context" shows the window, "/context 4000" sets a new token budget
+        context = session.context
+        if args.isdigit():
+            new_budget = int(args)
+            session.run_in_background(lambda: context.set_budget(new_budget),
+                                      lambda _: say(tr("messages.context_budget_set", lang()).format(new_budget)))
+        else:
+            say(tr("messages.context_info", lang()).format(context.token_count(), context.budget, context.evicted_count))
+
+    @commands.register("/reset")
+    def reset_context(args):
+        session.context.reset()
+        session.journal.append({"type": "reset"})
+        say(tr("messages.context_reset", lang()))
+
+    @commands.register("/exportjson")
+    def export_json(args):
+        session.save_as(session.new_export_path("json"), "json", "messages.json_exported", "messages.json_export_failed")
+
+    @commands.register("/exportpdf")
+    def export_pdf_command(args):
+        session.export_chat_to_pdf()
+
+    @commands.register("/export", args="<format>[.gz|.zst] [full]")
+    def export_command(args):
+        # "/export md", "/export jsonl.gz", "/export html full"
+        parts = args.lower().split()
+        if not parts:
+            say(tr("messages.export_usage", lang()).format("|".join(EXPORTERS), "|".join("." + c for c in COMPRESSIONS)))
+        else:
+            session.start_export(parts[0], full="full" in parts[1:])
+
+    @commands.register("/emoji")
+    def show_emoji(args):
+        emoji_list = "😀 😎 🤖 🧠 💬 ✅ ❌ 💡 🔁 📝"
+        say(tr("messages.emoji_list", lang()).format(emoji_list))
+
+    @commands.register("/shrink")
+    def shrink_context(args):
+        history = session.history
+        if len(history) < 4:
+            say(tr("messages.not_enough_to_summarize", lang()))
+        else:
+            summary_prompt = "Summarize the following conversation:\n\n" + "\n".join(history.format(m) for m in history.last_n(10))
+            model_choice = session.current_model
+            session.run_in_background(lambda: session.request_summary(summary_prompt, model_choice), say)
+
+    @commands.register("/translate", args="[lang]")
+    def translate_last(args):
+        # Default to English if no language is specified
+        target = args.lower().split()[0] if args else "en"
+
+        # Find last assistant message
+        last_response = session.history.last(ASSISTANT)
+        if not last_response:
+            say(tr("messages.no_response_to_translate", lang()))
+        else:
+            translate_prompt = f"Translate this into {target}:\n{session.history.text(last_response)}"
+            model_choice = session.current_model
+            session.run_in_background(lambda: session.request_translation(translate_prompt, target, model_choice), say)
+
+    if session.admin:
+        register_admin_commands(session)
+
+
+# failover and profiling are process-wide: on a server one user would switch them for everybody
+def register_admin_commands(session):
+    commands = session.commands
+    say = session.system_message
+
+    def lang():
+        return session.lang
+
+    # writes a stopped profile on the export worker and reports the files, save() -> (paths, summary lines)
+    def save_profile(save, saved_key):
+        def work():
+            try:
+                paths, summary = save()
+            except Exception as e:
+                return tr("messages.profile_failed", lang()).format(e)
+            if not paths:
+                return tr("messages.profile_empty", lang())
+            return tr(saved_key, lang()).format("\n".join(str(path) for path in paths)) + "\n" + "\n".join(summary)
+        session.run_in_background(work, say, executor=session.services.export_executor, kind="profile")
+
+    @commands.register("/profile", args="start [cprofile|sample] | stop")
+    def profile_command(args):
+        # cProfile follows the thread running this command (the UI or the event loop) and every background task,
+        # "sample" looks at the stacks of all threads instead
+        profiler = session.services.profiler
+        parts = args.lower().split()
+        action = parts[0] if parts else ""
+        mode = parts[1] if len(parts) > 1 else "cprofile"
+        if action == "start" and mode in ("cprofile", "sample"):
+            say(tr("messages.profile_started", lang()).format(mode) if profiler.start(mode)
+                else tr("messages.profile_running", lang()))
+        elif action == "stop":
+            save = profiler.stop()
+            if save is None:
+                say(tr("messages.profile_not_running", lang()))
+            else:
+                save_profile(save, "messages.profile_saved")
+        else:
+            say(tr("messages.profile_usage", lang()))
+
+    @commands.register("/memprofile", args="[start|stop]")
+    def memprofile_command(args):
+        # without an argument it toggles: the first call starts tracing allocations, the next writes the report
+        profiler = session.services.profiler
+        action = args.lower().strip() or ("stop" if profiler.tracing_memory else "start")
+        if action == "start":
+            say(tr("messages.memprofile_started", lang()) if profiler.start_memory()
+                else tr("messages.memprofile_running", lang()))
+        elif action == "stop":
+            save = profiler.stop_memory()
+            if save is None:
+                say(tr("messages.memprofile_not_running", lang()))
+            else:
+                save_profile(save, "messages.memprofile_saved")
+        else:
+            say(tr("messages.memprofile_usage", lang()))
+
+    @commands.register("/failover")
+    def toggle_failover(args):
+        scheduler = session.services.scheduler
+        scheduler.failover = not scheduler.failover
+        say(tr("messages.failover_on", lang()) if scheduler.failover else tr("messages.failover_off", lang()))
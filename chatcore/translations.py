@@ -0,0 +1,79 @@
+# translations.py - translated text for UI elements and commands when user types '/command'
+# Commands have their respective translation
+# Every language is one file in locales/ (en.json, zh.json, ...), a file is only read when its language is first used,
+# so adding languages doesn't make startup slower. English is the reference, every other file falls back to it.
+import json
+from collections.abc import Mapping
+from pathlib import Path
+
+LOCALES_DIR = Path(__file__).resolve().parent.parent / "locales"
+
+
+# read-only mapping of language code -> translation tree, works like the dictionary that used to be here
+class LanguagePacks(Mapping):
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self._codes = None
+        self._packs = {}
+
+    # codes come from the file names, English first
+    def codes(self) -> list[str]:
+        if self._codes is None:
+            codes = sorted(path.stem for path in self.directory.glob("*.json"))
+            self._codes = sorted(codes, key=lambda code: code != "en")
+        return self._codes
+
+    def __getitem__(self, lang: str) -> dict:
+        pack = self._packs.get(lang)
+        if pack is None:
+            if lang not in self.codes():
+                raise KeyError(lang)
+            with open(self.directory / f"{lang}.json", "r", encoding="utf-8") as f:
+                pack = self._packs[lang] = json.load(f)
+        return pack
+
+    def __iter__(self):
+        return iter(self.codes())
+
+    def __len__(self):
+        return len(self.codes())
+
+    def __contains__(self, lang) -> bool:
+        return lang in self.codes()
+
+
+LANGUAGES = LanguagePacks(LOCALES_DIR)
+
+# LANGUAGES is compiled into one flat table per language: dotted keys ("messages.chat_cleared") mapped to the text,
+# with the English text already filled in for every key the language doesn't have. tr() is then a single lookup.
+_catalogs = {}
+
+
+def _flatten(tree: dict, prefix: str, out: dict) -> dict:
+    for key, value in tree.items():
+        if isinstance(value, dict):
+            _flatten(value, f"{prefix}{key}.", out)
+        elif isinstance(value, str) and value:
+            out[f"{prefix}{key}"] = value
+    return out
+
+
+def compile_catalog(lang: str) -> dict:
+    catalog = _flatten(LANGUAGES.get("en", {}), "", {})
+    if lang != "en":
+        _flatten(LANGUAGES.get(lang, {}), "", catalog)
+    return catalog
+
+
+# flat table of a language, compiled the first time the language is used
+def get_catalog(lang: str) -> dict:
+    catalog = _catalogs.get(lang)
+    if catalog is None:
+        catalog = _catalogs[lang] = compile_catalog(lang if lang in LANGUAGES else "en")
+    return catalog
+
+
+# looks up the key in the language's table, which already falls back to English; unknown keys are returned as they are
+def tr(key: str, lang: str) -> str:
+    catalog = _catalogs.get(lang) or get_catalog(lang)
+    return catalog.get(key, key)
@@ -1 +1,342 @@
-print("Pozdrav svijete")
\ No newline at end of file
+# main.py - serves the chat to many users at once: every WebSocket connection gets its own ChatSession, all sessions
+# share one Services (provider clients, caches, search index and a bounded pool for model calls)
+# usage: python main.py [--host 127.0.0.1] [--port 8765] [--max-sessions 500] [--request-workers 32]
+#
+# Connect to ws://host:port/ws?lang=en&model=OpenAI and send JSON messages (a plain text frame is a prompt):
+#   {"type": "prompt", "text": "Hello"}  - a prompt or a "/command", "model" picks another model for it
+#   {"type": "file", "name": "a.pdf", "data": "<base64>", "action": "summarize" | "translate", "lang": "de"}
+#   {"type": "lang", "lang": "de"}
+# The server answers with JSON events: message {role, author, model, ts, text}, stream_begin {model, ts},
+# stream {text}, stream_end {author, model, text} (after a failover not the model the stream began with),
+# progress {text}, progress_end, status {text}, cleared, model {model}, error {text},
+# export {name, url}: an export (/export, /exportpdf, /exportjson) can be downloaded with GET url while the connection
+# is open. A connection's uploads and exports are kept in directories of their own and deleted when it closes.
+# GET /health returns the number of sessions and the limits, GET /metrics the request metrics (as /perf shows them)
+# in Prometheus text format. --metrics-file also writes them to a file (*.jsonl for JSON snapshots).
+#
+# Commands that change what every session shares (/failover, /profile, /memprofile, /perf reset) are only offered to
+# connections that pass ?token=<--admin-token>; without --admin-token (or CHATBOT_ADMIN_TOKEN) nobody gets them.
+#
+# Backpressure: connections over --max-sessions are turned away with 503, a session with --max-pending unfinished
+# requests gets an error instead of queueing more, messages over --max-message-mb close the connection, and a client
+# that reads slower than --send-queue events behind is disconnected. Streamed text is merged while it waits to be sent.
+from __future__ import annotations
+import argparse
+import asyncio
+import base64
+import binascii
+import hmac
+import json
+import os
+import secrets
+import shutil
+import threading
+from pathlib import Path
+from urllib.parse import parse_qs, quote, unquote
+
+from chatcore import ChatSession, Frontend, Services, config
+from chatcore.translations import LANGUAGES
+from ws_protocol import (CLOSE_GOING_AWAY, MAX_HEADER_BYTES, ConnectionClosed, ProtocolError, WebSocket,
+                         accept_websocket, read_request, write_response)
+
+DEFAULT_PORT = 8765
+MAX_SESSIONS = 500
+REQUEST_WORKERS = 32  # model calls running at the same time, across all sessions
+MAX_PENDING = 8       # unfinished requests per session
+MAX_MESSAGE_MB = 16   # largest client message, uploads included
+SEND_QUEUE = 1000     # events waiting for a slow client before it is disconnected
+
+
+# one WebSocket client, the front end of its session. Session callbacks run on the event loop
+class Connection(Frontend):
+    def __init__(self, server, ws: WebSocket, loop: asyncio.AbstractEventLoop):
+        self.server = server
+        self.ws = ws
+        self.loop = loop
+        self.session = None
+        self.closed = False
+        # names the connection's upload and export directories, and only its client learns it from the export urls
+        self.id = secrets.token_urlsafe(16)
+        self.events = asyncio.Queue(maxsize=server.send_queue)
+        # streamed text from the request worker, sent as one event per loop turn
+        self._stream = []
+        self._stream_lock = threading.Lock()
+        self._stream_scheduled = False
+
+    def post(self, callback, *args):
+        # safe to call from any thread, results for a connection that is gone are dropped
+        if self.closed:
+            return
+        try:
+            self.loop.call_soon_threadsafe(self._run_if_open, callback, args)
+        except RuntimeError:  # the loop is closed
+            pass
+
+    def _run_if_open(self, callback, args):
+        if not self.closed:
+            callback(*args)
+
+    def message(self, session, message):
+        self.send({"type": "message", "role": message.role, "author": message.author, "model": message.model,
+                   "ts": message.timestamp, "text": session.history.text(message)})
+
+    def stream_begin(self, session, model_choice, timestamp):
+        self.send({"type": "stream_begin", "model": model_choice, "ts": timestamp})
+
+    def stream_text(self, session, text):
+        # request worker: chunks that arrive before the loop sends them go out as one event
+        with self._stream_lock:
+            self._stream.append(text)
+            if self._stream_scheduled:
+                return
+            self._stream_scheduled = True
+        self.post(self._flush_stream)
+
+    def _flush_stream(self):
+        with self._stream_lock:
+            text = "".join(self._stream)
+            self._stream.clear()
+            self._stream_scheduled = False
+        if text:
+            self.send({"type": "stream", "text": text})
+
+    def stream_end(self, session, message):
+        self.send({"type": "stream_end", "author": message.author, "model": message.model,
+                   "text": session.history.text(message)})
+
+    def progress(self, session, text):
+        self.send({"type": "progress", "text": text})
+
+    def progress_end(self, session):
+        self.send({"type": "progress_end"})
+
+    def status(self, session, text):
+        self.send({"type": "status", "text": text})
+
+    def cleared(self, session):
+        self.send({"type": "cleared"})
+
+    def model_changed(self, session, model_choice):
+        self.send({"type": "model", "model": model_choice})
+
+    def exported(self, session, path):
+        self.send({"type": "export", "name": path.name, "url": f"/exports/{self.id}/{quote(path.name)}"})
+
+    def send(self, event: dict):
+        if self.closed:
+            return
+        try:
+            self.events.put_nowait(event)
+        except asyncio.QueueFull:
+            # the client doesn't keep up, holding more for it would let one reader use up the server's memory.
+            # It isn't reading, so a close frame wouldn't reach it either: the connection is dropped
+            self.closed = True
+            self.ws.writer.transport.abort()
+
+    async def write_events(self):
+        try:
+            while True:
+                event = await self.events.get()
+                if event is None:
+                    break
+                await self.ws.send_text(json.dumps(event, ensure_ascii=False))
+        except (ConnectionClosed, ConnectionError):
+            self.closed = True
+
+    # one client message
+    async def handle(self, data):
+        session = self.session
+        if isinstance(data, bytes):
+            raise ProtocolError("binary messages are not supported")
+        try:
+            request = json.loads(data) if data.startswith("{") else {"type": "prompt", "text": data}
+        except ValueError:
+            request = {"type": "prompt", "text": data}
+        kind = request.get("type")
+        if kind == "lang":
+            session.lang = request.get("lang") if request.get("lang") in LANGUAGES else "en"
+            return
+        if session.pending >= self.server.max_pending:
+            self.send({"type": "error", "text": f"too many unfinished requests ({session.pending}), wait for a reply"})
+            return
+        if kind == "prompt":
+            text = str(request.get("text", "")).strip()
+            if text.startswith("/"):
+                session.run_command(text)
+            elif text:
+                model_choice = request.get("model")
+                session.send(text, model_choice if model_choice in session.providers else None)
+        elif kind == "file":
+            action = request.get("action")
+            if action not in ("summarize", "translate"):
+                self.send({"type": "error", "text": "action must be summarize or translate"})
+                return
+            # translations go into the session's language unless the upload names another one
+            target_lang = None
+            if action == "translate":
+                target_lang = request.get("lang") or session.lang
+                if target_lang not in LANGUAGES:
+                    self.send({"type": "error", "text": f"unknown lang: {target_lang}"})
+                    return
+            try:
+                path = await self.loop.run_in_executor(None, self.server.save_upload, self, request.get("name", ""),
+                                                       request.get("data", ""))
+            except (ValueError, binascii.Error, OSError) as e:
+                self.send({"type": "error", "text": f"upload failed: {e}"})
+                return
+            session.process_file(path, action, target_lang)
+        else:
+            self.send({"type": "error", "text": f"unknown message type: {kind}"})
+
+
+class ChatServer:
+    def __init__(self, services: Services, max_sessions: int = MAX_SESSIONS, max_pending: int = MAX_PENDING,
+                 max_message_bytes: int = MAX_MESSAGE_MB * 1024 * 1024, send_queue: int = SEND_QUEUE,
+                 admin_token: str | None = None):
+        self.services = services
+        self.max_sessions = max_sessions
+        self.max_pending = max_pending
+        self.max_message_bytes = max_message_bytes
+        self.send_queue = send_queue
+        self.admin_token = admin_token
+        self.connections = set()
+        self.uploads_dir = services.data_dir / "uploads"
+        self.exports_dir = services.data_dir / "exports"
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            request = await read_request(reader)
+            if request is None:
+                return
+            if request.path == "/health":
+                await write_response(writer, 200, self.health())
+            elif request.path == "/metrics":
+                await write_response(writer, 200, self.services.metrics.prometheus_text())
+            elif request.path.startswith("/exports/"):
+                await self.download(writer, request.path)
+            elif request.path != "/ws":
+                await write_response(writer, 404, {"error": "not found"})
+            elif not request.is_websocket():
+                await write_response(writer, 426, {"error": "websocket upgrade required"})
+            elif len(self.connections) >= self.max_sessions:
+                await write_response(writer, 503, {"error": "too many sessions"})
+            else:
+                await self.serve_session(reader, writer, request)
+        except ProtocolError as e:
+            try:
+                await write_response(writer, 400, {"error": str(e)})
+            except ConnectionError:
+                pass
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve_session(self, reader, writer, request):
+        loop = asyncio.get_running_loop()
+        await accept_websocket(writer, request)
+        params = parse_qs(request.query)
+        lang = params.get("lang", ["en"])[0]
+        model_choice = params.get("model", [None])[0]
+        token = params.get("token", [""])[0]
+        admin = bool(self.admin_token) and hmac.compare_digest(token.encode("utf-8"), self.admin_token.encode("utf-8"))
+        ws = WebSocket(reader, writer, self.max_message_bytes)
+        connection = Connection(self, ws, loop)
+        connection.session = ChatSession(self.services, connection, lang=lang if lang in LANGUAGES else "en",
+                                         model_choice=model_choice if model_choice in self.services.providers else None,
+                                         export_dir=self.exports_dir / connection.id, private=True, admin=admin)
+        self.connections.add(connection)
+        sender = loop.create_task(connection.write_events())
+        try:
+            while not connection.closed:
+                await connection.handle(await ws.receive())
+        except ConnectionClosed:
+            pass
+        except ProtocolError as e:
+            await ws.close(e.code, str(e))
+        finally:
+            connection.closed = True
+            self.connections.discard(connection)
+            if connection.events.full():
+                sender.cancel()
+            else:
+                connection.events.put_nowait(None)
+            await asyncio.gather(sender, return_exceptions=True)
+            await ws.close(CLOSE_GOING_AWAY)
+            # queued prompts are dropped and file jobs cancelled, closing the journal waits for its writer
+            await loop.run_in_executor(None, self.close_session, connection)
+
+    def close_session(self, connection):
+        connection.session.close()
+        uploads = self.uploads_dir / connection.id
+        shutil.rmtree(uploads, ignore_errors=True)
+        shutil.rmtree(self.exports_dir / connection.id, ignore_errors=True)
+        # the extracted text stays cached by content, only the paths it was read from are forgotten
+        self.services.extraction_cache.forget(uploads)
+
+    # runs on an executor thread, returns the path the document job reads
+    def save_upload(self, connection, name: str, data: str) -> Path:
+        name = Path(str(name)).name
+        if not name:
+            raise ValueError("file name is missing")
+        directory = self.uploads_dir / connection.id
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / name
+        path.write_bytes(base64.b64decode(data, validate=True))
+        return path
+
+    # GET /exports/<connection id>/<name>: a file the connection exported, while it is open
+    async def download(self, writer, path: str):
+        _, _, connection_id, name = (path.split("/", 3) + ["", ""])[:4]
+        name = Path(unquote(name)).name
+        if not name or not any(connection.id == connection_id for connection in self.connections):
+            await write_response(writer, 404, {"error": "not found"})
+            return
+        file = self.exports_dir / connection_id / name
+        try:
+            data = await asyncio.get_running_loop().run_in_executor(None, file.read_bytes)
+        except OSError:
+            await write_response(writer, 404, {"error": "not found"})
+            return
+        await write_response(writer, 200, data, {"Content-Disposition": f"attachment; filename*=UTF-8''{quote(name)}"})
+
+    def health(self) -> dict:
+        return {"sessions": len(self.connections), "max_sessions": self.max_sessions,
+                "pending": sum(c.session.pending for c in self.connections if c.session is not None),
+                "max_pending": self.max_pending}
+
+
+async def serve(host: str, port: int, server: ChatServer):
+    listener = await asyncio.start_server(server.handle_client, host, port, limit=MAX_HEADER_BYTES)
+    print(f"Serving on ws://{host}:{port}/ws", flush=True)
+    async with listener:
+        await listener.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the chat over WebSocket, one session per connection.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--max-sessions", type=int, default=MAX_SESSIONS)
+    parser.add_argument("--request-workers", type=int, default=REQUEST_WORKERS)
+    parser.add_argument("--max-pending", type=int, default=MAX_PENDING)
+    parser.add_argument("--max-message-mb", type=int, default=MAX_MESSAGE_MB)
+    parser.add_argument("--send-queue", type=int, default=SEND_QUEUE)
+    parser.add_argument("--metrics-file", default=config.METRICS_FILE,
+                        help="also write the metrics here (Prometheus text, or JSON lines for *.jsonl)")
+    parser.add_argument("--admin-token", default=os.getenv("CHATBOT_ADMIN_TOKEN"),
+                        help="connections with ?token=<this> get the admin commands")
+    args = parser.parse_args()
+    services = Services(workers=4, request_workers=args.request_workers, metrics_file=args.metrics_file)
+    server = ChatServer(services, args.max_sessions, args.max_pending, args.max_message_mb * 1024 * 1024, args.send_queue,
+                        args.admin_token)
+    try:
+        asyncio.run(serve(args.host, args.port, server))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        services.close()
+
+
+if __name__ == "__main__":
+    main()
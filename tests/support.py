@@ -0,0 +1,139 @@
+# support.py - helpers shared by the tests: WebSocket frames as a client sends them, a small WebSocket client for the
+# server in main.py and a model provider that answers locally
+from __future__ import annotations
+import asyncio
+import base64
+import json
+import os
+import struct
+
+from chatcore.providers import Provider
+from ws_protocol import OP_CLOSE, OP_TEXT
+
+
+# one frame as a client sends it: masked, with the shortest length prefix unless length_bytes forces one
+def client_frame(opcode: int, payload: bytes, fin: bool = True, mask: bytes | None = None, rsv: int = 0) -> bytes:
+    mask = os.urandom(4) if mask is None else mask
+    length = len(payload)
+    first = (0x80 if fin else 0) | rsv | opcode
+    if length < 126:
+        header = struct.pack("!BB", first, 0x80 | length)
+    elif length < 1 << 16:
+        header = struct.pack("!BBH", first, 0x80 | 126, length)
+    else:
+        header = struct.pack("!BBQ", first, 0x80 | 127, length)
+    masked = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+    return header + mask + masked
+
+
+# (fin, opcode, payload) of one unmasked server frame
+async def read_server_frame(reader: asyncio.StreamReader):
+    first, second = await reader.readexactly(2)
+    length = second & 0x7F
+    if length == 126:
+        length = struct.unpack("!H", await reader.readexactly(2))[0]
+    elif length == 127:
+        length = struct.unpack("!Q", await reader.readexactly(8))[0]
+    return bool(first & 0x80), first & 0x0F, await reader.readexactly(length)
+
+
+class EchoProvider(Provider):
+    name = "Echo"
+
+    def __init__(self):
+        super().__init__("echo")
+
+    def complete(self, messages: list[dict]) -> str:
+        return "echo: " + messages[-1]["content"]
+
+    def stream(self, messages: list[dict]):
+        yield "echo: "
+        yield messages[-1]["content"]
+
+
+
+class RateLimitError(Exception):
+    pass
+
+
+# a provider whose quota is used up, it asks for a wait longer than the scheduler retries for
+class ExhaustedProvider(Provider):
+    name = "Busy"
+    rate_limit_errors = (RateLimitError,)
+
+    def __init__(self):
+        super().__init__("busy")
+
+    def complete(self, messages: list[dict]) -> str:
+        raise RateLimitError("quota exceeded, retry after 600 s")
+
+    def stream(self, messages: list[dict]):
+        raise RateLimitError("quota exceeded, retry after 600 s")
+        yield
+
+
+
+# answers complete() with the given replies in turn, an exception among them is raised instead
+class ScriptedProvider(Provider):
+    name = "Scripted"
+    rate_limit_errors = (RateLimitError,)
+
+    def __init__(self, *replies):
+        super().__init__("scripted")
+        self.replies = list(replies)
+        self.calls = 0
+
+    def complete(self, messages: list[dict]) -> str:
+        self.calls += 1
+        reply = self.replies.pop(0)
+        if isinstance(reply, Exception):
+            raise reply
+        return reply
+
+
+class WsClient:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+
+    @classmethod
+    async def connect(cls, port: int, query: str = "") -> "WsClient":
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        key = base64.b64encode(os.urandom(16)).decode("ascii")
+        writer.write((f"GET /ws{'?' + query if query else ''} HTTP/1.1\r\nHost: 127.0.0.1\r\nUpgrade: websocket\r\n"
+                      f"Connection: Upgrade\r\nSec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n").encode())
+        await writer.drain()
+        head = await reader.readuntil(b"\r\n\r\n")
+        if not head.startswith(b"HTTP/1.1 101"):
+            raise ConnectionError(head.decode("latin-1"))
+        return cls(reader, writer)
+
+    async def send(self, message: dict):
+        self.writer.write(client_frame(OP_TEXT, json.dumps(message).encode("utf-8")))
+        await self.writer.drain()
+
+    async def event(self) -> dict:
+        _, opcode, payload = await read_server_frame(self.reader)
+        if opcode == OP_CLOSE:
+            raise ConnectionError("closed by the server")
+        return json.loads(payload)
+
+    # events up to and including the first one of the type, within timeout seconds
+    async def wait_for(self, kind: str, timeout: float = 10.0) -> dict:
+        async def wait():
+            while True:
+                event = await self.event()
+                if event["type"] == kind:
+                    return event
+        return await asyncio.wait_for(wait(), timeout)
+
+    # text of the next system message
+    async def system_message(self, timeout: float = 10.0) -> str:
+        while True:
+            event = await self.wait_for("message", timeout)
+            if event["role"] == "system":
+                return event["text"]
+
+    async def close(self):
+        self.writer.write(client_frame(OP_CLOSE, struct.pack("!H", 1000)))
+        self.writer.close()
@@ -0,0 +1,56 @@
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from chatcore.cache import ExtractionCache
+
+
+def read_blocks(f):
+    return [line.rstrip("\n") for line in f]
+
+
+class ExtractionCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = ExtractionCache(Path(self.directory.name) / "extracted")
+        self.document = Path(self.directory.name) / "a.txt"
+        self.document.write_text("one\ntwo\nthree\n", encoding="utf-8")
+
+    def tearDown(self):
+        self.cache.close()
+        self.directory.cleanup()
+
+    def test_concurrent_extractions_of_one_file(self):
+        both_started = threading.Barrier(2)
+
+        def extract(path):
+            for n, line in enumerate(Path(path).read_text(encoding="utf-8").splitlines()):
+                yield line
+                if n == 0:
+                    both_started.wait(5)  # both extractions are half written at the same time
+
+        results = [None, None]
+
+        def upload(n):
+            results[n] = list(self.cache.blocks(self.document, extract, read_blocks))
+
+        threads = [threading.Thread(target=upload, args=(n,)) for n in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(10)
+        self.assertEqual(results, [["one", "two", "three"]] * 2)
+        self.assertEqual(list(self.cache.blocks(self.document, None, read_blocks)), ["one", "two", "three"])
+        self.assertEqual(self.cache.hits, 1)
+        self.assertEqual(list(self.cache.directory.glob("*.part")), [])
+
+    def test_cancelled_extraction_leaves_nothing(self):
+        blocks = self.cache.blocks(self.document, lambda path: iter(["one", "two"]), read_blocks)
+        next(blocks)
+        blocks.close()
+        self.assertEqual(list(self.cache.directory.glob("*.gz*")), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import tempfile
+import unittest
+from unittest import mock
+
+from chatcore import ChatSession, Services
+from chatcore.commands import CommandRegistry, PrefixTrie
+from chatcore.translations import tr
+from support import EchoProvider
+
+
+class TrieTest(unittest.TestCase):
+    def setUp(self):
+        self.trie = PrefixTrie()
+        for word in ("/export", "/exportpdf", "/exportjson", "/emoji", "/help", "/history"):
+            self.trie.add(word)
+
+    def test_prefix_completions_are_sorted(self):
+        self.assertEqual(self.trie.with_prefix("/ex"), ["/export", "/exportjson", "/exportpdf"])
+        self.assertEqual(self.trie.with_prefix("/export"), ["/export", "/exportjson", "/exportpdf"])
+        self.assertEqual(self.trie.with_prefix("/h"), ["/help", "/history"])
+        self.assertEqual(self.trie.with_prefix("/x"), [])
+
+    def test_fuzzy_finds_typos_closest_first(self):
+        self.assertEqual(self.trie.fuzzy("/hepl"), ["/help"])
+        self.assertEqual(self.trie.fuzzy("/exprot")[0], "/export")
+        self.assertEqual(self.trie.fuzzy("/histroy", max_distance=1), [])
+        self.assertEqual(self.trie.fuzzy("/elp", max_distance=1), ["/help"])
+        self.assertEqual(self.trie.fuzzy("/zzzzzz"), [])
+
+
+class RegistryTest(unittest.TestCase):
+    def setUp(self):
+        self.registry = CommandRegistry()
+        self.calls = []
+        for name in ("/help", "/history", "/context"):
+            self.registry.register(name, args="[tokens]" if name == "/context" else "")(
+                lambda args, name=name: self.calls.append((name, args)))
+
+    def test_dispatch_passes_the_stripped_arguments(self):
+        self.assertTrue(self.registry.dispatch("  /CONTEXT   4000  "))
+        self.assertTrue(self.registry.dispatch("/help"))
+        self.assertFalse(self.registry.dispatch("/hepl"))
+        self.assertEqual(self.calls, [("/context", "4000"), ("/help", "")])
+
+    def test_suggestions_prefer_prefix_matches(self):
+        self.assertEqual(self.registry.suggest("/H"), ["/help", "/history"])
+        self.assertEqual(self.registry.suggest("/hepl"), ["/help"])
+        self.assertEqual(self.registry.suggest("/qqqqq"), [])
+
+    def test_help_lines_show_the_arguments(self):
+        self.assertEqual(self.registry.help_lines("en")[2], f"/context [tokens] — {tr('commands./context', 'en')}")
+
+
+class SessionCommandTest(unittest.TestCase):
+    def setUp(self):
+        self.data_dir = tempfile.TemporaryDirectory()
+        self.services = Services({"Echo": EchoProvider()}, data_dir=self.data_dir.name)
+        self.session = ChatSession(self.services)
+
+    def tearDown(self):
+        self.session.close()
+        self.services.close()
+        self.data_dir.cleanup()
+
+    def last_text(self) -> str:
+        return self.session.history.text(self.session.history.last_n(1)[0])
+
+    def test_misspelled_command_gets_suggestions(self):
+        self.session.run_command("/hepl")
+        self.assertEqual(self.last_text(), tr("messages.did_you_mean", "en").format("/help"))
+        self.session.run_command("/zzzzzz now")
+        self.assertEqual(self.last_text(), tr("messages.unknown_command", "en"))
+
+    def test_export_arguments(self):
+        with mock.patch.object(self.session, "start_export") as start_export:
+            self.session.run_command("/export MD.gz Full")
+            self.session.run_command("/export html")
+            self.assertEqual(start_export.call_args_list, [mock.call("md.gz", full=True), mock.call("html", full=False)])
+            self.session.run_command("/export")
+            self.assertEqual(start_export.call_count, 2)
+        self.assertTrue(self.last_text().startswith(tr("messages.export_usage", "en").split("{")[0]))
+
+    def test_context_budget_argument(self):
+        self.session.run_command("/context 4000").result()
+        self.assertEqual(self.session.context.budget, 4000)
+        self.assertEqual(self.last_text(), tr("messages.context_budget_set", "en").format(4000))
+        self.session.run_command("/context lots")
+        self.assertEqual(self.session.context.budget, 4000)
+        self.assertEqual(self.last_text(), tr("messages.context_info", "en").format(
+            self.session.context.token_count(), 4000, self.session.context.evicted_count))
+
+
+if __name__ == "__main__":
+    unittest.main()
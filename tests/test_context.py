@@ -0,0 +1,39 @@
+import sys
+import types
+import unittest
+from unittest import mock
+
+from chatcore import context
+
+
+class TokenCountTest(unittest.TestCase):
+    def setUp(self):
+        context._encodings.clear()
+        self.addCleanup(context._encodings.clear)
+
+    def test_offline_tiktoken_falls_back_to_the_estimate(self):
+        calls = []
+
+        def download(name):
+            calls.append(name)
+            raise ConnectionError("no network")
+
+        offline = types.SimpleNamespace(encoding_for_model=lambda model: download(model), get_encoding=download)
+        with mock.patch.dict(sys.modules, {"tiktoken": offline}):
+            self.assertEqual(context.count_tokens("x" * 40, "gpt-4"), 11)
+            self.assertEqual(context.count_tokens("x" * 8, "gpt-4"), 3)
+        # the failed download is not tried again for every message
+        self.assertEqual(calls, ["gpt-4"])
+
+    def test_unknown_model_uses_the_default_encoding(self):
+        encoding = mock.Mock()
+        encoding.encode.return_value = [1, 2, 3]
+        tokenizer = types.SimpleNamespace(encoding_for_model=mock.Mock(side_effect=KeyError("nope")),
+                                          get_encoding=mock.Mock(return_value=encoding))
+        with mock.patch.dict(sys.modules, {"tiktoken": tokenizer}):
+            self.assertEqual(context.count_tokens("some text", "model-x"), 3)
+        tokenizer.get_encoding.assert_called_once_with("o200k_base")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+import random
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from chatcore import ChatSession, Services, config
+from chatcore.context import count_tokens
+from chatcore.documents import (COMBINE_PROMPT, SUMMARY_PROMPT, JobCancelled, chunk_text, summarize_document,
+                                translate_document)
+from chatcore.message_store import ASSISTANT
+from chatcore.translations import tr
+from support import EchoProvider
+
+PARAGRAPHS = [f"Paragraph {i} " + "word " * random.Random(i).randint(5, 60) for i in range(40)]
+
+
+# the part of a prompt after its instruction, in capitals so the "translation" is visible
+def shout(prompt: str) -> str:
+    return prompt.split("\n\n", 1)[1].upper()
+
+
+class ChunkTest(unittest.TestCase):
+    def test_chunks_stay_under_the_limit_and_keep_paragraphs_whole(self):
+        blocks = ("\n\n".join(PARAGRAPHS[i:i + 5]) for i in range(0, len(PARAGRAPHS), 5))
+        chunks = list(chunk_text(blocks, max_tokens=100))
+        self.assertGreater(len(chunks), 5)
+        self.assertTrue(all(count_tokens(chunk) <= 100 for chunk in chunks))
+        self.assertEqual([p for chunk in chunks for p in chunk.split("\n")], PARAGRAPHS)
+
+    def test_long_paragraph_is_cut_at_spaces(self):
+        paragraph = " ".join(f"w{i}" for i in range(2000))
+        pieces = list(chunk_text(["short", paragraph, "tail"], max_tokens=50))
+        self.assertEqual((pieces[0], pieces[-1]), ("short", "tail"))
+        self.assertTrue(all(count_tokens(piece) <= 50 for piece in pieces))
+        self.assertEqual("".join(pieces[1:-1]).split(), paragraph.split())
+        self.assertTrue(all(piece.startswith(" ") for piece in pieces[2:-1]))
+
+    def test_empty_document_has_no_chunks(self):
+        self.assertEqual(list(chunk_text(["", "\n \n"])), [])
+
+
+class DocumentJobTest(unittest.TestCase):
+    def test_translation_keeps_the_order_of_the_chunks(self):
+        # later chunks answer sooner, the results still come back in document order
+        def complete(prompt):
+            time.sleep(0.02 / (1 + PARAGRAPHS.index(prompt.split("\n\n", 1)[1])))
+            return shout(prompt)
+        done = []
+        translated = list(translate_document(iter(PARAGRAPHS), complete, "de", max_parallel=4, on_progress=done.append))
+        self.assertEqual(translated, [p.upper() for p in PARAGRAPHS])
+        self.assertEqual(done, list(range(1, len(PARAGRAPHS) + 1)))
+
+    def test_summary_combines_the_partial_summaries(self):
+        prompts = []
+
+        def complete(prompt):
+            prompts.append(prompt)
+            return f"<{len(prompts)}>"
+        summary = summarize_document(PARAGRAPHS[:3], complete, max_parallel=1)
+        self.assertEqual([p.startswith(SUMMARY_PROMPT) for p in prompts], [True, True, True, False])
+        self.assertEqual(prompts[3], COMBINE_PROMPT + "<1>\n<2>\n<3>")
+        self.assertEqual(summary, "<4>")
+        self.assertEqual(summarize_document([], complete), "")
+
+    def test_cancel_stops_between_chunks(self):
+        cancel = threading.Event()
+        read = []
+
+        def chunks():
+            for paragraph in PARAGRAPHS:
+                read.append(paragraph)
+                yield paragraph
+
+        def progress(done):
+            if done == 2:
+                cancel.set()
+        with self.assertRaises(JobCancelled):
+            list(translate_document(chunks(), shout, "de", max_parallel=1, cancel=cancel, on_progress=progress))
+        # one result and the read-ahead window of the next ones, not the whole document
+        self.assertLess(len(read), 6)
+
+
+# a provider that holds every request until release is set
+class GatedProvider(EchoProvider):
+    def __init__(self):
+        super().__init__()
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.calls = 0
+
+    def complete(self, messages: list[dict]) -> str:
+        self.calls += 1
+        self.started.set()
+        self.release.wait(10)
+        return super().complete(messages)
+
+
+class CancelCommandTest(unittest.TestCase):
+    def setUp(self):
+        self.data_dir = tempfile.TemporaryDirectory()
+        self.provider = GatedProvider()
+        self.services = Services({"Echo": self.provider}, data_dir=self.data_dir.name)
+        self.session = ChatSession(self.services)
+
+    def tearDown(self):
+        self.provider.release.set()
+        self.session.close()
+        self.services.close()
+        self.data_dir.cleanup()
+
+    def test_cancel_command_stops_a_running_translation(self):
+        path = Path(self.data_dir.name) / "long.txt"
+        path.write_text("\n".join(PARAGRAPHS), encoding="utf-8")
+        with mock.patch.object(config, "DOCUMENT_CHUNK_TOKENS", 30), mock.patch.object(config, "DOCUMENT_MAX_PARALLEL", 1):
+            future = self.session.process_file(path, "translate", "de")
+            self.assertTrue(self.provider.started.wait(10))
+            self.session.run_command("/cancel")
+            self.assertEqual(self.session.history.text(self.session.history.last_n(1)[0]),
+                             tr("messages.file_cancelling", "en"))
+            self.provider.release.set()
+            future.result(10)
+        reply = self.session.history.last(ASSISTANT)
+        self.assertEqual(self.session.history.text(reply), tr("messages.file_cancelled", "en").format("long.txt"))
+        self.assertLess(self.provider.calls, 4)
+        self.session.run_command("/cancel")
+        self.assertEqual(self.session.history.text(self.session.history.last_n(1)[0]),
+                         tr("messages.nothing_to_cancel", "en"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+import gzip
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from chatcore import ChatSession, Services
+from chatcore.exporters import ExportError, export_history
+from chatcore.translations import tr
+from support import EchoProvider
+
+
+def read_export(path: Path) -> str:
+    # gzip reads the members appended exports added as one stream
+    opener = gzip.open if path.suffix == ".gz" else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        return f.read()
+
+
+class ExportTest(unittest.TestCase):
+    def setUp(self):
+        self.data_dir = tempfile.TemporaryDirectory()
+        self.services = Services({"Echo": EchoProvider()}, data_dir=self.data_dir.name)
+        self.session = ChatSession(self.services, export_dir=Path(self.data_dir.name) / "exports")
+        self.session.streaming_enabled = False
+
+    def tearDown(self):
+        self.session.close()
+        self.services.close()
+        self.data_dir.cleanup()
+
+    def export(self, kind: str, full: bool = False) -> Path:
+        self.session.start_export(kind, full).result()
+        return Path(self.services.get_export_mark(self.session.session_id, kind)["path"])
+
+    def last_text(self) -> str:
+        return self.session.history.text(self.session.history.last_n(1)[0])
+
+    def test_incremental_export_matches_a_full_one(self):
+        for kind in ("md", "jsonl.gz", "html"):
+            with self.subTest(kind=kind):
+                self.session.send(f"one {kind}").result()
+                path = self.export(kind)
+                self.session.send(f"two {kind}").result()
+                history = self.session.history.snapshot()
+                self.assertEqual(self.export(kind), path)
+                full = Path(self.data_dir.name) / f"full.{kind}"
+                name, _, compression = kind.partition(".")
+                export_history(history, full, name, compression or None)
+                self.assertEqual(read_export(path), read_export(full))
+
+    def test_appended_jsonl_keeps_every_message_once(self):
+        self.session.send("one").result()
+        path = self.export("jsonl.gz")
+        self.session.send("two").result()
+        self.export("jsonl.gz")
+        texts = [json.loads(line)["text"] for line in read_export(path).splitlines()]
+        self.assertEqual(texts[:2] + texts[3:], ["one", "echo: one", "two", "echo: two"])
+
+    def test_export_queued_behind_one_of_the_same_messages_writes_nothing(self):
+        self.session.send("one").result()
+        future = self.session.start_export("md")
+        self.assertIsNone(self.session.start_export("md"))
+        future.result()
+        path = Path(self.services.get_export_mark(self.session.session_id, "md")["path"])
+        texts = [self.session.history.text(message) for message in self.session.history.last_n(2)]
+        self.assertEqual(texts, [tr("messages.export_up_to_date", "en").format(path.name),
+                                 tr("messages.export_done", "en").format(2, path.name)])
+
+    def test_full_starts_a_new_file_and_moves_the_mark(self):
+        self.session.send("one").result()
+        first = self.export("md")
+        self.session.send("two").result()
+        second = self.export("md", full=True)
+        self.assertNotEqual(second, first)
+        self.assertEqual(read_export(first).count("**"), 4)  # two headers, nothing appended
+        self.session.send("three").result()
+        self.assertEqual(self.export("md"), second)
+        self.assertIn("echo: three", read_export(second))
+        self.assertNotIn("echo: three", read_export(first))
+
+    def test_json_is_always_a_full_export(self):
+        self.session.send("one").result()
+        first = self.export("json")
+        self.session.send("two").result()
+        second = self.export("json")
+        self.assertNotEqual(second, first)
+        self.assertEqual(len(json.loads(read_export(second))), 5)  # both turns and the first export's message
+
+    def test_json_and_pdf_can_not_be_continued(self):
+        self.session.send("one").result()
+        for name in ("json", "pdf"):
+            with self.subTest(name=name), self.assertRaises(ExportError):
+                export_history(self.session.history, Path(self.data_dir.name) / f"a.{name}", name, start=1)
+
+    def test_zstd_without_zstandard_is_a_clean_error(self):
+        self.session.send("one").result()
+        with mock.patch.dict(sys.modules, {"zstandard": None}):
+            self.session.start_export("md.zst").result()
+        self.assertEqual(self.last_text(), tr("messages.export_failed", "en").format(
+            "zstd compression needs the zstandard package"))
+        self.assertIsNone(self.services.get_export_mark(self.session.session_id, "md.zst"))
+        self.assertEqual(list((Path(self.data_dir.name) / "exports").glob("*.zst")), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from chatcore.journal import SessionJournal, read_journal
+
+
+class JournalTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = Path(self.directory.name) / "sessions" / "session_1.jsonl"
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_close_without_waiting_still_writes_everything(self):
+        journal = SessionJournal(self.path, sync_interval=0.01)
+        for n in range(100):
+            journal.append({"n": n})
+        journal.close(wait=False)
+        journal.close()  # a second close only waits
+        self.assertFalse(journal.writing)
+        self.assertEqual([record["n"] for record in read_journal(self.path)], list(range(100)))
+
+    def test_torn_line_is_cut_on_open(self):
+        self.path.parent.mkdir(parents=True)
+        self.path.write_text('{"n": 0}\n{"n": 1', encoding="utf-8")
+        journal = SessionJournal(self.path)
+        journal.append({"n": 2})
+        journal.close()
+        self.assertEqual(self.path.read_text(encoding="utf-8"), '{"n": 0}\n{"n": 2}\n')
+
+    def test_write_errors_are_reported_once_and_writing_goes_on(self):
+        # the sessions directory can't be created while a file has its name
+        self.path.parent.write_text("in the way", encoding="utf-8")
+        errors = []
+        journal = SessionJournal(self.path, sync_interval=0.01, on_error=errors.append)
+        for n in range(3):
+            journal.append({"n": n})
+        for _ in range(100):
+            if errors:
+                break
+            time.sleep(0.01)
+        time.sleep(0.05)
+        self.assertEqual(len(errors), 1)
+        self.assertIsInstance(errors[0], OSError)
+        self.assertTrue(journal.writing)
+        self.path.parent.unlink()
+        journal.append({"n": 3})
+        journal.close()
+        self.assertFalse(journal.failed)
+        self.assertEqual([record["n"] for record in read_journal(self.path)], [3])
+
+
+if __name__ == "__main__":
+    unittest.main()
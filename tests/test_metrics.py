@@ -0,0 +1,91 @@
+import random
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from chatcore import ChatSession, Services
+from chatcore.context import message_tokens
+from chatcore.metrics import Histogram, Metrics
+from support import EchoProvider
+
+
+class HistogramTest(unittest.TestCase):
+    def test_quantiles_are_within_five_percent(self):
+        histogram = Histogram()
+        values = [i / 1000 for i in range(1, 10001)]
+        random.Random(7).shuffle(values)
+        for value in values:
+            histogram.add(value)
+        for q, expected in ((0.5, 5.0), (0.95, 9.5), (0.99, 9.9)):
+            self.assertAlmostEqual(histogram.quantile(q), expected, delta=expected * 0.05)
+        summary = histogram.summary()
+        self.assertEqual((summary["count"], summary["min"], summary["max"]), (10000, 0.001, 10.0))
+        self.assertAlmostEqual(summary["sum"], 50005.0)
+
+    def test_estimates_stay_between_the_smallest_and_largest_sample(self):
+        histogram = Histogram()
+        self.assertEqual(histogram.quantile(0.5), 0.0)
+        histogram.add(0.25)
+        self.assertEqual([histogram.quantile(q) for q in (0.5, 0.99)], [0.25, 0.25])
+        histogram.add(0)
+        self.assertEqual(histogram.quantile(0.01), 0)
+
+
+class MetricsTest(unittest.TestCase):
+    def setUp(self):
+        self.metrics = Metrics()
+
+    def test_prometheus_text(self):
+        for value in (1, 1, 1):
+            self.metrics.observe("request_seconds", value, provider="Echo", mode="complete")
+        self.metrics.count("errors_total", op="request", provider="Echo")
+        self.metrics.count("errors_total", op="request", provider="Echo")
+        self.metrics.gauge("cache_entries", lambda: 12)
+        self.metrics.gauge("closed_entries", lambda: 1 / 0)  # a gauge that can't be read is left out
+        labels = 'mode="complete",provider="Echo"'
+        self.assertEqual(self.metrics.prometheus_text().splitlines(), [
+            "# TYPE chatbot_request_seconds summary",
+            f'chatbot_request_seconds{{{labels},quantile="0.5"}} 1',
+            f'chatbot_request_seconds{{{labels},quantile="0.95"}} 1',
+            f'chatbot_request_seconds{{{labels},quantile="0.99"}} 1',
+            f"chatbot_request_seconds_sum{{{labels}}} 3",
+            f"chatbot_request_seconds_count{{{labels}}} 3",
+            "# TYPE chatbot_cache_entries gauge",
+            "chatbot_cache_entries 12",
+            "# TYPE chatbot_errors_total counter",
+            'chatbot_errors_total{op="request",provider="Echo"} 2',
+        ])
+
+    def test_write_replaces_text_and_appends_jsonl(self):
+        self.metrics.count("requests_total")
+        with tempfile.TemporaryDirectory() as directory:
+            prom, jsonl = Path(directory) / "metrics.prom", Path(directory) / "metrics.jsonl"
+            for _ in range(2):
+                self.metrics.write(prom)
+                self.metrics.write(jsonl)
+            self.assertEqual(prom.read_text(encoding="utf-8"), self.metrics.prometheus_text())
+            self.assertEqual(len(jsonl.read_text(encoding="utf-8").splitlines()), 2)
+            self.assertEqual(sorted(p.name for p in Path(directory).iterdir()), ["metrics.jsonl", "metrics.prom"])
+
+
+class RequestMetricsTest(unittest.TestCase):
+    def test_request_tokens_come_from_the_context(self):
+        with tempfile.TemporaryDirectory() as directory:
+            services = Services({"Echo": EchoProvider()}, data_dir=directory)
+            session = ChatSession(services)
+            session.streaming_enabled = False
+            try:
+                with mock.patch.object(EchoProvider, "count_tokens", side_effect=AssertionError("counted again")):
+                    session.send("how many tokens is this").result()
+                sent = session.context.messages()[:-1]  # without the reply
+                tokens_in = services.metrics.snapshot()["histograms"][
+                    ("chatbot_tokens_in", (("provider", "Echo"),))]["sum"]
+                self.assertEqual(tokens_in, sum(message_tokens(m, session.context.model) for m in sent))
+            finally:
+                session.close()
+                services.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
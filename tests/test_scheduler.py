@@ -0,0 +1,94 @@
+import unittest
+from unittest import mock
+
+from chatcore import scheduler
+from chatcore.scheduler import MAX_DELAY, RequestScheduler, TokenBucket, backoff_delay
+from support import RateLimitError, ScriptedProvider
+
+
+# stands in for the time module, sleep moves the clock on instead of waiting
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class SchedulerTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch.object(scheduler, "time", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.retries = []
+
+    def make_scheduler(self, providers: dict, **kwargs) -> RequestScheduler:
+        return RequestScheduler(providers, {}, on_retry=lambda *retry: self.retries.append(retry), **kwargs)
+
+    def test_bucket_allows_a_burst_then_waits_for_the_refill(self):
+        bucket = TokenBucket(60, capacity=2)
+        self.assertEqual([bucket.acquire() for _ in range(3)], [0.0, 0.0, 1.0])
+        self.assertEqual(self.clock.sleeps, [1.0])
+        self.clock.now += 10  # refills up to the capacity only
+        self.assertEqual([bucket.acquire() for _ in range(3)], [0.0, 0.0, 1.0])
+
+    def test_paused_bucket_waits_out_the_pause(self):
+        bucket = TokenBucket(60)
+        bucket.pause(5)
+        self.assertEqual(bucket.acquire(), 5.0)
+
+    def test_backoff_is_jittered_below_the_doubling_cap(self):
+        with mock.patch.object(scheduler.random, "uniform", lambda low, high: high):
+            self.assertEqual([backoff_delay(attempt) for attempt in range(7)], [1, 2, 4, 8, 16, MAX_DELAY, MAX_DELAY])
+        delays = {backoff_delay(3) for _ in range(50)}
+        self.assertTrue(all(0 <= delay <= 8 for delay in delays))
+        self.assertGreater(len(delays), 1)
+
+    def test_retry_after_is_honoured(self):
+        provider = ScriptedProvider(RateLimitError("slow down, retry after 5 s"), "answer")
+        self.assertEqual(self.make_scheduler({"A": provider}).run("A", lambda p: p.complete([])), ("A", "answer"))
+        self.assertEqual(self.retries, [("A", 1, 5.0)])
+        self.assertEqual(self.clock.sleeps, [5.0])
+
+    def test_retries_back_off_without_retry_after(self):
+        provider = ScriptedProvider(RateLimitError("busy"), RateLimitError("busy"), "answer")
+        with mock.patch.object(scheduler.random, "uniform", lambda low, high: high):
+            self.assertEqual(self.make_scheduler({"A": provider}).run("A", lambda p: p.complete([])), ("A", "answer"))
+        self.assertEqual(self.retries, [("A", 1, 1.0), ("A", 2, 2.0)])
+
+    def test_gives_up_after_max_retries(self):
+        provider = ScriptedProvider(*[RateLimitError("retry after 1 s")] * 5)
+        with self.assertRaises(RateLimitError):
+            self.make_scheduler({"A": provider}, max_retries=2).run("A", lambda p: p.complete([]))
+        self.assertEqual(provider.calls, 3)
+
+    def test_other_errors_are_not_retried(self):
+        provider = ScriptedProvider(ValueError("bad request"), "answer")
+        with self.assertRaises(ValueError):
+            self.make_scheduler({"A": provider}).run("A", lambda p: p.complete([]))
+        self.assertEqual(provider.calls, 1)
+
+    def test_long_retry_after_fails_over_right_away(self):
+        busy = ScriptedProvider(RateLimitError("retry after 600 s"))
+        spare = ScriptedProvider("spare answer")
+        requests = self.make_scheduler({"A": busy, "B": spare}, failover=True)
+        self.assertEqual(requests.run("A", lambda p: p.complete([])), ("B", "spare answer"))
+        self.assertEqual((busy.calls, self.retries, self.clock.sleeps), (1, [], []))
+
+    def test_no_failover_once_streaming_started(self):
+        busy = ScriptedProvider(RateLimitError("retry after 600 s"))
+        spare = ScriptedProvider("spare answer")
+        requests = self.make_scheduler({"A": busy, "B": spare}, failover=True)
+        with self.assertRaises(RateLimitError):
+            requests.run("A", lambda p: p.complete([]), can_retry=lambda: False)
+        self.assertEqual((busy.calls, spare.calls), (1, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,142 @@
+import asyncio
+import base64
+import tempfile
+import unittest
+
+from chatcore import Services
+from main import ChatServer
+from support import EchoProvider, WsClient
+
+
+class ServerTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.data_dir = tempfile.TemporaryDirectory()
+        self.services = Services({"Echo": EchoProvider()}, data_dir=self.data_dir.name, request_workers=4)
+        self.server = ChatServer(self.services, admin_token="secret")
+        self.listener = await asyncio.start_server(self.server.handle_client, "127.0.0.1", 0)
+        self.port = self.listener.sockets[0].getsockname()[1]
+
+    async def asyncTearDown(self):
+        # the sessions of closed connections are closed on an executor, give them a moment
+        for _ in range(50):
+            if not self.server.connections:
+                break
+            await asyncio.sleep(0.05)
+        self.listener.close()
+        await self.listener.wait_closed()
+        self.services.close()
+        self.data_dir.cleanup()
+
+    async def search(self, client: WsClient, words: str) -> str:
+        await client.send({"type": "prompt", "text": f"/search {words}"})
+        return await client.system_message()
+
+    async def test_search_only_finds_own_sessions(self):
+        alice = await WsClient.connect(self.port)
+        bob = await WsClient.connect(self.port)
+        await alice.send({"type": "prompt", "text": "my password is hunter2"})
+        await alice.wait_for("stream_end")
+        # the journal is written in the background, alice finds her message once it is on disk
+        for _ in range(50):
+            if "«hunter2»" in await self.search(alice, "hunter2"):
+                break
+            await asyncio.sleep(0.1)
+        else:
+            self.fail("the message was never indexed")
+        self.assertNotIn("«hunter2»", await self.search(bob, "hunter2"))
+        await alice.close()
+        await bob.close()
+
+    async def test_shared_settings_need_the_admin_token(self):
+        user = await WsClient.connect(self.port, "token=wrong")
+        admin = await WsClient.connect(self.port, "token=secret")
+        for command in ("/failover", "/profile start", "/memprofile"):
+            await user.send({"type": "prompt", "text": command})
+            self.assertNotIn("🔬", await user.system_message())
+        self.assertFalse(self.services.scheduler.failover)
+        self.assertIsNone(self.services.profiler.mode)
+        await user.send({"type": "prompt", "text": "/perf reset"})
+        self.assertEqual(await user.system_message(), "⛔ Only an admin can do that.")
+        await admin.send({"type": "prompt", "text": "/failover"})
+        await admin.system_message()
+        self.assertTrue(self.services.scheduler.failover)
+        await user.close()
+        await admin.close()
+
+    async def test_translate_upload_needs_a_known_language(self):
+        client = await WsClient.connect(self.port)
+        data = base64.b64encode(b"hello").decode("ascii")
+        await client.send({"type": "file", "name": "a.txt", "data": data, "action": "translate", "lang": "xx"})
+        self.assertEqual((await client.wait_for("error"))["text"], "unknown lang: xx")
+        self.assertFalse((self.server.uploads_dir).exists())
+        await client.close()
+
+    async def get(self, path: str):
+        reader, writer = await asyncio.open_connection("127.0.0.1", self.port)
+        writer.write(f"GET {path} HTTP/1.1\r\nHost: 127.0.0.1\r\n\r\n".encode())
+        response = await reader.read()
+        writer.close()
+        head, _, body = response.partition(b"\r\n\r\n")
+        return int(head.split()[1]), body
+
+    async def test_exports_are_kept_apart_and_can_be_downloaded(self):
+        alice = await WsClient.connect(self.port)
+        bob = await WsClient.connect(self.port)
+        exports = []
+        for client, text in ((alice, "from alice"), (bob, "from bob")):
+            await client.send({"type": "prompt", "text": text})
+            await client.wait_for("stream_end")
+        # both export in the same second
+        for client in (alice, bob):
+            await client.send({"type": "prompt", "text": "/export md"})
+        for client in (alice, bob):
+            exports.append(await client.wait_for("export"))
+        self.assertTrue(all(export["name"].startswith("chat_log_") for export in exports))
+        alice_url, bob_url = (export["url"] for export in exports)
+        self.assertNotEqual(alice_url, bob_url)
+        status, body = await self.get(alice_url)
+        self.assertEqual(status, 200)
+        self.assertIn(b"from alice", body)
+        self.assertNotIn(b"from bob", body)
+        status, body = await self.get(bob_url)
+        self.assertIn(b"from bob", body)
+        self.assertNotIn(b"from alice", body)
+        self.assertEqual((await self.get(alice_url.rsplit("/", 2)[0] + "/nobody/x.md"))[0], 404)
+        self.assertEqual((await self.get(alice_url + "/../../../search.sqlite3"))[0], 404)
+        await alice.close()
+        for _ in range(50):
+            if len(self.server.connections) == 1:
+                break
+            await asyncio.sleep(0.05)
+        self.assertEqual((await self.get(alice_url))[0], 404)
+        await bob.close()
+
+    async def test_uploads_are_removed_with_the_connection(self):
+        client = await WsClient.connect(self.port)
+        data = base64.b64encode(b"some text to summarize").decode("ascii")
+        await client.send({"type": "file", "name": "a.txt", "data": data, "action": "summarize"})
+        await client.wait_for("progress_end")
+        # /clear starts a new journal, the uploads still belong to the connection
+        await client.send({"type": "prompt", "text": "/clear"})
+        await client.wait_for("cleared")
+        await client.send({"type": "file", "name": "b.txt", "data": data, "action": "summarize"})
+        await client.wait_for("progress_end")
+        self.assertEqual(len(list(self.server.uploads_dir.iterdir())), 1)
+        await client.close()
+        cache = self.services.extraction_cache
+
+        def known_files():
+            with cache._lock:
+                return cache._conn.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+
+        # the session is closed on an executor after the connection is gone
+        for _ in range(100):
+            if not any(self.server.uploads_dir.iterdir()) and not known_files():
+                break
+            await asyncio.sleep(0.05)
+        self.assertEqual(list(self.server.uploads_dir.iterdir()), [])
+        self.assertEqual(known_files(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from chatcore import ChatSession, Services
+from chatcore.journal import read_journal
+from chatcore.message_store import ASSISTANT
+from chatcore.translations import tr
+from support import EchoProvider, ExhaustedProvider
+
+
+class SessionTest(unittest.TestCase):
+    def setUp(self):
+        self.data_dir = tempfile.TemporaryDirectory()
+        self.services = Services({"Echo": EchoProvider()}, data_dir=self.data_dir.name)
+        self.session = self.open_session()
+
+    def tearDown(self):
+        self.session.close()
+        self.services.close()
+        self.data_dir.cleanup()
+
+    def open_session(self, name: str = "a") -> ChatSession:
+        session = ChatSession(self.services, export_dir=Path(self.data_dir.name) / "exports" / name)
+        session.streaming_enabled = False
+        return session
+
+    def last_text(self) -> str:
+        return self.session.history.text(self.session.history.last_n(1)[0])
+
+    def test_history_lists_the_last_prompts(self):
+        for prompt in ("first", "second"):
+            self.session.send(prompt).result()
+        self.session.run_command("/history")
+        header, first, second = self.last_text().split("\n")
+        self.assertEqual(header, "📜 Last messages:")
+        self.assertTrue(first.startswith("[") and first.endswith("You: first"))
+        self.assertTrue(second.endswith("You: second"))
+
+    def test_export_marks_belong_to_their_session(self):
+        other = self.open_session("b")
+        self.addCleanup(other.close)
+        for session in (self.session, other):
+            session.send("hello").result()
+            session.start_export("md").result()
+        self.session.send("more").result()
+        self.session.start_export("md").result()
+        path = Path(self.services.get_export_mark(self.session.session_id, "md")["path"])
+        # appended after the first export: its message, the prompt and the reply
+        self.assertEqual(self.last_text(), tr("messages.export_done", "en").format(3, path.name))
+        self.assertEqual(self.services.get_export_mark(other.session_id, "md")["count"], 2)
+
+
+
+class FailoverTest(unittest.TestCase):
+    def setUp(self):
+        self.data_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.data_dir.cleanup()
+
+    # Busy stays paused after its 429, so every run gets its own services
+    def reply_after_failover(self, streaming: bool):
+        services = Services({"Busy": ExhaustedProvider(), "Echo": EchoProvider()}, data_dir=self.data_dir.name,
+                            failover=True)
+        session = ChatSession(services, model_choice="Busy")
+        session.streaming_enabled = streaming
+        try:
+            session.send("hello").result()
+            reply = session.history.last(ASSISTANT)
+            journal = session.journal
+        finally:
+            session.close()
+            services.close()
+        journal.close()
+        authors = [record["author"] for record in read_journal(journal.path)
+                   if record["type"] == "message" and record["role"] == ASSISTANT]
+        return session.history.text(reply), reply.author, reply.model, authors
+
+    def test_reply_is_saved_under_the_model_that_answered(self):
+        for streaming in (False, True):
+            with self.subTest(streaming=streaming):
+                self.assertEqual(self.reply_after_failover(streaming), ("echo: hello", "Echo", "Echo", ["Echo"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
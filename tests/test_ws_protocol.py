@@ -0,0 +1,176 @@
+import asyncio
+import base64
+import hashlib
+import struct
+import unittest
+
+from support import client_frame, read_server_frame
+from ws_protocol import (CLOSE_GOING_AWAY, CLOSE_PROTOCOL_ERROR, CLOSE_TOO_BIG, OP_BINARY, OP_CLOSE,
+                         OP_CONTINUATION, OP_PING, OP_PONG, OP_TEXT, WS_GUID, ConnectionClosed, ProtocolError,
+                         WebSocket, _unmask, accept_websocket, read_request)
+
+
+# collects what the server writes
+class Writer:
+    def __init__(self):
+        self.data = bytearray()
+
+    def write(self, data: bytes):
+        self.data += data
+
+    async def drain(self):
+        pass
+
+    # the frames written so far as (fin, opcode, payload)
+    async def frames(self) -> list:
+        reader = asyncio.StreamReader()
+        reader.feed_data(bytes(self.data))
+        reader.feed_eof()
+        frames = []
+        while not reader.at_eof():
+            frames.append(await read_server_frame(reader))
+        return frames
+
+
+def stream(*chunks: bytes) -> asyncio.StreamReader:
+    reader = asyncio.StreamReader()
+    for chunk in chunks:
+        reader.feed_data(chunk)
+    reader.feed_eof()
+    return reader
+
+
+class WebSocketTest(unittest.IsolatedAsyncioTestCase):
+    def socket(self, *frames: bytes, max_message_bytes: int = 1 << 20) -> WebSocket:
+        self.writer = Writer()
+        return WebSocket(stream(*frames), self.writer, max_message_bytes)
+
+    async def assertProtocolError(self, ws: WebSocket, code: int = CLOSE_PROTOCOL_ERROR):
+        with self.assertRaises(ProtocolError) as raised:
+            await ws.receive()
+        self.assertEqual(raised.exception.code, code)
+
+    def test_unmask(self):
+        payload = bytes(range(11))
+        mask = b"\x01\x80\xff\x10"
+        masked = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+        self.assertEqual(_unmask(masked, mask), payload)
+        self.assertEqual(_unmask(b"", mask), b"")
+
+    async def test_masked_text(self):
+        ws = self.socket(client_frame(OP_TEXT, "héllo".encode("utf-8"), mask=b"\x12\x34\x56\x78"))
+        self.assertEqual(await ws.receive(), "héllo")
+
+    async def test_length_prefixes(self):
+        for size in (0, 125, 126, 65535, 65536, 200000):
+            payload = bytes(i % 251 for i in range(size))
+            frame = client_frame(OP_BINARY, payload)
+            # 7 bit length up to 125, then a 16 bit one, then a 64 bit one
+            self.assertEqual(len(frame) - size, 6 if size < 126 else 8 if size < 65536 else 14)
+            self.assertEqual(await self.socket(frame).receive(), payload)
+
+    async def test_server_length_prefixes(self):
+        ws = self.socket()
+        for size in (5, 300, 70000):
+            await ws.send_text("x" * size)
+        frames = await self.writer.frames()
+        self.assertEqual([(fin, opcode, len(payload)) for fin, opcode, payload in frames],
+                         [(True, OP_TEXT, 5), (True, OP_TEXT, 300), (True, OP_TEXT, 70000)])
+        self.assertEqual(self.writer.data[1], 5)  # server frames are not masked
+        self.assertEqual(self.writer.data[2 + 5 + 1], 126)
+
+    async def test_fragmented_message_with_a_ping_between(self):
+        ws = self.socket(client_frame(OP_TEXT, b"Hel", fin=False),
+                         client_frame(OP_PING, b"are you there"),
+                         client_frame(OP_CONTINUATION, b"lo ", fin=False),
+                         client_frame(OP_CONTINUATION, b"world"))
+        self.assertEqual(await ws.receive(), "Hello world")
+        self.assertEqual(await self.writer.frames(), [(True, OP_PONG, b"are you there")])
+
+    async def test_pong_is_ignored(self):
+        ws = self.socket(client_frame(OP_PONG, b""), client_frame(OP_TEXT, b"hi"))
+        self.assertEqual(await ws.receive(), "hi")
+        self.assertEqual(self.writer.data, b"")
+
+    async def test_close_is_answered(self):
+        ws = self.socket(client_frame(OP_CLOSE, struct.pack("!H", 1000) + b"bye"))
+        with self.assertRaises(ConnectionClosed):
+            await ws.receive()
+        self.assertTrue(ws.closed)
+        self.assertEqual(await self.writer.frames(), [(True, OP_CLOSE, struct.pack("!H", 1000))])
+        # closing again sends nothing more
+        await ws.close()
+        self.assertEqual(len(await self.writer.frames()), 1)
+
+    async def test_end_of_stream_closes(self):
+        ws = self.socket(client_frame(OP_TEXT, b"hello")[:5])
+        with self.assertRaises(ConnectionClosed) as raised:
+            await ws.receive()
+        self.assertEqual(raised.exception.args, (CLOSE_GOING_AWAY,))
+        with self.assertRaises(ConnectionClosed):
+            await ws.send_text("too late")
+
+    async def test_message_size_limit(self):
+        self.assertEqual(await self.socket(client_frame(OP_TEXT, b"x" * 100), max_message_bytes=100).receive(),
+                         "x" * 100)
+        await self.assertProtocolError(self.socket(client_frame(OP_TEXT, b"x" * 101), max_message_bytes=100),
+                                       CLOSE_TOO_BIG)
+        # the limit is for the whole message, not per fragment
+        await self.assertProtocolError(self.socket(client_frame(OP_TEXT, b"x" * 60, fin=False),
+                                                   client_frame(OP_CONTINUATION, b"x" * 60), max_message_bytes=100),
+                                       CLOSE_TOO_BIG)
+
+    async def test_oversized_frame_is_refused_before_its_payload(self):
+        # only the header arrives: a 64 bit length of 2^40 bytes is refused without waiting for them
+        header = struct.pack("!BBQ", 0x80 | OP_BINARY, 0x80 | 127, 1 << 40) + b"\0\0\0\0"
+        await self.assertProtocolError(self.socket(header), CLOSE_TOO_BIG)
+
+    async def test_bad_continuation(self):
+        await self.assertProtocolError(self.socket(client_frame(OP_CONTINUATION, b"orphan")))
+        # a new message while the last one is unfinished
+        await self.assertProtocolError(self.socket(client_frame(OP_TEXT, b"a", fin=False), client_frame(OP_TEXT, b"b")))
+
+    async def test_invalid_frames(self):
+        bad = {
+            "unmasked": struct.pack("!BB", 0x80 | OP_TEXT, 2) + b"hi",
+            "reserved bits": client_frame(OP_TEXT, b"hi", rsv=0x40),
+            "reserved opcode": client_frame(0x3, b"hi"),
+            "reserved control opcode": client_frame(0xB, b""),
+            "long control frame": client_frame(OP_PING, b"x" * 126),
+            "fragmented control frame": client_frame(OP_PING, b"x", fin=False),
+            "text that is not UTF-8": client_frame(OP_TEXT, b"\xff\xfe"),
+        }
+        for name, frame in bad.items():
+            with self.subTest(name):
+                await self.assertProtocolError(self.socket(frame))
+
+
+class HttpTest(unittest.IsolatedAsyncioTestCase):
+    async def test_websocket_handshake(self):
+        request = await read_request(stream(b"GET /ws?lang=de&model=Echo HTTP/1.1\r\nHost: x\r\nUpgrade: websocket\r\n"
+                                            b"Connection: keep-alive, Upgrade\r\n"
+                                            b"Sec-WebSocket-Key: dGhlIHNhbXBsZSBub25jZQ==\r\n\r\n"))
+        self.assertEqual((request.method, request.path, request.query), ("GET", "/ws", "lang=de&model=Echo"))
+        self.assertTrue(request.is_websocket())
+        writer = Writer()
+        await accept_websocket(writer, request)
+        # the example from RFC 6455
+        self.assertIn(b"Sec-WebSocket-Accept: s3pPLMBiTxaQ9kYGzzhZRbK+xOo=\r\n", writer.data)
+        expected = base64.b64encode(hashlib.sha1(b"dGhlIHNhbXBsZSBub25jZQ==" + WS_GUID.encode()).digest())
+        self.assertEqual(expected, b"s3pPLMBiTxaQ9kYGzzhZRbK+xOo=")
+
+    async def test_plain_request(self):
+        request = await read_request(stream(b"GET /health HTTP/1.1\r\nHost: x\r\n\r\n"))
+        self.assertEqual(request.path, "/health")
+        self.assertFalse(request.is_websocket())
+
+    async def test_closed_before_request(self):
+        self.assertIsNone(await read_request(stream(b"GET / HT")))
+
+    async def test_malformed_request_line(self):
+        with self.assertRaises(ProtocolError):
+            await read_request(stream(b"nonsense\r\n\r\n"))
+
+
+if __name__ == "__main__":
+    unittest.main()
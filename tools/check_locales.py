@@ -0,0 +1,73 @@
+# check_locales.py - checks every language file in locales/ against en.json and measures how long each takes to load
+# usage: python tools/check_locales.py [--repeat N]
+# Reports keys missing from a language, keys English doesn't have and texts whose {} placeholders differ from English.
+# Exits with 1 when a file can't be read, a key is missing or placeholders differ.
+import argparse
+import string
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from chatcore import translations  # noqa: E402
+
+
+def placeholders(text: str) -> list[str]:
+    try:
+        return sorted(field or "" for _, field, _, _ in string.Formatter().parse(text) if field is not None)
+    except ValueError:
+        return ["<invalid>"]
+
+
+# reads, parses and compiles one language from scratch, returns (seconds, flat table)
+def load(lang: str, repeat: int) -> tuple[float, dict]:
+    best = None
+    for _ in range(repeat):
+        packs = translations.LanguagePacks(translations.LOCALES_DIR)
+        started = time.perf_counter()
+        catalog = translations._flatten(packs[lang], "", {})
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, catalog
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Check key coverage of the language files and time loading them.")
+    parser.add_argument("--repeat", type=int, default=5, help="loads per language, the fastest one is reported")
+    args = parser.parse_args()
+
+    failed = False
+    _, english = load("en", 1)
+    total = 0.0
+    print(f"{'lang':<6}{'keys':>6}{'missing':>9}{'extra':>7}{'format':>8}{'load ms':>9}")
+    for lang in translations.LANGUAGES.codes():
+        try:
+            seconds, catalog = load(lang, args.repeat)
+        except (OSError, ValueError) as e:
+            print(f"{lang:<6} can't be read: {e}")
+            failed = True
+            continue
+        total += seconds
+        missing = sorted(set(english) - set(catalog))
+        extra = sorted(set(catalog) - set(english))
+        mismatched = sorted(key for key in set(english) & set(catalog)
+                            if placeholders(english[key]) != placeholders(catalog[key]))
+        print(f"{lang:<6}{len(catalog):>6}{len(missing):>9}{len(extra):>7}{len(mismatched):>8}{seconds * 1000:>9.2f}")
+        for key in missing:
+            print(f"    missing: {key}")
+        for key in extra:
+            print(f"    extra:   {key}")
+        for key in mismatched:
+            print(f"    format:  {key} {placeholders(catalog[key])} instead of {placeholders(english[key])}")
+        failed = failed or bool(missing or mismatched)
+
+    started = time.perf_counter()
+    packs = translations.LanguagePacks(translations.LOCALES_DIR)
+    packs.codes()
+    print(f"\n{len(packs)} languages, listing them takes {(time.perf_counter() - started) * 1000:.2f} ms, "
+          f"loading all of them {total * 1000:.2f} ms")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
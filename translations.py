@@ -1,883 +0,0 @@
-# translations.py - contains dictionary for translated text for UI elements and commands when user types '/command'
-# Commands have their respective translation
-
-LANGUAGES = {
-    "en": {
-        "send": "Send",
-        "upload": "📎 Upload",
-        "model": "Model",
-        "language": "Language",
-        "chat_saved": "Chat Saved",
-        "save_error_title": "Save Error",
-        "saved": "Chat log saved to:\n{}",
-        "save_error": "Failed to save chat log:\n{}",
-        "help_header": "📖 Available commands:\n{}",
-        "error_prefix": "❌ Error:",
-        "rate_limit_openai": "❌ OpenAI quota exceeded. Visit https://platform.openai.com/account/usage",
-        "rate_limit_gemini": "❌ Gemini quota exceeded. Visit https://makersuite.google.com/app/apikey",
-        "action_cancelled": "❌ Action cancelled or unsupported.",
-        "unsupported_file": "❌ Unsupported file type.",
-        "file_empty": "⚠️ File is empty or unreadable.",
-        "summary_header": "🧠 Summary:\n",
-        "translate_header": "🌐 Translation ({lang}):\n",
-        "theme": "🎨 Theme switched to {}.",
-        "messages": {
-            "chat_cleared": "🧹 Chat cleared.",
-            "current_model": "🤖 Current model: {}",
-            "switched_model": "🔁 Switched to {}",
-            "messages_exchanged": "📊 Messages exchanged: {}",
-            "feedback": "💬 Send your feedback to: dev@yourdomain.com",
-            "copied": "✅ Last response copied to clipboard.",
-            "nothing_to_copy": "⚠️ Nothing to copy.",
-            "chat_saved_as": "✅ Chat saved as '{}'",
-            "chat_save_failed": "❌ Failed to save: {}",
-            "last_messages": "📜 Last messages:\n{}",
-            "version": "📦 Version 1.0.0",
-            "timestamps_on": "⏱️ Timestamps enabled.",
-            "timestamps_off": "⏱️ Timestamps disabled.",
-            "context_reset": "🔄 AI context reset.",
-            "file_deleted": "🗑️ Deleted {}",
-            "file_delete_failed": "❌ Failed to delete file: {}",
-            "no_file_to_delete": "⚠️ No saved file to delete.",
-            "json_exported": "🗃️ Exported chat as JSON:\n{}",
-            "json_export_failed": "❌ Export failed: {}",
-            "name_set": "🙋 Your name is now: {}",
-            "emoji_list": "💬 Emojis you can use:\n{}",
-            "not_enough_to_summarize": "🧠 Not enough content to summarize.",
-            "summary_result": "🧠 Summary:\n{}",
-            "summary_failed": "❌ Summarization failed: {}",
-            "translation_result": "🌐 Translation ({}):\n{}",
-            "translation_failed": "❌ Translation failed: {}",
-            "no_response_to_translate": "🌐 No assistant response found to translate.",
-            "all_commands": "📘 All commands:\n{}",
-            "did_you_mean": "🤔 Did you mean:\n{}",
-            "unknown_command": "❓ Unknown command. Type /help to see available commands.",
-            "action_cancelled": "❌ Action cancelled or unsupported.",
-            "file_empty": "⚠️ File is empty or unreadable.",
-            "file_read_error": "❌ Failed to read file: {}",
-            "unsupported_file": "Unsupported file format.",
-            "file_prompt_action": "What do you want to do with the file?\nOptions: summarize / translate",
-            "file_prompt_language": "Translate to which language? (e.g., English, German)",
-            "pdf_export_success": "📄 PDF exported to Desktop:\n{}",
-            "pdf_export_failed": "❌ Failed to export PDF: {}"
-        },
-        "commands": {
-            "/help": "Show available commands",
-            "/clear": "Clear chat history and screen",
-            "/exit": "Exit the application",
-            "/model": "Show current active model",
-            "/switch": "Switch between OpenAI and Gemini",
-            "/stats": "Show usage stats",
-            "/feedback": "Write feedback to developer",
-            "/theme": "Toggle theme (if supported)",
-            "/copylast": "Copy last response",
-            "/save": "Save chat log with custom filename",
-            "/history": "Show recent user messages",
-            "/version": "Show app version",
-            "/timestamp": "Toggle timestamps on/off in chat view",
-            "/reset": "Reset the AI context/session",
-            "/deletefile": "Delete the last saved .txt file",
-            "/openlog": "Open the folder containing saved logs",
-            "/exportjson": "Export chat history as JSON",
-            "/exportpdf": "Export chat log as a styled PDF",
-            "/openaiusage": "Open OpenAI usage dashboard in browser",
-            "/geminiusagelink": "Open Gemini API key dashboard",
-            "/setname": "Set your display name in chat",
-            "/emoji": "Insert common emojis",
-            "/shrink": "Collapse chat history to summary (if supported)",
-            "/translate": "Translate last response to selected language"
-        }
-    },
-    "zh": {
-        "send": "发送",
-        "upload": "📎 上传",
-        "model": "模型",
-        "language": "语言",
-        "chat_saved": "聊天记录已保存",
-        "save_error_title": "保存失败",
-        "saved": "聊天记录已保存到:\n{}",
-        "save_error": "保存聊天记录失败:\n{}",
-        "help_header": "📖 可用命令：",
-        "error_prefix": "❌ 错误：",
-        "rate_limit_openai": "❌ OpenAI 配额已超出。访问 https://platform.openai.com/account/usage",
-        "rate_limit_gemini": "❌ Gemini 配额已超出。访问 https://makersuite.google.com/app/apikey",
-        "action_cancelled": "❌ 操作已取消或不支持。",
-        "unsupported_file": "❌ 不支持的文件类型。",
-        "file_empty": "⚠️ 文件为空或不可读取。",
-        "summary_header": "🧠 总结：\n",
-        "translate_header": "🌐 翻译（{lang}）：\n",
-        "theme": "🎨 主题已切换为 {}。",
-        "messages": {
-            "chat_cleared": "🧹 聊天已清除。",
-            "current_model": "🤖 当前模型：{}",
-            "switched_model": "🔁 已切换到 {}",
-            "messages_exchanged": "📊 已交换消息：{}",
-            "feedback": "💬 请将您的反馈发送至：dev@yourdomain.com",
-            "copied": "✅ 上次回复已复制到剪贴板。",
-            "nothing_to_copy": "⚠️ 没有内容可复制。",
-            "chat_saved_as": "✅ 聊天已保存为 '{}'。",
-            "chat_save_failed": "❌ 保存失败：{}",
-            "last_messages": "📜 最近消息：\n{}",
-            "version": "📦 版本 1.0.0",
-            "timestamps_on": "⏱️ 时间戳已启用。",
-            "timestamps_off": "⏱️ 时间戳已禁用。",
-            "context_reset": "🔄 AI 上下文已重置。",
-            "file_deleted": "🗑️ 已删除 {}",
-            "file_delete_failed": "❌ 删除文件失败：{}",
-            "no_file_to_delete": "⚠️ 没有要删除的保存文件。",
-            "json_exported": "🗃️ 聊天导出为 JSON：\n{}",
-            "json_export_failed": "❌ 导出失败：{}",
-            "name_set": "🙋 您的名字现在是：{}",
-            "emoji_list": "💬 可用表情符号：\n{}",
-            "not_enough_to_summarize": "🧠 内容不足，无法总结。",
-            "summary_result": "🧠 总结：\n{}",
-            "summary_failed": "❌ 总结失败：{}",
-            "translation_result": "🌐 翻译（{}）：\n{}",
-            "translation_failed": "❌ 翻译失败：{}",
-            "no_response_to_translate": "🌐 未找到可翻译的回复。",
-            "all_commands": "📘 所有命令：\n{}",
-            "did_you_mean": "🤔 您的意思是：\n{}",
-            "unknown_command": "❓ 未知命令。输入 /help 查看可用命令。",
-            "action_cancelled": "❌ 操作已取消或不支持。",
-            "file_empty": "⚠️ 文件为空或不可读取。",
-            "file_read_error": "❌ 无法读取文件：{}",
-            "unsupported_file": "不支持的文件格式。",
-            "file_prompt_action": "您想对文件做什么？\n选项：summarize / translate",
-            "file_prompt_language": "翻译成哪种语言？（例如：英语、德语）",
-            "pdf_export_success": "📄 PDF 已导出到桌面：\n{}",
-            "pdf_export_failed": "❌ 导出 PDF 失败：{}"
-        },
-        "commands": {
-            "/help": "显示可用命令",
-            "/save": "手动将聊天记录保存到桌面",
-            "/clear": "清除聊天历史和屏幕",
-            "/exit": "退出应用程序",
-            "/model": "显示当前激活的模型",
-            "/switch": "在 OpenAI 和 Gemini 之间切换",
-            "/stats": "显示使用统计",
-            "/feedback": "向开发者发送反馈",
-            "/theme": "切换主题（如果支持）",
-            "/copylast": "复制最后的回复",
-            "/history": "显示最近的用户消息",
-            "/version": "显示应用版本",
-            "/timestamp": "切换聊天视图中的时间戳显示",
-            "/reset": "重置 AI 会话",
-            "/deletefile": "删除最后保存的 .txt 文件",
-            "/openlog": "打开保存日志的文件夹",
-            "/exportjson": "将聊天记录导出为 JSON",
-            "/exportpdf": "将聊天记录导出为 PDF（带样式）",
-            "/openaiusage": "在浏览器中打开 OpenAI 使用仪表板",
-            "/geminiusagelink": "打开 Gemini API 密钥仪表板",
-            "/setname": "设置您在聊天中的显示名称",
-            "/emoji": "插入常用表情符号",
-            "/shrink": "将聊天记录折叠为摘要（如支持）",
-            "/translate": "将最后的回复翻译成选定的语言"
-        }
-    },
-    "hi": {
-        "send": "भेजें",
-        "upload": "📎 अपलोड करें",
-        "model": "मॉडल",
-        "language": "भाषा",
-        "chat_saved": "चैट सहेजा गया",
-        "save_error_title": "सहेजने में त्रुटि",
-        "saved": "चैट को यहां सहेजा गया:\n{}",
-        "save_error": "चैट सहेजने में विफल:\n{}",
-        "help_header": "📖 उपलब्ध कमांड:",
-        "error_prefix": "❌ त्रुटि:",
-        "rate_limit_openai": "❌ OpenAI कोटा समाप्त। देखें https://platform.openai.com/account/usage",
-        "rate_limit_gemini": "❌ Gemini कोटा समाप्त। देखें https://makersuite.google.com/app/apikey",
-        "action_cancelled": "❌ कार्रवाई रद्द या असमर्थित।",
-        "unsupported_file": "❌ असमर्थित फ़ाइल प्रकार।",
-        "file_empty": "⚠️ फ़ाइल खाली या अपठनीय है।",
-        "summary_header": "🧠 सारांश:\n",
-        "translate_header": "🌐 अनुवाद ({lang}):\n",
-        "theme": "🎨 थीम {} में बदल दी गई है।",
-        "messages": {
-            "chat_cleared": "🧹 चैट साफ़ कर दिया गया।",
-            "current_model": "🤖 वर्तमान मॉडल: {}",
-            "switched_model": "🔁 {} में स्विच किया गया",
-            "messages_exchanged": "📊 संदेशों का आदान-प्रदान: {}",
-            "feedback": "💬 अपनी प्रतिक्रिया भेजें: dev@yourdomain.com",
-            "copied": "✅ अंतिम उत्तर क्लिपबोर्ड पर कॉपी किया गया।",
-            "nothing_to_copy": "⚠️ कॉपी करने के लिए कुछ नहीं है।",
-            "chat_saved_as": "✅ चैट '{}' के रूप में सहेजा गया।",
-            "chat_save_failed": "❌ सहेजने में विफल: {}",
-            "last_messages": "📜 अंतिम संदेश:\n{}",
-            "version": "📦 संस्करण 1.0.0",
-            "timestamps_on": "⏱️ टाइमस्टैम्प सक्षम हैं।",
-            "timestamps_off": "⏱️ टाइमस्टैम्प अक्षम हैं।",
-            "context_reset": "🔄 AI संदर्भ रीसेट किया गया।",
-            "file_deleted": "🗑️ {} हटाया गया",
-            "file_delete_failed": "❌ फ़ाइल हटाने में विफल: {}",
-            "no_file_to_delete": "⚠️ हटाने के लिए कोई सहेजी गई फ़ाइल नहीं है।",
-            "json_exported": "🗃️ JSON के रूप में चैट निर्यात किया गया:\n{}",
-            "json_export_failed": "❌ निर्यात विफल: {}",
-            "name_set": "🙋 अब आपका नाम है: {}",
-            "emoji_list": "💬 आप निम्न इमोजी उपयोग कर सकते हैं:\n{}",
-            "not_enough_to_summarize": "🧠 सारांश के लिए पर्याप्त सामग्री नहीं।",
-            "summary_result": "🧠 सारांश:\n{}",
-            "summary_failed": "❌ सारांश विफल: {}",
-            "translation_result": "🌐 अनुवाद ({}):\n{}",
-            "translation_failed": "❌ अनुवाद विफल: {}",
-            "no_response_to_translate": "🌐 अनुवाद के लिए कोई उत्तर नहीं मिला।",
-            "all_commands": "📘 सभी कमांड:\n{}",
-            "did_you_mean": "🤔 क्या आपका मतलब था:\n{}",
-            "unknown_command": "❓ अज्ञात कमांड। /help टाइप करें सभी कमांड देखने के लिए।",
-            "action_cancelled": "❌ क्रिया रद्द या असमर्थित।",
-            "file_empty": "⚠️ फ़ाइल खाली या पढ़ने योग्य नहीं है।",
-            "file_read_error": "❌ फ़ाइल पढ़ने में विफल: {}",
-            "unsupported_file": "असमर्थित फ़ाइल प्रारूप।",
-            "file_prompt_action": "आप फ़ाइल के साथ क्या करना चाहते हैं?\nविकल्प: summarize / translate",
-            "file_prompt_language": "किस भाषा में अनुवाद करें? (उदा. English, German)",
-            "pdf_export_success": "📄 PDF डेस्कटॉप पर निर्यात किया गया:\n{}",
-            "pdf_export_failed": "❌ PDF निर्यात विफल: {}"
-        },
-        "commands": {
-            "/help": "उपलब्ध कमांड दिखाएं",
-            "/clear": "चैट इतिहास और स्क्रीन साफ करें",
-            "/exit": "एप्लिकेशन से बाहर निकलें",
-            "/model": "वर्तमान सक्रिय मॉडल दिखाएं",
-            "/switch": "OpenAI और Gemini के बीच स्विच करें",
-            "/stats": "उपयोग के आँकड़े दिखाएं",
-            "/feedback": "डेवलपर को प्रतिक्रिया भेजें",
-            "/theme": "थीम बदलें (यदि समर्थित हो)",
-            "/copylast": "अंतिम उत्तर को कॉपी करें",
-            "/save": "कस्टम फ़ाइल नाम के साथ चैट सहेजें",
-            "/history": "हाल की यूज़र चैट दिखाएं",
-            "/version": "ऐप का संस्करण दिखाएं",
-            "/timestamp": "चैट में टाइमस्टैम्प चालू/बंद करें",
-            "/reset": "AI सत्र रीसेट करें",
-            "/deletefile": "अंतिम सहेजी गई .txt फ़ाइल हटाएं",
-            "/openlog": "लॉग फ़ोल्डर खोलें",
-            "/exportjson": "चैट को JSON के रूप में निर्यात करें",
-            "/exportpdf": "स्टाइल PDF के रूप में चैट निर्यात करें",
-            "/openaiusage": "OpenAI उपयोग डैशबोर्ड खोलें",
-            "/geminiusagelink": "Gemini API डैशबोर्ड खोलें",
-            "/setname": "चैट में अपना नाम सेट करें",
-            "/emoji": "सामान्य इमोजी जोड़ें",
-            "/shrink": "चैट इतिहास को सारांश में संक्षेप करें (यदि समर्थित हो)",
-            "/translate": "अंतिम उत्तर को चयनित भाषा में अनुवाद करें"
-        }
-    },
-    "es": {
-        "send": "Enviar",
-        "upload": "📎 Subir",
-        "model": "Modelo",
-        "language": "Idioma",
-        "chat_saved": "Chat guardado",
-        "save_error_title": "Error al guardar",
-        "saved": "Registro guardado en:\n{}",
-        "save_error": "Error al guardar:\n{}",
-        "help_header": "📖 Comandos disponibles:",
-        "error_prefix": "❌ Error:",
-        "rate_limit_openai": "❌ Cuota de OpenAI superada. Visita https://platform.openai.com/account/usage",
-        "rate_limit_gemini": "❌ Cuota de Gemini superada. Visita https://makersuite.google.com/app/apikey",
-        "action_cancelled": "❌ Acción cancelada o no compatible.",
-        "unsupported_file": "❌ Tipo de archivo no compatible.",
-        "file_empty": "⚠️ El archivo está vacío o ilegible.",
-        "summary_header": "🧠 Resumen:\n",
-        "translate_header": "🌐 Traducción ({lang}):\n",
-        "theme": "🎨 Thème changé en {}.",
-        "messages": {
-            "chat_cleared": "🧹 Chat borrado.",
-            "current_model": "🤖 Modelo actual: {}",
-            "switched_model": "🔁 Cambiado a {}",
-            "messages_exchanged": "📊 Mensajes intercambiados: {}",
-            "feedback": "💬 Envía tus comentarios a: dev@yourdomain.com",
-            "copied": "✅ Última respuesta copiada al portapapeles.",
-            "nothing_to_copy": "⚠️ Nada para copiar.",
-            "chat_saved_as": "✅ Chat guardado como '{}'",
-            "chat_save_failed": "❌ Error al guardar: {}",
-            "last_messages": "📜 Últimos mensajes:\n{}",
-            "version": "📦 Versión 1.0.0",
-            "timestamps_on": "⏱️ Tiempos activados.",
-            "timestamps_off": "⏱️ Tiempos desactivados.",
-            "context_reset": "🔄 Contexto de IA reiniciado.",
-            "file_deleted": "🗑️ {} eliminado",
-            "file_delete_failed": "❌ Error al eliminar archivo: {}",
-            "no_file_to_delete": "⚠️ No hay archivo guardado para eliminar.",
-            "json_exported": "🗃️ Chat exportado como JSON:\n{}",
-            "json_export_failed": "❌ Error al exportar: {}",
-            "name_set": "🙋 Tu nombre ahora es: {}",
-            "emoji_list": "💬 Emojis que puedes usar:\n{}",
-            "not_enough_to_summarize": "🧠 No hay suficiente contenido para resumir.",
-            "summary_result": "🧠 Resumen:\n{}",
-            "summary_failed": "❌ Error al resumir: {}",
-            "translation_result": "🌐 Traducción ({}):\n{}",
-            "translation_failed": "❌ Error al traducir: {}",
-            "no_response_to_translate": "🌐 No hay respuesta del asistente para traducir.",
-            "all_commands": "📘 Todos los comandos:\n{}",
-            "did_you_mean": "🤔 Quisiste decir:\n{}",
-            "unknown_command": "❓ Comando desconocido. Escribe /help para ver los disponibles.",
-            "action_cancelled": "❌ Acción cancelada o no compatible.",
-            "file_empty": "⚠️ Archivo vacío o ilegible.",
-            "file_read_error": "❌ Error al leer archivo: {}",
-            "unsupported_file": "Formato de archivo no compatible.",
-            "file_prompt_action": "¿Qué quieres hacer con el archivo?\nOpciones: summarize / translate",
-            "file_prompt_language": "¿A qué idioma traducir? (Ej: Español, Alemán)",
-            "pdf_export_success": "📄 PDF exportado al escritorio:\n{}",
-            "pdf_export_failed": "❌ Error al exportar PDF: {}"
-        },
-        "commands": {
-            "/help": "Mostrar comandos disponibles",
-            "/clear": "Borrar historial de chat y pantalla",
-            "/exit": "Salir de la aplicación",
-            "/model": "Mostrar modelo activo actual",
-            "/switch": "Cambiar entre OpenAI y Gemini",
-            "/stats": "Mostrar estadísticas de uso",
-            "/feedback": "Enviar comentarios al desarrollador",
-            "/theme": "Alternar tema (si es compatible)",
-            "/copylast": "Copiar última respuesta",
-            "/save": "Guardar chat con nombre personalizado",
-            "/history": "Mostrar mensajes recientes del usuario",
-            "/version": "Mostrar la versión de la app",
-            "/timestamp": "Activar/desactivar marcas de tiempo en el chat",
-            "/reset": "Reiniciar el contexto/sesión de la IA",
-            "/deletefile": "Eliminar el último archivo .txt guardado",
-            "/openlog": "Abrir carpeta con registros guardados",
-            "/exportjson": "Exportar historial del chat como JSON",
-            "/exportpdf": "Exportar chat como PDF con estilo",
-            "/openaiusage": "Abrir panel de uso de OpenAI en navegador",
-            "/geminiusagelink": "Abrir panel de claves API de Gemini",
-            "/setname": "Establecer tu nombre en el chat",
-            "/emoji": "Insertar emojis comunes",
-            "/shrink": "Reducir historial del chat a un resumen (si se permite)",
-            "/translate": "Traducir la última respuesta al idioma seleccionado"
-        }
-    },
-    "fr": {
-        "send": "Envoyer",
-        "upload": "📎 Télécharger",
-        "model": "Modèle",
-        "language": "Langue",
-        "chat_saved": "Chat enregistré",
-        "save_error_title": "Erreur d’enregistrement",
-        "saved": "Chat enregistré à :\n{}",
-        "save_error": "Erreur d’enregistrement :\n{}",
-        "help_header": "📖 Commandes disponibles :",
-        "error_prefix": "❌ Erreur :",
-        "rate_limit_openai": "❌ Quota OpenAI dépassé. Visitez https://platform.openai.com/account/usage",
-        "rate_limit_gemini": "❌ Quota Gemini dépassé. Visitez https://makersuite.google.com/app/apikey",
-        "action_cancelled": "❌ Action annulée ou non prise en charge.",
-        "unsupported_file": "❌ Type de fichier non pris en charge.",
-        "file_empty": "⚠️ Fichier vide ou illisible.",
-        "summary_header": "🧠 Résumé :\n",
-        "translate_header": "🌐 Traduction ({lang}) :\n",
-        "theme": "🎨 Thème changé en {}.",
-        "messages": {
-            "chat_cleared": "🧹 Discussion effacée.",
-            "current_model": "🤖 Modèle actuel : {}",
-            "switched_model": "🔁 Changement vers {}",
-            "messages_exchanged": "📊 Messages échangés : {}",
-            "feedback": "💬 Envoyez vos commentaires à : dev@yourdomain.com",
-            "copied": "✅ Dernière réponse copiée dans le presse-papiers.",
-            "nothing_to_copy": "⚠️ Rien à copier.",
-            "chat_saved_as": "✅ Discussion enregistrée sous '{}'",
-            "chat_save_failed": "❌ Échec de l’enregistrement : {}",
-            "last_messages": "📜 Derniers messages :\n{}",
-            "version": "📦 Version 1.0.0",
-            "timestamps_on": "⏱️ Horodatage activé.",
-            "timestamps_off": "⏱️ Horodatage désactivé.",
-            "context_reset": "🔄 Contexte IA réinitialisé.",
-            "file_deleted": "🗑️ {} supprimé",
-            "file_delete_failed": "❌ Échec de suppression du fichier : {}",
-            "no_file_to_delete": "⚠️ Aucun fichier enregistré à supprimer.",
-            "json_exported": "🗃️ Discussion exportée en JSON :\n{}",
-            "json_export_failed": "❌ Échec de l’exportation : {}",
-            "name_set": "🙋 Votre nom est maintenant : {}",
-            "emoji_list": "💬 Émojis disponibles :\n{}",
-            "not_enough_to_summarize": "🧠 Pas assez de contenu pour résumer.",
-            "summary_result": "🧠 Résumé :\n{}",
-            "summary_failed": "❌ Résumé échoué : {}",
-            "translation_result": "🌐 Traduction ({}):\n{}",
-            "translation_failed": "❌ Échec de la traduction : {}",
-            "no_response_to_translate": "🌐 Aucune réponse de l'assistant à traduire.",
-            "all_commands": "📘 Tous les commandes :\n{}",
-            "did_you_mean": "🤔 Vouliez-vous dire :\n{}",
-            "unknown_command": "❓ Commande inconnue. Tapez /help pour les voir.",
-            "action_cancelled": "❌ Action annulée ou non prise en charge.",
-            "file_empty": "⚠️ Fichier vide ou illisible.",
-            "file_read_error": "❌ Impossible de lire le fichier : {}",
-            "unsupported_file": "Format de fichier non supporté.",
-            "file_prompt_action": "Que souhaitez-vous faire avec le fichier ?\nOptions : summarize / translate",
-            "file_prompt_language": "Traduire vers quelle langue ? (ex. : Français, Allemand)",
-            "pdf_export_success": "📄 PDF exporté sur le bureau :\n{}",
-            "pdf_export_failed": "❌ Échec de l'exportation PDF : {}"
-        },
-        "commands": {
-            "/help": "Afficher les commandes disponibles",
-            "/clear": "Effacer l'historique et l'écran de chat",
-            "/exit": "Quitter l'application",
-            "/model": "Afficher le modèle actif actuel",
-            "/switch": "Basculer entre OpenAI et Gemini",
-            "/stats": "Afficher les statistiques d'utilisation",
-            "/feedback": "Envoyer des commentaires au développeur",
-            "/theme": "Basculer le thème (si pris en charge)",
-            "/copylast": "Copier la dernière réponse",
-            "/save": "Enregistrer le chat avec un nom personnalisé",
-            "/history": "Afficher les messages utilisateur récents",
-            "/version": "Afficher la version de l'application",
-            "/timestamp": "Activer/désactiver les horodatages",
-            "/reset": "Réinitialiser le contexte/session de l’IA",
-            "/deletefile": "Supprimer le dernier fichier .txt enregistré",
-            "/openlog": "Ouvrir le dossier contenant les journaux",
-            "/exportjson": "Exporter l'historique en JSON",
-            "/exportpdf": "Exporter le chat en PDF stylisé",
-            "/openaiusage": "Ouvrir le tableau de bord OpenAI dans le navigateur",
-            "/geminiusagelink": "Ouvrir le tableau de bord API de Gemini",
-            "/setname": "Définir votre nom affiché dans le chat",
-            "/emoji": "Insérer des emojis courants",
-            "/shrink": "Réduire le chat à un résumé (si disponible)",
-            "/translate": "Traduire la dernière réponse dans la langue choisie"
-        }
-    },
-    "ar": {
-        "send": "إرسال",
-        "upload": "📎 تحميل",
-        "model": "النموذج",
-        "language": "اللغة",
-        "chat_saved": "تم حفظ المحادثة",
-        "save_error_title": "خطأ في الحفظ",
-        "saved": "تم حفظ المحادثة في:\n{}",
-        "save_error": "فشل في حفظ المحادثة:\n{}",
-        "help_header": "📖 الأوامر المتاحة:",
-        "error_prefix": "❌ خطأ:",
-        "rate_limit_openai": "❌ تم تجاوز حصة OpenAI. قم بزيارة https://platform.openai.com/account/usage",
-        "rate_limit_gemini": "❌ تم تجاوز حصة Gemini. قم بزيارة https://makersuite.google.com/app/apikey",
-        "action_cancelled": "❌ تم إلغاء الإجراء أو غير مدعوم.",
-        "unsupported_file": "❌ نوع الملف غير مدعوم.",
-        "file_empty": "⚠️ الملف فارغ أو غير قابل للقراءة.",
-        "summary_header": "🧠 الملخص:\n",
-        "translate_header": "🌐 الترجمة ({lang}):\n",
-        "theme": "🎨 تم تغيير السمة إلى {}.",
-        "messages": {
-            "chat_cleared": "🧹 تم مسح المحادثة.",
-            "current_model": "🤖 النموذج الحالي: {}",
-            "switched_model": "🔁 تم التبديل إلى {}",
-            "messages_exchanged": "📊 الرسائل المتبادلة: {}",
-            "feedback": "💬 أرسل ملاحظاتك إلى: dev@yourdomain.com",
-            "copied": "✅ تم نسخ الرد الأخير إلى الحافظة.",
-            "nothing_to_copy": "⚠️ لا يوجد شيء لنسخه.",
-            "chat_saved_as": "✅ تم حفظ المحادثة باسم '{}'",
-            "chat_save_failed": "❌ فشل الحفظ: {}",
-            "last_messages": "📜 الرسائل الأخيرة:\n{}",
-            "version": "📦 الإصدار 1.0.0",
-            "timestamps_on": "⏱️ تم تفعيل الطوابع الزمنية.",
-            "timestamps_off": "⏱️ تم إيقاف الطوابع الزمنية.",
-            "context_reset": "🔄 تم إعادة تعيين سياق الذكاء الاصطناعي.",
-            "file_deleted": "🗑️ تم حذف {}",
-            "file_delete_failed": "❌ فشل حذف الملف: {}",
-            "no_file_to_delete": "⚠️ لا يوجد ملف محفوظ للحذف.",
-            "json_exported": "🗃️ تم تصدير المحادثة بصيغة JSON:\n{}",
-            "json_export_failed": "❌ فشل التصدير: {}",
-            "name_set": "🙋 اسمك الآن: {}",
-            "emoji_list": "💬 الرموز التعبيرية المتاحة:\n{}",
-            "not_enough_to_summarize": "🧠 لا يوجد محتوى كافٍ للتلخيص.",
-            "summary_result": "🧠 الملخص:\n{}",
-            "summary_failed": "❌ فشل التلخيص: {}",
-            "translation_result": "🌐 الترجمة ({}):\n{}",
-            "translation_failed": "❌ فشل الترجمة: {}",
-            "no_response_to_translate": "🌐 لا يوجد رد للترجمة.",
-            "all_commands": "📘 جميع الأوامر:\n{}",
-            "did_you_mean": "🤔 هل كنت تقصد:\n{}",
-            "unknown_command": "❓ أمر غير معروف. اكتب /help لرؤية الأوامر.",
-            "action_cancelled": "❌ تم إلغاء العملية أو غير مدعومة.",
-            "file_empty": "⚠️ الملف فارغ أو لا يمكن قراءته.",
-            "file_read_error": "❌ فشل في قراءة الملف: {}",
-            "unsupported_file": "نوع الملف غير مدعوم.",
-            "file_prompt_action": "ماذا تريد أن تفعل بالملف؟\nالخيارات: summarize / translate",
-            "file_prompt_language": "إلى أي لغة ترغب في الترجمة؟ (مثل: العربية، الألمانية)",
-            "pdf_export_success": "📄 تم تصدير PDF إلى سطح المكتب:\n{}",
-            "pdf_export_failed": "❌ فشل تصدير PDF: {}"
-        },
-        "commands": {
-            "/help": "عرض الأوامر المتاحة",
-            "/clear": "مسح سجل المحادثة والشاشة",
-            "/exit": "الخروج من التطبيق",
-            "/model": "عرض النموذج النشط الحالي",
-            "/switch": "التبديل بين OpenAI وGemini",
-            "/stats": "عرض إحصائيات الاستخدام",
-            "/feedback": "إرسال ملاحظات للمطور",
-            "/theme": "تغيير السمة (إذا كانت مدعومة)",
-            "/copylast": "نسخ آخر رد",
-            "/save": "حفظ المحادثة باسم مخصص",
-            "/history": "عرض الرسائل الأخيرة للمستخدم",
-            "/version": "عرض إصدار التطبيق",
-            "/timestamp": "تفعيل/إلغاء تفعيل الطوابع الزمنية",
-            "/reset": "إعادة تعيين سياق/جلسة الذكاء الاصطناعي",
-            "/deletefile": "حذف آخر ملف .txt تم حفظه",
-            "/openlog": "فتح مجلد سجلات المحادثات المحفوظة",
-            "/exportjson": "تصدير المحادثة كـ JSON",
-            "/exportpdf": "تصدير المحادثة كـ PDF منسق",
-            "/openaiusage": "فتح لوحة استخدام OpenAI في المتصفح",
-            "/geminiusagelink": "فتح لوحة مفاتيح Gemini API",
-            "/setname": "تعيين اسم العرض في المحادثة",
-            "/emoji": "إدراج رموز تعبيرية شائعة",
-            "/shrink": "طي المحادثة إلى ملخص (إذا كان مدعومًا)",
-            "/translate": "ترجمة آخر رد إلى اللغة المختارة"
-        }
-    },
-    "bn": {
-        "send": "পাঠান",
-        "upload": "📎 আপলোড",
-        "model": "মডেল",
-        "language": "ভাষা",
-        "chat_saved": "চ্যাট সংরক্ষণ করা হয়েছে",
-        "save_error_title": "সংরক্ষণের ত্রুটি",
-        "saved": "চ্যাট সংরক্ষিত হয়েছে:\n{}",
-        "save_error": "চ্যাট সংরক্ষণ ব্যর্থ হয়েছে:\n{}",
-        "help_header": "📖 উপলব্ধ কমান্ডসমূহ:",
-        "error_prefix": "❌ ত্রুটি:",
-        "rate_limit_openai": "❌ OpenAI কোটার সীমা অতিক্রম করেছে। দেখুন https://platform.openai.com/account/usage",
-        "rate_limit_gemini": "❌ Gemini কোটার সীমা অতিক্রম করেছে। দেখুন https://makersuite.google.com/app/apikey",
-        "action_cancelled": "❌ ক্রিয়া বাতিল বা অসমর্থিত।",
-        "unsupported_file": "❌ অ সমর্থিত ফাইল প্রকার।",
-        "file_empty": "⚠️ ফাইল খালি বা পাঠযোগ্য নয়।",
-        "summary_header": "🧠 সারাংশ:\n",
-        "translate_header": "🌐 অনুবাদ ({lang}):\n",
-        "theme": "🎨 থিম {} এ পরিবর্তিত হয়েছে।",
-        "messages": {
-            "chat_cleared": "🧹 চ্যাট পরিষ্কার হয়েছে।",
-            "current_model": "🤖 বর্তমান মডেল: {}",
-            "switched_model": "🔁 {} তে স্যুইচ করা হয়েছে",
-            "messages_exchanged": "📊 বার্তা বিনিময়: {}",
-            "feedback": "💬 আপনার মতামত পাঠান: dev@yourdomain.com",
-            "copied": "✅ শেষ উত্তর ক্লিপবোর্ডে কপি হয়েছে।",
-            "nothing_to_copy": "⚠️ কপি করার জন্য কিছু নেই।",
-            "chat_saved_as": "✅ চ্যাট '{}' নামে সংরক্ষিত হয়েছে",
-            "chat_save_failed": "❌ সংরক্ষণ ব্যর্থ হয়েছে: {}",
-            "last_messages": "📜 শেষ বার্তাগুলি:\n{}",
-            "version": "📦 সংস্করণ 1.0.0",
-            "timestamps_on": "⏱️ টাইমস্ট্যাম্প চালু করা হয়েছে।",
-            "timestamps_off": "⏱️ টাইমস্ট্যাম্প বন্ধ করা হয়েছে।",
-            "context_reset": "🔄 AI প্রসঙ্গ রিসেট করা হয়েছে।",
-            "file_deleted": "🗑️ {} মুছে ফেলা হয়েছে",
-            "file_delete_failed": "❌ ফাইল মুছে ফেলতে ব্যর্থ: {}",
-            "no_file_to_delete": "⚠️ মুছে ফেলার জন্য কোনো সংরক্ষিত ফাইল নেই।",
-            "json_exported": "🗃️ JSON হিসেবে চ্যাট রপ্তানি করা হয়েছে:\n{}",
-            "json_export_failed": "❌ রপ্তানি ব্যর্থ হয়েছে: {}",
-            "name_set": "🙋 আপনার নাম এখন: {}",
-            "emoji_list": "💬 আপনি যে ইমোজিগুলি ব্যবহার করতে পারেন:\n{}",
-            "not_enough_to_summarize": "🧠 সংক্ষিপ্ত করার জন্য যথেষ্ট কন্টেন্ট নেই।",
-            "summary_result": "🧠 সংক্ষিপ্তসার:\n{}",
-            "summary_failed": "❌ সংক্ষিপ্তসার ব্যর্থ হয়েছে: {}",
-            "translation_result": "🌐 অনুবাদ ({}):\n{}",
-            "translation_failed": "❌ অনুবাদ ব্যর্থ হয়েছে: {}",
-            "no_response_to_translate": "🌐 অনুবাদ করার মতো কোনো উত্তর পাওয়া যায়নি।",
-            "all_commands": "📘 সমস্ত কমান্ড:\n{}",
-            "did_you_mean": "🤔 আপনি কি বোঝাতে চেয়েছেন:\n{}",
-            "unknown_command": "❓ অজানা কমান্ড। উপলভ্য কমান্ড দেখতে /help লিখুন।",
-            "action_cancelled": "❌ ক্রিয়া বাতিল হয়েছে বা সমর্থিত নয়।",
-            "file_empty": "⚠️ ফাইল খালি বা পড়া যাচ্ছে না।",
-            "file_read_error": "❌ ফাইল পড়তে ব্যর্থ হয়েছে: {}",
-            "unsupported_file": "অসমর্থিত ফাইল ফরম্যাট।",
-            "file_prompt_action": "ফাইল দিয়ে আপনি কী করতে চান?\nবিকল্প: summarize / translate",
-            "file_prompt_language": "কোন ভাষায় অনুবাদ করতে চান? (যেমন: বাংলা, ইংরেজি)",
-            "pdf_export_success": "📄 ডেস্কটপে PDF রপ্তানি হয়েছে:\n{}",
-            "pdf_export_failed": "❌ PDF রপ্তানি ব্যর্থ হয়েছে: {}"
-        },
-        "commands": {
-            "/help": "উপলব্ধ কমান্ড দেখান",
-            "/clear": "চ্যাট ইতিহাস ও স্ক্রীন সাফ করুন",
-            "/exit": "অ্যাপ্লিকেশন থেকে বের হন",
-            "/model": "বর্তমান সক্রিয় মডেল দেখান",
-            "/switch": "OpenAI এবং Gemini এর মধ্যে সুইচ করুন",
-            "/stats": "ব্যবহারের পরিসংখ্যান দেখান",
-            "/feedback": "ডেভেলপারকে প্রতিক্রিয়া পাঠান",
-            "/theme": "থিম পরিবর্তন করুন (যদি সমর্থিত হয়)",
-            "/copylast": "শেষ উত্তর কপি করুন",
-            "/save": "চ্যাট কাস্টম ফাইলনামে সংরক্ষণ করুন",
-            "/history": "সাম্প্রতিক ব্যবহারকারীর বার্তা দেখান",
-            "/version": "অ্যাপ সংস্করণ দেখান",
-            "/timestamp": "টাইমস্ট্যাম্প চালু/বন্ধ করুন",
-            "/reset": "AI সেশন রিসেট করুন",
-            "/deletefile": "শেষ সংরক্ষিত .txt ফাইল মুছে ফেলুন",
-            "/openlog": "সংরক্ষিত লগের ফোল্ডার খুলুন",
-            "/exportjson": "চ্যাট ইতিহাস JSON হিসেবে এক্সপোর্ট করুন",
-            "/exportpdf": "স্টাইলসহ PDF হিসেবে চ্যাট এক্সপোর্ট করুন",
-            "/openaiusage": "OpenAI ব্যবহারের ড্যাশবোর্ড খুলুন",
-            "/geminiusagelink": "Gemini API ড্যাশবোর্ড খুলুন",
-            "/setname": "চ্যাটে আপনার নাম সেট করুন",
-            "/emoji": "সাধারণ ইমোজি যুক্ত করুন",
-            "/shrink": "চ্যাট ইতিহাসকে সংক্ষিপ্ত করুন (যদি সমর্থিত হয়)",
-            "/translate": "শেষ উত্তরের অনুবাদ করুন নির্বাচিত ভাষায়"
-        }
-    },
-    "pt": {
-        "send": "Enviar",
-        "upload": "📎 Carregar",
-        "model": "Modelo",
-        "language": "Idioma",
-        "chat_saved": "Chat salvo",
-        "save_error_title": "Erro ao salvar",
-        "saved": "Chat salvo em:\n{}",
-        "save_error": "Erro ao salvar o chat:\n{}",
-        "help_header": "📖 Comandos disponíveis:",
-        "error_prefix": "❌ Erro:",
-        "rate_limit_openai": "❌ Limite da OpenAI excedido. Visite https://platform.openai.com/account/usage",
-        "rate_limit_gemini": "❌ Limite do Gemini excedido. Visite https://makersuite.google.com/app/apikey",
-        "action_cancelled": "❌ Ação cancelada ou não suportada.",
-        "unsupported_file": "❌ Tipo de arquivo não suportado.",
-        "file_empty": "⚠️ Arquivo vazio ou ilegível.",
-        "summary_header": "🧠 Resumo:\n",
-        "translate_header": "🌐 Tradução ({lang}):\n",
-        "theme": "🎨 Tema alterado para {}.",
-        "messages": {
-            "chat_cleared": "🧹 Chat limpo.",
-            "current_model": "🤖 Modelo atual: {}",
-            "switched_model": "🔁 Alternado para {}",
-            "messages_exchanged": "📊 Mensagens trocadas: {}",
-            "feedback": "💬 Envie seu feedback para: dev@yourdomain.com",
-            "copied": "✅ Última resposta copiada para a área de transferência.",
-            "nothing_to_copy": "⚠️ Nada para copiar.",
-            "chat_saved_as": "✅ Chat salvo como '{}'",
-            "chat_save_failed": "❌ Falha ao salvar: {}",
-            "last_messages": "📜 Últimas mensagens:\n{}",
-            "version": "📦 Versão 1.0.0",
-            "timestamps_on": "⏱️ Marcação de tempo ativada.",
-            "timestamps_off": "⏱️ Marcação de tempo desativada.",
-            "context_reset": "🔄 Contexto de IA redefinido.",
-            "file_deleted": "🗑️ {} excluído",
-            "file_delete_failed": "❌ Falha ao excluir o arquivo: {}",
-            "no_file_to_delete": "⚠️ Nenhum arquivo salvo para excluir.",
-            "json_exported": "🗃️ Chat exportado como JSON:\n{}",
-            "json_export_failed": "❌ Falha na exportação: {}",
-            "name_set": "🙋 Seu nome agora é: {}",
-            "emoji_list": "💬 Emojis que você pode usar:\n{}",
-            "not_enough_to_summarize": "🧠 Conteúdo insuficiente para resumir.",
-            "summary_result": "🧠 Resumo:\n{}",
-            "summary_failed": "❌ Falha ao resumir: {}",
-            "translation_result": "🌐 Tradução ({}):\n{}",
-            "translation_failed": "❌ Falha na tradução: {}",
-            "no_response_to_translate": "🌐 Nenhuma resposta encontrada para traduzir.",
-            "all_commands": "📘 Todos os comandos:\n{}",
-            "did_you_mean": "🤔 Você quis dizer:\n{}",
-            "unknown_command": "❓ Comando desconhecido. Digite /help para ver os comandos.",
-            "action_cancelled": "❌ Ação cancelada ou não suportada.",
-            "file_empty": "⚠️ Arquivo vazio ou ilegível.",
-            "file_read_error": "❌ Falha ao ler o arquivo: {}",
-            "unsupported_file": "Formato de arquivo não suportado.",
-            "file_prompt_action": "O que deseja fazer com o arquivo?\nOpções: summarize / translate",
-            "file_prompt_language": "Traduzir para qual idioma? (ex.: Português, Alemão)",
-            "pdf_export_success": "📄 PDF exportado para a área de trabalho:\n{}",
-            "pdf_export_failed": "❌ Falha ao exportar PDF: {}"
-        },
-        "commands": {
-            "/help": "Mostrar comandos disponíveis",
-            "/clear": "Limpar histórico e tela do chat",
-            "/exit": "Sair do aplicativo",
-            "/model": "Mostrar o modelo ativo atual",
-            "/switch": "Alternar entre OpenAI e Gemini",
-            "/stats": "Mostrar estatísticas de uso",
-            "/feedback": "Enviar feedback para o desenvolvedor",
-            "/theme": "Alternar tema (se suportado)",
-            "/copylast": "Copiar última resposta",
-            "/save": "Salvar chat com nome de arquivo personalizado",
-            "/history": "Mostrar mensagens recentes do usuário",
-            "/version": "Mostrar a versão do aplicativo",
-            "/timestamp": "Ativar/desativar marcação de tempo no chat",
-            "/reset": "Redefinir contexto/sessão da IA",
-            "/deletefile": "Excluir o último arquivo .txt salvo",
-            "/openlog": "Abrir pasta com os logs salvos",
-            "/exportjson": "Exportar histórico do chat como JSON",
-            "/exportpdf": "Exportar chat como PDF estilizado",
-            "/openaiusage": "Abrir painel de uso do OpenAI no navegador",
-            "/geminiusagelink": "Abrir painel da chave API do Gemini",
-            "/setname": "Definir seu nome exibido no chat",
-            "/emoji": "Inserir emojis comuns",
-            "/shrink": "Reduzir histórico do chat para resumo (se compatível)",
-            "/translate": "Traduzir última resposta para o idioma selecionado"
-        }
-    },
-    "ru": {
-        "send": "Отправить",
-        "upload": "📎 Загрузить",
-        "model": "Модель",
-        "language": "Язык",
-        "chat_saved": "Чат сохранён",
-        "save_error_title": "Ошибка сохранения",
-        "saved": "Чат сохранён по адресу:\n{}",
-        "save_error": "Ошибка при сохранении чата:\n{}",
-        "help_header": "📖 Доступные команды:",
-        "error_prefix": "❌ Ошибка:",
-        "rate_limit_openai": "❌ Лимит OpenAI превышен. Посетите https://platform.openai.com/account/usage",
-        "rate_limit_gemini": "❌ Лимит Gemini превышен. Посетите https://makersuite.google.com/app/apikey",
-        "action_cancelled": "❌ Действие отменено или не поддерживается.",
-        "unsupported_file": "❌ Неподдерживаемый тип файла.",
-        "file_empty": "⚠️ Файл пуст или нечитаемый.",
-        "summary_header": "🧠 Сводка:\n",
-        "translate_header": "🌐 Перевод ({lang}):\n",
-        "theme": "🎨 Тема переключена на {}.",
-        "messages": {
-            "chat_cleared": "🧹 Чат очищен.",
-            "current_model": "🤖 Текущая модель: {}",
-            "switched_model": "🔁 Переключено на {}",
-            "messages_exchanged": "📊 Обмен сообщениями: {}",
-            "feedback": "💬 Отправьте отзыв на: dev@yourdomain.com",
-            "copied": "✅ Последний ответ скопирован в буфер обмена.",
-            "nothing_to_copy": "⚠️ Нечего копировать.",
-            "chat_saved_as": "✅ Чат сохранён как '{}'",
-            "chat_save_failed": "❌ Не удалось сохранить: {}",
-            "last_messages": "📜 Последние сообщения:\n{}",
-            "version": "📦 Версия 1.0.0",
-            "timestamps_on": "⏱️ Метки времени включены.",
-            "timestamps_off": "⏱️ Метки времени отключены.",
-            "context_reset": "🔄 Контекст ИИ сброшен.",
-            "file_deleted": "🗑️ Удалено: {}",
-            "file_delete_failed": "❌ Ошибка удаления файла: {}",
-            "no_file_to_delete": "⚠️ Нет сохранённых файлов для удаления.",
-            "json_exported": "🗃️ Чат экспортирован в JSON:\n{}",
-            "json_export_failed": "❌ Экспорт не удался: {}",
-            "name_set": "🙋 Ваше имя теперь: {}",
-            "emoji_list": "💬 Доступные эмодзи:\n{}",
-            "not_enough_to_summarize": "🧠 Недостаточно контента для резюме.",
-            "summary_result": "🧠 Резюме:\n{}",
-            "summary_failed": "❌ Сводка не удалась: {}",
-            "translation_result": "🌐 Перевод ({}):\n{}",
-            "translation_failed": "❌ Не удалось перевести: {}",
-            "no_response_to_translate": "🌐 Нет ответа для перевода.",
-            "all_commands": "📘 Все команды:\n{}",
-            "did_you_mean": "🤔 Вы имели в виду:\n{}",
-            "unknown_command": "❓ Неизвестная команда. Введите /help для списка.",
-            "action_cancelled": "❌ Действие отменено или не поддерживается.",
-            "file_empty": "⚠️ Файл пуст или нечитаемый.",
-            "file_read_error": "❌ Ошибка чтения файла: {}",
-            "unsupported_file": "Неподдерживаемый формат файла.",
-            "file_prompt_action": "Что вы хотите сделать с файлом?\nОпции: summarize / translate",
-            "file_prompt_language": "На какой язык перевести? (например: Русский, Английский)",
-            "pdf_export_success": "📄 PDF экспортирован на рабочий стол:\n{}",
-            "pdf_export_failed": "❌ Ошибка экспорта PDF: {}"
-        },
-        "commands": {
-            "/help": "Показать доступные команды",
-            "/clear": "Очистить историю чата и экран",
-            "/exit": "Выйти из приложения",
-            "/model": "Показать текущую модель",
-            "/switch": "Переключить между OpenAI и Gemini",
-            "/stats": "Показать статистику использования",
-            "/feedback": "Отправить отзыв разработчику",
-            "/theme": "Переключить тему (если поддерживается)",
-            "/copylast": "Скопировать последний ответ",
-            "/save": "Сохранить чат с пользовательским именем файла",
-            "/history": "Показать последние сообщения пользователя",
-            "/version": "Показать версию приложения",
-            "/timestamp": "Включить/отключить временные метки в чате",
-            "/reset": "Сбросить контекст/сессию ИИ",
-            "/deletefile": "Удалить последний сохранённый .txt файл",
-            "/openlog": "Открыть папку с сохранёнными логами",
-            "/exportjson": "Экспортировать чат как JSON",
-            "/exportpdf": "Экспортировать чат как PDF с оформлением",
-            "/openaiusage": "Открыть панель использования OpenAI в браузере",
-            "/geminiusagelink": "Открыть панель управления ключами Gemini",
-            "/setname": "Установить имя пользователя в чате",
-            "/emoji": "Вставить популярные эмодзи",
-            "/shrink": "Свернуть чат в краткое резюме (если поддерживается)",
-            "/translate": "Перевести последний ответ на выбранный язык"
-        }
-    },
-    "ur": {
-        "send": "ارسال کریں",
-        "upload": "📎 اپ لوڈ کریں",
-        "model": "ماڈل",
-        "language": "زبان",
-        "chat_saved": "چیٹ محفوظ ہوگئی",
-        "save_error_title": "محفوظ کرنے میں ناکامی",
-        "saved": "چیٹ محفوظ کی گئی:\n{}",
-        "save_error": "چیٹ محفوظ نہیں ہو سکی:\n{}",
-        "help_header": "📖 دستیاب کمانڈز:",
-        "error_prefix": "❌ خرابی:",
-        "rate_limit_openai": "❌ OpenAI کوٹہ ختم ہوگیا۔ دیکھیں https://platform.openai.com/account/usage",
-        "rate_limit_gemini": "❌ Gemini کوٹہ ختم ہوگیا۔ دیکھیں https://makersuite.google.com/app/apikey",
-        "action_cancelled": "❌ کارروائی منسوخ یا غیر معاون۔",
-        "unsupported_file": "❌ غیر معاون فائل قسم۔",
-        "file_empty": "⚠️ فائل خالی یا ناقابلِ پڑھائی ہے۔",
-        "summary_header": "🧠 خلاصہ:\n",
-        "translate_header": "🌐 ترجمہ ({lang}):\n",
-        "theme": "🎨 تھیم کو {} میں تبدیل کر دیا گیا ہے۔",
-        "messages": {
-            "chat_cleared": "🧹 چیٹ صاف کر دی گئی۔",
-            "current_model": "🤖 موجودہ ماڈل: {}",
-            "switched_model": "🔁 {} پر تبدیل کر دیا گیا",
-            "messages_exchanged": "📊 پیغامات کا تبادلہ: {}",
-            "feedback": "💬 اپنی رائے بھیجیں: dev@yourdomain.com",
-            "copied": "✅ آخری جواب کلپ بورڈ پر کاپی کر دیا گیا۔",
-            "nothing_to_copy": "⚠️ کاپی کرنے کے لیے کچھ نہیں۔",
-            "chat_saved_as": "✅ چیٹ '{}' کے طور پر محفوظ کی گئی",
-            "chat_save_failed": "❌ محفوظ کرنے میں ناکامی: {}",
-            "last_messages": "📜 آخری پیغامات:\n{}",
-            "version": "📦 ورژن 1.0.0",
-            "timestamps_on": "⏱️ ٹائم اسٹیمپ فعال ہیں۔",
-            "timestamps_off": "⏱️ ٹائم اسٹیمپ غیر فعال ہیں۔",
-            "context_reset": "🔄 AI کا سیاق و سباق دوبارہ ترتیب دیا گیا۔",
-            "file_deleted": "🗑️ {} حذف کر دیا گیا",
-            "file_delete_failed": "❌ فائل حذف کرنے میں ناکامی: {}",
-            "no_file_to_delete": "⚠️ حذف کرنے کے لیے کوئی محفوظ شدہ فائل نہیں۔",
-            "json_exported": "🗃️ چیٹ JSON کے طور پر ایکسپورٹ کی گئی:\n{}",
-            "json_export_failed": "❌ ایکسپورٹ ناکام: {}",
-            "name_set": "🙋 آپ کا نام اب ہے: {}",
-            "emoji_list": "💬 آپ ان ایموجیز کو استعمال کر سکتے ہیں:\n{}",
-            "not_enough_to_summarize": "🧠 خلاصہ کے لیے مواد ناکافی ہے۔",
-            "summary_result": "🧠 خلاصہ:\n{}",
-            "summary_failed": "❌ خلاصہ ناکام: {}",
-            "translation_result": "🌐 ترجمہ ({}):\n{}",
-            "translation_failed": "❌ ترجمہ ناکام: {}",
-            "no_response_to_translate": "🌐 ترجمہ کے لیے کوئی جواب نہیں ملا۔",
-            "all_commands": "📘 تمام کمانڈز:\n{}",
-            "did_you_mean": "🤔 کیا آپ کا مطلب یہ تھا:\n{}",
-            "unknown_command": "❓ نامعلوم کمانڈ۔ /help لکھ کر دستیاب کمانڈز دیکھیں۔",
-            "action_cancelled": "❌ عمل منسوخ یا معاونت نہیں کرتا۔",
-            "file_empty": "⚠️ فائل خالی یا ناقابلِ پڑھائی ہے۔",
-            "file_read_error": "❌ فائل پڑھنے میں ناکامی: {}",
-            "unsupported_file": "غیر معاون فائل فارمیٹ۔",
-            "file_prompt_action": "فائل کے ساتھ آپ کیا کرنا چاہتے ہیں؟\nاختیارات: summarize / translate",
-            "file_prompt_language": "کس زبان میں ترجمہ کرنا ہے؟ (مثال: اردو، جرمن)",
-            "pdf_export_success": "📄 PDF ڈیسک ٹاپ پر ایکسپورٹ کر دیا گیا:\n{}",
-            "pdf_export_failed": "❌ PDF ایکسپورٹ ناکام: {}"
-        },
-        "commands": {
-            "/help": "دستیاب کمانڈز دکھائیں",
-            "/clear": "چیٹ کی ہسٹری اور اسکرین صاف کریں",
-            "/exit": "ایپ سے باہر نکلیں",
-            "/model": "موجودہ فعال ماڈل دکھائیں",
-            "/switch": "OpenAI اور Gemini کے درمیان سوئچ کریں",
-            "/stats": "استعمال کے اعداد و شمار دکھائیں",
-            "/feedback": "ڈویلپر کو فیڈبیک بھیجیں",
-            "/theme": "تھیم تبدیل کریں (اگر معاونت ہو)",
-            "/copylast": "آخری جواب کاپی کریں",
-            "/save": "چیٹ کو اپنی مرضی کے نام سے محفوظ کریں",
-            "/history": "حالیہ پیغامات دکھائیں",
-            "/version": "ایپ ورژن دکھائیں",
-            "/timestamp": "چیٹ میں ٹائم اسٹیمپ آن/آف کریں",
-            "/reset": "AI سیشن کو ری سیٹ کریں",
-            "/deletefile": "آخری محفوظ شدہ .txt فائل حذف کریں",
-            "/openlog": "محفوظ شدہ لاگز والی فولڈر کھولیں",
-            "/exportjson": "چیٹ ہسٹری JSON کے طور پر ایکسپورٹ کریں",
-            "/exportpdf": "چیٹ کو اسٹائلڈ PDF کے طور پر ایکسپورٹ کریں",
-            "/openaiusage": "براؤزر میں OpenAI کا ڈیش بورڈ کھولیں",
-            "/geminiusagelink": "Gemini API کی ڈیش بورڈ کھولیں",
-            "/setname": "چیٹ میں اپنا نام سیٹ کریں",
-            "/emoji": "عام ایموجیز شامل کریں",
-            "/shrink": "چیٹ ہسٹری کو خلاصے میں سکیڑیں (اگر معاونت ہو)",
-            "/translate": "آخری جواب کو منتخب زبان میں ترجمہ کریں"
-        }
-    }
-}
-
-# function that looks up in LANGUAGES dictionary, first looks up for a language then to the key and returns key
-# if key or language is not found return English version
-def tr(key: str, lang: str) -> str:
-    def get_nested(d: dict, path: list[str]) -> str | None:
-        for p in path:
-            if not isinstance(d, dict) or p not in d:
-                return None
-            d = d[p]
-        return d if isinstance(d, str) else None
-
-    parts = key.split(".")
-    # try requested lang
-    result = get_nested(LANGUAGES.get(lang, {}), parts)
-    if result is None:
-        # fallback English
-        result = get_nested(LANGUAGES.get("en", {}), parts)
-    return result or key
\ No newline at end of file
@@ -0,0 +1,193 @@
+# ws_protocol.py - the small part of HTTP/1.1 and WebSocket (RFC 6455) the server in main.py needs, on asyncio streams
+# Text and binary messages, fragmentation, ping/pong and close are handled; extensions (compression) are not offered.
+from __future__ import annotations
+import asyncio
+import base64
+import hashlib
+import json
+import struct
+
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+MAX_HEADER_BYTES = 16 * 1024
+
+OP_CONTINUATION = 0x0
+OP_TEXT = 0x1
+OP_BINARY = 0x2
+OP_CLOSE = 0x8
+OP_PING = 0x9
+OP_PONG = 0xA
+OPCODES = (OP_CONTINUATION, OP_TEXT, OP_BINARY, OP_CLOSE, OP_PING, OP_PONG)
+
+CLOSE_NORMAL = 1000
+CLOSE_GOING_AWAY = 1001
+CLOSE_PROTOCOL_ERROR = 1002
+CLOSE_TOO_BIG = 1009
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 426: "Upgrade Required", 503: "Service Unavailable"}
+
+
+class ProtocolError(Exception):
+    def __init__(self, message: str, code: int = CLOSE_PROTOCOL_ERROR):
+        super().__init__(message)
+        self.code = code
+
+
+class ConnectionClosed(Exception):
+    pass
+
+
+class HttpRequest:
+    __slots__ = ("method", "path", "query", "headers")
+
+    def __init__(self, method: str, path: str, query: str, headers: dict):
+        self.method = method
+        self.path = path
+        self.query = query
+        self.headers = headers  # lower-case name -> value
+
+    def is_websocket(self) -> bool:
+        return (self.headers.get("upgrade", "").lower() == "websocket"
+                and "upgrade" in self.headers.get("connection", "").lower()
+                and "sec-websocket-key" in self.headers)
+
+
+# reads the request line and headers, None when the client closed the connection first
+async def read_request(reader: asyncio.StreamReader) -> HttpRequest | None:
+    try:
+        head = await reader.readuntil(b"\r\n\r\n")
+    except asyncio.IncompleteReadError:
+        return None
+    except asyncio.LimitOverrunError:
+        raise ProtocolError("request headers too large")
+    if len(head) > MAX_HEADER_BYTES:
+        raise ProtocolError("request headers too large")
+    lines = head.decode("latin-1").split("\r\n")
+    try:
+        method, target, _ = lines[0].split(" ", 2)
+    except ValueError:
+        raise ProtocolError("malformed request line")
+    headers = {}
+    for line in lines[1:]:
+        name, sep, value = line.partition(":")
+        if sep:
+            headers[name.strip().lower()] = value.strip()
+    path, _, query = target.partition("?")
+    return HttpRequest(method, path, query, headers)
+
+
+# a dict is sent as JSON, a str as plain text (the Prometheus text format), bytes as a file
+async def write_response(writer: asyncio.StreamWriter, status: int, body: dict | str | bytes | None = None,
+                         headers: dict | None = None):
+    if isinstance(body, bytes):
+        data, content_type = body, "application/octet-stream"
+    elif isinstance(body, str):
+        data, content_type = body.encode("utf-8"), "text/plain; version=0.0.4; charset=utf-8"
+    else:
+        data, content_type = json.dumps(body or {}).encode("utf-8"), "application/json"
+    extra = "".join(f"{name}: {value}\r\n" for name, value in (headers or {}).items())
+    writer.write(f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\nContent-Type: {content_type}\r\n{extra}"
+                 f"Content-Length: {len(data)}\r\nConnection: close\r\n\r\n".encode("latin-1") + data)
+    await writer.drain()
+
+
+async def accept_websocket(writer: asyncio.StreamWriter, request: HttpRequest):
+    key = request.headers["sec-websocket-key"]
+    accept = base64.b64encode(hashlib.sha1((key + WS_GUID).encode("ascii")).digest()).decode("ascii")
+    writer.write(("HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                  f"Sec-WebSocket-Accept: {accept}\r\n\r\n").encode("latin-1"))
+    await writer.drain()
+
+
+def _unmask(payload: bytes, mask: bytes) -> bytes:
+    # XOR with the repeated 4 byte key as one big integer operation instead of a loop over the bytes
+    length = len(payload)
+    key = (mask * (length // 4 + 1))[:length]
+    return (int.from_bytes(payload, "big") ^ int.from_bytes(key, "big")).to_bytes(length, "big")
+
+
+class WebSocket:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, max_message_bytes: int):
+        self.reader = reader
+        self.writer = writer
+        self.max_message_bytes = max_message_bytes
+        self.closed = False
+
+    # next text (str) or binary (bytes) message; pings are answered on the way. Raises ConnectionClosed
+    async def receive(self):
+        opcode, parts, size = None, [], 0
+        while True:
+            fin, frame_opcode, payload = await self._read_frame(self.max_message_bytes - size)
+            if frame_opcode == OP_PING:
+                await self._send_frame(OP_PONG, payload)
+            elif frame_opcode == OP_PONG:
+                pass
+            elif frame_opcode == OP_CLOSE:
+                code = struct.unpack("!H", payload[:2])[0] if len(payload) >= 2 else CLOSE_NORMAL
+                await self.close(code)
+                raise ConnectionClosed(code)
+            else:
+                if (frame_opcode == OP_CONTINUATION) != (opcode is not None):
+                    raise ProtocolError("unexpected continuation frame")
+                if opcode is None:
+                    opcode = frame_opcode
+                parts.append(payload)
+                size += len(payload)
+                if fin:
+                    data = b"".join(parts)
+                    if opcode == OP_TEXT:
+                        try:
+                            return data.decode("utf-8")
+                        except UnicodeDecodeError:
+                            raise ProtocolError("text message is not UTF-8")
+                    return data
+
+    async def send_text(self, text: str):
+        await self._send_frame(OP_TEXT, text.encode("utf-8"))
+
+    async def close(self, code: int = CLOSE_NORMAL, reason: str = ""):
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            await self._send_frame(OP_CLOSE, struct.pack("!H", code) + reason.encode("utf-8")[:120], force=True)
+        except (ConnectionError, RuntimeError):
+            pass
+
+    async def _read_frame(self, limit: int):
+        try:
+            first, second = await self.reader.readexactly(2)
+            fin, opcode = first & 0x80, first & 0x0F
+            if first & 0x70:
+                raise ProtocolError("reserved bits set")
+            if opcode not in OPCODES:
+                raise ProtocolError("reserved opcode")
+            if not second & 0x80:
+                raise ProtocolError("client frames must be masked")
+            length = second & 0x7F
+            if length == 126:
+                length = struct.unpack("!H", await self.reader.readexactly(2))[0]
+            elif length == 127:
+                length = struct.unpack("!Q", await self.reader.readexactly(8))[0]
+            if opcode >= OP_CLOSE and (length > 125 or not fin):
+                raise ProtocolError("invalid control frame")
+            if opcode < OP_CLOSE and length > limit:
+                raise ProtocolError("message too big", CLOSE_TOO_BIG)
+            mask = await self.reader.readexactly(4)
+            payload = await self.reader.readexactly(length)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            self.closed = True
+            raise ConnectionClosed(CLOSE_GOING_AWAY)
+        return bool(fin), opcode, _unmask(payload, mask) if length else b""
+
+    async def _send_frame(self, opcode: int, payload: bytes, force: bool = False):
+        if self.closed and not force:
+            raise ConnectionClosed(CLOSE_GOING_AWAY)
+        length = len(payload)
+        if length < 126:
+            header = struct.pack("!BB", 0x80 | opcode, length)
+        elif length < 1 << 16:
+            header = struct.pack("!BBH", 0x80 | opcode, 126, length)
+        else:
+            header = struct.pack("!BBQ", 0x80 | opcode, 127, length)
+        self.writer.write(header + payload)
+        await self.writer.drain()